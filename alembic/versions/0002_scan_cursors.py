@@ -0,0 +1,33 @@
+"""scan cursors (live tail + backfill checkpoints)
+
+Revision ID: 0002_scan_cursors
+Revises: 0001_init
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0002_scan_cursors"
+down_revision = "0001_init"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "scan_cursors",
+        sa.Column("id", sa.BigInteger(), primary_key=True, autoincrement=True),
+        sa.Column("chain_id", sa.String(length=64), nullable=False, index=True),
+        sa.Column("name", sa.String(length=128), nullable=False),
+        sa.Column("position", sa.BigInteger(), nullable=False),
+        sa.Column("range_start", sa.BigInteger(), nullable=True),
+        sa.Column("range_end", sa.BigInteger(), nullable=True),
+        sa.Column("status", sa.String(length=32), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False),
+    )
+    op.create_index("ix_scan_cursors_chain_name", "scan_cursors", ["chain_id", "name"], unique=True)
+
+
+def downgrade():
+    op.drop_index("ix_scan_cursors_chain_name", table_name="scan_cursors")
+    op.drop_table("scan_cursors")
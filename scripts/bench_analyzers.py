@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+import asyncio
+import sys
+import time
+from collections import Counter, defaultdict
+
+from synth import synth_block
+
+from scanner.analyzers import (
+    ConflictPatternsAnalyzer,
+    HiddenDependenciesAnalyzer,
+    HotStateAnalyzer,
+    OrderingSensitivityAnalyzer,
+    columnar,
+)
+from scanner.analyzers.base import AnalyzerContext
+
+# CPU benchmark for the analyzer stage on synthetic heavy blocks.
+# "raw" is the pre-BlockFeatures baseline: every analyzer walks the receipt dicts itself.
+# "features" builds the shared per-block feature object once and runs the real analyzers.
+# "columnar" additionally builds the NumPy ReceiptTable and takes the vectorized paths.
+
+
+def raw_ordering(txs, receipts):
+    pairs = []
+    for i in range(len(txs) - 1):
+        ra = receipts.get(txs[i]) or {}
+        rb = receipts.get(txs[i + 1]) or {}
+        ta = (ra.get("to") or "").lower()
+        tb = (rb.get("to") or "").lower()
+        sa, sb = ra.get("status"), rb.get("status")
+        if ta and tb and ta == tb and sa is not None and sb is not None and sa != sb:
+            pairs.append((txs[i], txs[i + 1]))
+    return pairs
+
+
+def raw_conflict(txs, receipts):
+    failures = 0
+    for h in txs:
+        st = (receipts.get(h) or {}).get("status")
+        if isinstance(st, str) and st.lower() == "0x0":
+            failures += 1
+    return failures
+
+
+def raw_hot(txs, receipts):
+    c = Counter()
+    for h in txs:
+        r = receipts.get(h) or {}
+        to = (r.get("to") or "").lower()
+        if to:
+            c[f"to:{to}"] += 1
+        for lg in (r.get("logs") or [])[:50]:
+            topics = lg.get("topics") or []
+            if topics:
+                c[f"topic:{topics[0].lower()}"] += 1
+    return c.most_common(5)
+
+
+def raw_dependencies(txs, receipts):
+    groups = defaultdict(list)
+    for h in txs:
+        r = receipts.get(h) or {}
+        to = (r.get("to") or "").lower()
+        logs = r.get("logs") or []
+        t0 = None
+        if logs and isinstance(logs, list):
+            topics = (logs[0].get("topics") or []) if isinstance(logs[0], dict) else []
+            if topics:
+                t0 = topics[0].lower()
+        if to:
+            groups[f"to:{to}"].append(h)
+        if t0:
+            groups[f"topic:{t0}"].append(h)
+    return groups
+
+
+def run_raw(txs, receipts) -> None:
+    raw_ordering(txs, receipts)
+    raw_conflict(txs, receipts)
+    raw_hot(txs, receipts)
+    raw_dependencies(txs, receipts)
+
+
+async def run_features(txs, receipts, analyzers) -> None:
+    ctx = AnalyzerContext(
+        chain_id="bench",
+        block_number=1,
+        block_hash="0x0",
+        tx_hashes=txs,
+        receipts=receipts,
+        raw_block={},
+    )
+    for a in analyzers:
+        await a.analyze(ctx)
+
+
+def best_of(fn, repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+    return min(times)
+
+
+def saved(t: float, baseline: float) -> str:
+    return f"{100.0 * (1 - t / baseline):.1f}%"
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description="Benchmark analyzer CPU time per block.")
+    p.add_argument("--txs", type=int, default=10_000)
+    p.add_argument("--repeat", type=int, default=20)
+    p.add_argument("--seed", type=int, default=7)
+    a = p.parse_args()
+
+    txs, receipts = synth_block(a.txs, a.seed)
+    analyzers = [
+        OrderingSensitivityAnalyzer(),
+        ConflictPatternsAnalyzer(),
+        HotStateAnalyzer(),
+        HiddenDependenciesAnalyzer(),
+    ]
+    loop = asyncio.new_event_loop()
+
+    def analyzers_run() -> None:
+        loop.run_until_complete(run_features(txs, receipts, analyzers))
+
+    min_txs = columnar.COLUMNAR_MIN_TXS
+    try:
+        raw = best_of(lambda: run_raw(txs, receipts), a.repeat)
+        columnar.COLUMNAR_MIN_TXS = sys.maxsize
+        feat = best_of(analyzers_run, a.repeat)
+        columnar.COLUMNAR_MIN_TXS = min_txs
+        vec = best_of(analyzers_run, a.repeat) if columnar.HAS_NUMPY else None
+    finally:
+        columnar.COLUMNAR_MIN_TXS = min_txs
+        loop.close()
+
+    print(f"txs={a.txs} repeat={a.repeat} (best of)")
+    print(f"raw receipt walks   {raw * 1000:8.2f} ms/block")
+    print(f"shared features     {feat * 1000:8.2f} ms/block  ({saved(feat, raw)} saved)")
+    if vec is None:
+        print("columnar (numpy)    not installed")
+    else:
+        print(f"columnar (numpy)    {vec * 1000:8.2f} ms/block  ({saved(vec, raw)} saved)")
+
+
+if __name__ == "__main__":
+    main()
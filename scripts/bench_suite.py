@@ -0,0 +1,520 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import gc
+import inspect
+import itertools
+import os
+import platform
+import re
+import shutil
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from collections.abc import AsyncIterator, Callable, Iterator
+from dataclasses import dataclass
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any
+
+import orjson
+from sqlalchemy import delete
+from synth import synth_block
+
+from scanner.analyzers import columnar
+from scanner.analyzers.base import AnalyzerContext
+from scanner.analyzers.features import BlockFeaturesBuilder
+from scanner.analyzers.registry import BUILTINS
+from scanner.db import session as db_session
+from scanner.db.base import Base
+from scanner.db.models import Block, Scan, Signal
+from scanner.db.session import dispose_async_engine, set_db_url
+from scanner.pipeline.runner import FetchedBlock, PipelineRunner
+from scanner.pipeline.store import Store
+from scanner.rpc.jsonrpc import JsonRpcClient
+from scanner.rpc.types import BlockRef
+from scanner.signals import explain
+from scanner.signals.scorer import to_draft
+from scanner.utils.time import utcnow
+
+# Benchmark suite for the hot paths: analyzers, signal building, the store and the JSON-RPC
+# client. Inputs come from the seeded generator in synth.py, so runs on different commits
+# see identical blocks. Results are written as JSON; with --baseline the run is compared
+# against an earlier result file and exits 1 if any benchmark's median is slower by more
+# than --threshold.
+#
+#   python scripts/bench_suite.py --out base.json                # on main
+#   python scripts/bench_suite.py --out new.json --baseline base.json --threshold 0.15
+#   python scripts/bench_suite.py --compare base.json new.json   # no run
+#
+# Store benchmarks run on a temporary SQLite file and, with --pg-url (or
+# SCANNER_BENCH_PG_URL), on Postgres; rows are written under a throwaway chain id and
+# deleted afterwards. RPC benchmarks start scripts/fake_node.py as a separate process and
+# time JsonRpcClient round trips over loopback.
+
+HERE = Path(__file__).resolve().parent
+GROUPS = ("analyzers", "signals", "store", "rpc")
+
+
+@dataclass
+class Bench:
+    name: str
+    group: str
+    items: int  # units of work per call, for per-item figures
+    fn: Callable[..., Any]
+    # Called before each timed call (outside the timing) for benchmarks that consume state,
+    # e.g. fresh rows to insert; its result is passed to fn and each sample is one call.
+    prepare: Callable[[], Any] | None = None
+
+
+async def _call(fn: Callable[..., Any], *args: Any) -> Any:
+    r = fn(*args)
+    if inspect.isawaitable(r):
+        r = await r
+    return r
+
+
+async def measure(b: Bench, repeat: int, min_time: float) -> list[float]:
+    """Per-call seconds for `repeat` samples; fast calls are looped to last >= min_time."""
+    if b.prepare is not None:
+        await _call(b.fn, await _call(b.prepare))  # warmup
+        samples = []
+        for _ in range(repeat):
+            arg = await _call(b.prepare)
+            t0 = time.perf_counter()
+            await _call(b.fn, arg)
+            samples.append(time.perf_counter() - t0)
+        return samples
+
+    loops = 1
+    while True:  # warmup and calibration, as timeit.autorange
+        t0 = time.perf_counter()
+        for _ in range(loops):
+            await _call(b.fn)
+        if time.perf_counter() - t0 >= min_time or loops >= 1 << 20:
+            break
+        loops *= 2 if time.perf_counter() - t0 > min_time / 10 else 10
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        for _ in range(loops):
+            await _call(b.fn)
+        samples.append((time.perf_counter() - t0) / loops)
+    return samples
+
+
+# --- analyzers -----------------------------------------------------------------------------
+
+
+def analyzer_benches(sizes: list[int], seed: int) -> Iterator[Bench]:
+    for n in sizes:
+        txs, receipts = synth_block(n, seed)
+        ordered = [receipts[h] for h in txs]
+
+        def features(ordered: list[dict] = ordered) -> None:
+            builder = BlockFeaturesBuilder()
+            builder.add(ordered)
+            builder.build()
+
+        yield Bench(f"features.build[{n}]", "analyzers", n, features)
+
+        ctx = _context(txs, receipts)
+        if ctx.table is not None:  # only built past COLUMNAR_MIN_TXS
+            feats = ctx.features
+            yield Bench(
+                f"columnar.build_table[{n}]",
+                "analyzers",
+                n,
+                lambda f=feats: columnar.ReceiptTable.from_features(f),
+            )
+        for name, cls in BUILTINS.items():
+            analyzer = cls()
+            yield Bench(
+                f"analyzer.{name}[{n}]", "analyzers", n, lambda a=analyzer, c=ctx: a.analyze(c)
+            )
+
+
+def _context(txs: list[str], receipts: dict[str, dict]) -> AnalyzerContext:
+    return AnalyzerContext(
+        chain_id="bench",
+        block_number=1000,
+        block_hash="0x0",
+        tx_hashes=txs,
+        receipts=receipts,
+        raw_block={},
+    )
+
+
+# --- signals -------------------------------------------------------------------------------
+
+
+def _runner() -> PipelineRunner:
+    # Every builtin analyzer on and nothing filtered by severity, so all findings count.
+    cfg = {"min_severity_to_store": 0, **{name: True for name in BUILTINS}}
+    client = SimpleNamespace(head=None)
+    return PipelineRunner("bench", client=client, store=None, cfg=cfg)  # type: ignore[arg-type]
+
+
+async def _findings(ctx: AnalyzerContext) -> list[tuple[str, dict]]:
+    out = []
+    for cls in BUILTINS.values():
+        a = cls()
+        out.extend((a.category, f) for f in await a.analyze(ctx))
+    return out
+
+
+_EXPLAIN = {
+    "ordering": explain.explain_ordering,
+    "conflict": explain.explain_conflict,
+    "hot_state": explain.explain_hot_state,
+    "dependency": explain.explain_dependency,
+}
+
+
+async def signal_benches(sizes: list[int], seed: int) -> AsyncIterator[Bench]:
+    runner = _runner()
+    for n in sizes:
+        txs, receipts = synth_block(n, seed)
+        ctx = _context(txs, receipts)
+        findings = await _findings(ctx)
+        if not findings:
+            continue
+        yield Bench(
+            f"runner.to_signals[{n}]",
+            "signals",
+            len(findings),
+            lambda c=ctx, f=findings: runner._to_signals(c, f),
+        )
+        block = BlockRef(number=1000, hash="0x0", parent_hash=None, timestamp=None, tx_hashes=txs)
+        fetched = FetchedBlock(block=block, features=ctx.features, strategy="bench")
+        yield Bench(f"runner.analyze[{n}]", "signals", n, lambda f=fetched: runner.analyze(f))
+
+    # to_draft over a fixed mix of explained findings from the largest block.
+    args = []
+    for category, f in await _findings(_context(*synth_block(max(sizes), seed))):
+        msg, actions, evidence = _EXPLAIN[category](f)
+        kind, strength = f.get("kind", "unknown"), float(f.get("strength", 0.2))
+        args.append((category, kind, strength, msg, evidence, actions))
+    if args:
+        drafts = list(itertools.islice(itertools.cycle(args), 1000))
+
+        def draft_all() -> None:
+            for a in drafts:
+                to_draft(*a)
+
+        yield Bench("scorer.to_draft[1000]", "signals", len(drafts), draft_all)
+
+
+# --- store ---------------------------------------------------------------------------------
+
+
+def _signals(chain_id: str, block: int, ids: list[str]) -> list[Signal]:
+    now = utcnow()
+    return [
+        Signal(
+            signal_id=sid,
+            chain_id=chain_id,
+            block_number=block,
+            category="hot_state",
+            severity=60,
+            confidence=0.7,
+            title="Hot state concentration detected",
+            explanation="bench",
+            evidence={"key": f"to:0x{i:040x}", "count": i, "txs": [f"0x{i:064x}"] * 5},
+            recommended_actions=["Spread writes across keys."],
+            created_at=now,
+        )
+        for i, sid in enumerate(ids)
+    ]
+
+
+def store_benches(backend: str, url: str, batch: int) -> Iterator[Bench]:
+    set_db_url(url)
+    Base.metadata.create_all(db_session.get_engine())
+    chain_id = f"bench-{uuid.uuid4().hex[:8]}"
+    store = Store(chain_id=chain_id)
+    numbers = itertools.count(1)
+    try:
+        def blocks() -> list[int]:
+            return [next(numbers) for _ in range(batch)]
+
+        async def upsert(ns: list[int]) -> None:
+            for n in ns:
+                await store.upsert_block(n, f"0x{chain_id}{n:056x}", None, utcnow(), None, 100)
+
+        yield Bench(f"store.{backend}.upsert_block[{batch}]", "store", batch, upsert, blocks)
+
+        def fresh() -> list[Signal]:
+            return _signals(chain_id, next(numbers), [uuid.uuid4().hex for _ in range(batch)])
+
+        yield Bench(
+            f"store.{backend}.insert_signals[{batch}]", "store", batch, store.insert_signals, fresh
+        )
+
+        # Re-inserting a stored block's signals, as a rescan does: every row is a duplicate.
+        async def stored() -> list[Signal]:
+            ids = [uuid.uuid4().hex for _ in range(batch)]
+            n = next(numbers)
+            await store.insert_signals(_signals(chain_id, n, ids))
+            return _signals(chain_id, n, ids)
+
+        yield Bench(
+            f"store.{backend}.insert_signals_dup[{batch}]",
+            "store",
+            batch,
+            store.insert_signals,
+            stored,
+        )
+
+        # The per-block persist: block row, 10 signals and the scan row in one transaction.
+        def scanned(ns: list[int]) -> list[tuple[int, list[Signal]]]:
+            return [(n, _signals(chain_id, n, [uuid.uuid4().hex for _ in range(10)])) for n in ns]
+
+        async def commit(items: list[tuple[int, list[Signal]]]) -> None:
+            for n, sigs in items:
+                h = f"0x{chain_id}{n:056x}"
+                await store.commit_block(n, h, None, utcnow(), None, 100, "success", {}, sigs)
+
+        yield Bench(
+            f"store.{backend}.commit_block[{batch}]",
+            "store",
+            batch,
+            commit,
+            lambda: scanned(blocks()),
+        )
+    finally:
+        db = db_session.SessionLocal()
+        try:
+            db.execute(delete(Signal).where(Signal.chain_id == chain_id))
+            db.execute(delete(Scan).where(Scan.chain_id == chain_id))
+            db.execute(delete(Block).where(Block.chain_id == chain_id))
+            db.commit()
+        finally:
+            db.close()
+
+
+# --- rpc -----------------------------------------------------------------------------------
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+@contextlib.asynccontextmanager
+async def rpc_benches(block_txs: int) -> AsyncIterator[list[Bench]]:
+    from load_test import wait_for_node
+
+    port = _free_port()
+    start = 1_000_000
+    argv = [
+        *("--port", str(port), "--start-block", str(start), "--block-time", "1"),
+        *("--genesis-time", repr(time.time() - 10_000), "--txs", str(block_txs)),
+        *("--txs-jitter", "0"),
+    ]
+    proc = subprocess.Popen([sys.executable, str(HERE / "fake_node.py"), *argv])
+    url = f"http://127.0.0.1:{port}/"
+    rpc = JsonRpcClient(url)
+    try:
+        await wait_for_node(url)
+        number = hex(start + 10)
+        block = await rpc.call("eth_getBlockByNumber", [number, False])
+        batch = [("eth_getTransactionReceipt", [h]) for h in block["transactions"][:100]]
+
+        async def concurrent(k: int = 64) -> None:
+            await asyncio.gather(*(rpc.call("eth_blockNumber") for _ in range(k)))
+
+        yield [
+            Bench("rpc.call", "rpc", 1, lambda: rpc.call("eth_blockNumber")),
+            Bench("rpc.call_concurrent[64]", "rpc", 64, concurrent),
+            Bench(
+                f"rpc.call_batch[{len(batch)}]", "rpc", len(batch), lambda: rpc.call_batch(batch)
+            ),
+            Bench(
+                f"rpc.block_receipts[{block_txs}]",
+                "rpc",
+                block_txs,
+                lambda: rpc.call("eth_getBlockReceipts", [number]),
+            ),
+        ]
+    finally:
+        await rpc.aclose()
+        proc.terminate()
+        proc.wait(timeout=10)
+
+
+# --- reporting -----------------------------------------------------------------------------
+
+
+def _git_commit() -> str | None:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, cwd=HERE
+        )
+    except OSError:
+        return None
+    return out.stdout.strip() or None
+
+
+def environment() -> dict[str, Any]:
+    return {
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "numpy": columnar.np.__version__ if columnar.HAS_NUMPY else None,
+        "time": utcnow().isoformat(),
+    }
+
+
+def compare(base: dict[str, Any], new: dict[str, Any], threshold: float) -> list[str]:
+    """Prints a comparison table and returns the names of benchmarks that regressed."""
+    old_r, new_r = base["results"], new["results"]
+    regressed = []
+    print(f"{'benchmark':<44} {'base':>11} {'new':>11} {'change':>8}")
+    for name in sorted(new_r):
+        if name not in old_r:
+            continue
+        b, n = old_r[name]["median_s"], new_r[name]["median_s"]
+        change = n / b - 1 if b > 0 else 0.0
+        mark = ""
+        if change > threshold:
+            mark = "  REGRESSION"
+            regressed.append(name)
+        elif change < -threshold:
+            mark = "  faster"
+        print(f"{name:<44} {_fmt(b):>11} {_fmt(n):>11} {change:+8.1%}{mark}")
+    missing = len(set(old_r) - set(new_r))
+    if missing:
+        print(f"{missing} baseline benchmark(s) not run")
+    if regressed:
+        print(f"{len(regressed)} regression(s) beyond {threshold:.0%}")
+    return regressed
+
+
+def _fmt(seconds: float) -> str:
+    if seconds >= 1:
+        return f"{seconds:.3f} s"
+    if seconds >= 1e-3:
+        return f"{seconds * 1e3:.3f} ms"
+    return f"{seconds * 1e6:.2f} us"
+
+
+async def run(a: argparse.Namespace) -> dict[str, Any]:
+    groups = set(a.groups)
+    only = re.compile(a.only) if a.only else None
+    results: dict[str, Any] = {}
+    cleanup: list[Callable[[], Any]] = []
+
+    async def record(b: Bench) -> None:
+        if only is not None and not only.search(b.name):
+            return
+        gc.collect()
+        samples = await measure(b, a.repeat, a.min_time)
+        median = statistics.median(samples)
+        results[b.name] = {
+            "group": b.group,
+            "items": b.items,
+            "median_s": median,
+            "min_s": min(samples),
+            "max_s": max(samples),
+            "samples": len(samples),
+            "per_item_us": median / max(1, b.items) * 1e6,
+        }
+        print(f"{b.name:<44} {_fmt(median):>11}  {results[b.name]['per_item_us']:9.3f} us/item")
+
+    try:
+        if "analyzers" in groups:
+            for b in analyzer_benches(a.sizes, a.seed):
+                await record(b)
+        if "signals" in groups:
+            async for b in signal_benches(a.sizes, a.seed):
+                await record(b)
+        if "store" in groups:
+            tmp = tempfile.mkdtemp(prefix="scanner-bench-")
+            cleanup.append(lambda: shutil.rmtree(tmp, ignore_errors=True))
+            backends = [("sqlite", f"sqlite:///{os.path.join(tmp, 'bench.db')}")]
+            if a.pg_url:
+                backends.append(("postgres", a.pg_url))
+            for backend, url in backends:
+                try:
+                    for b in store_benches(backend, url, a.store_batch):
+                        await record(b)
+                except Exception as e:
+                    if backend == "sqlite":
+                        raise
+                    reason = str(e).splitlines()[0]
+                    print(f"store.{backend}: skipped ({type(e).__name__}: {reason})")
+                finally:
+                    await dispose_async_engine()
+        if "rpc" in groups:
+            async with rpc_benches(a.rpc_block_txs) as benches:
+                for b in benches:
+                    await record(b)
+    finally:
+        for fn in cleanup:
+            fn()
+
+    return {
+        "env": environment(),
+        "config": {
+            "sizes": a.sizes,
+            "seed": a.seed,
+            "repeat": a.repeat,
+            "min_time": a.min_time,
+            "store_batch": a.store_batch,
+            "rpc_block_txs": a.rpc_block_txs,
+        },
+        "results": results,
+    }
+
+
+def _load(path: str) -> dict[str, Any]:
+    with open(path, "rb") as f:
+        return orjson.loads(f.read())
+
+
+def main() -> int:
+    p = argparse.ArgumentParser(description="Scanner benchmark suite with regression check.")
+    p.add_argument("--out", default=None, help="Write results JSON here")
+    p.add_argument("--baseline", default=None, help="Results JSON to compare this run with")
+    p.add_argument("--compare", nargs=2, metavar=("BASE", "NEW"), help="Compare two files only")
+    p.add_argument("--threshold", type=float, default=0.15, help="Allowed median slowdown")
+    p.add_argument("--groups", nargs="+", choices=GROUPS, default=list(GROUPS))
+    p.add_argument("--only", default=None, help="Regex on benchmark names")
+    p.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1_000, 5_000, 20_000])
+    p.add_argument("--seed", type=int, default=7)
+    p.add_argument("--repeat", type=int, default=7, help="Samples per benchmark")
+    p.add_argument("--min-time", type=float, default=0.05, help="Seconds per sample (fast fns)")
+    p.add_argument("--store-batch", type=int, default=100, help="Rows per store call")
+    p.add_argument("--rpc-block-txs", type=int, default=2_000)
+    p.add_argument("--pg-url", default=os.getenv("SCANNER_BENCH_PG_URL"))
+    p.add_argument("--quick", action="store_true", help="Fewer sizes and samples")
+    a = p.parse_args()
+
+    if a.compare:
+        base, new = (_load(path) for path in a.compare)
+        return 1 if compare(base, new, a.threshold) else 0
+    if a.quick:
+        a.sizes, a.repeat, a.min_time = [100, 5_000], 3, 0.02
+
+    report = asyncio.run(run(a))
+    if a.out:
+        with open(a.out, "wb") as f:
+            f.write(orjson.dumps(report, option=orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS))
+        print(f"wrote {a.out}")
+    if a.baseline:
+        return 1 if compare(_load(a.baseline), report, a.threshold) else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import sys
+
+from synth import synth_edge_block
+
+from scanner.analyzers import (
+    ConflictPatternsAnalyzer,
+    HotStateAnalyzer,
+    OrderingSensitivityAnalyzer,
+)
+from scanner.analyzers.base import AnalyzerContext
+from scanner.analyzers.columnar import HAS_NUMPY, ReceiptTable
+
+# Parity check: the NumPy path must return exactly what the dict-based path returns.
+# Runs both paths over randomized blocks (including missing receipts, contract creations,
+# topic-less logs, >50 logs per tx and count ties) and exits non-zero on any difference.
+
+
+async def compare(seed: int, n_txs: int, analyzers) -> list[str]:
+    rnd = random.Random(seed)
+    txs, receipts = synth_edge_block(rnd, n_txs)
+    ctx = AnalyzerContext(
+        chain_id="parity",
+        block_number=seed,
+        block_hash="0x0",
+        tx_hashes=txs,
+        receipts=receipts,
+        raw_block={},
+    )
+    table = ReceiptTable.from_features(ctx.features)
+    diffs = []
+    for a in analyzers:
+        ctx.table = None
+        expected = await a.analyze(ctx)
+        ctx.table = table
+        got = await a.analyze(ctx)
+        if got != expected:
+            diffs.append(
+                f"seed={seed} txs={n_txs} analyzer={a.name}\n  dict:  {expected}\n  numpy: {got}"
+            )
+    return diffs
+
+
+def check(blocks: int, max_txs: int) -> list[str]:
+    analyzers = [OrderingSensitivityAnalyzer(), ConflictPatternsAnalyzer(), HotStateAnalyzer()]
+    sizes = random.Random(0)
+    diffs: list[str] = []
+    for seed in range(blocks):
+        n = sizes.choice((0, 1, 2, 5, 50)) if seed % 5 == 0 else sizes.randint(1, max_txs)
+        diffs += asyncio.run(compare(seed, n, analyzers))
+    return diffs
+
+
+def main() -> int:
+    p = argparse.ArgumentParser(description="Check NumPy analyzer results against the dict path.")
+    p.add_argument("--blocks", type=int, default=300)
+    p.add_argument("--max-txs", type=int, default=3000)
+    a = p.parse_args()
+    if not HAS_NUMPY:
+        print("numpy is not installed: pip install 'chain-digital-monad-scanner[fast]'")
+        return 2
+
+    diffs = check(a.blocks, a.max_txs)
+    for d in diffs[:20]:
+        print(d)
+    print(f"checked blocks={a.blocks} mismatches={len(diffs)}")
+    return 1 if diffs else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+import asyncio
+import bisect
+import hashlib
+import itertools
+import random
+import time
+from collections import OrderedDict
+from typing import Any
+
+import orjson
+import uvicorn
+from starlette.applications import Starlette
+from starlette.requests import ClientDisconnect, Request
+from starlette.responses import Response
+from starlette.routing import Route
+
+# Synthetic Monad JSON-RPC node for load tests. Blocks appear every --block-time seconds from
+# --start-block with --txs transactions each; content is a pure function of (seed, number,
+# fork), so any block can be served again without storing it. Tx hashes embed their block and
+# fork: 0x <number:16> <fork:8> <index:8> <digest:32>.
+#
+#   python scripts/fake_node.py --port 8799 --block-time 0.4 --txs 2000 --revert-ratio 0.05 \
+#       --hot-skew 1.2 --latency-ms 5 --error-rate 0.01 --reorg-every 50 --reorg-depth 2
+
+ZERO_BLOOM = "0x" + "00" * 256
+
+
+def _digest(*parts: Any) -> str:
+    return hashlib.blake2b(repr(parts).encode(), digest_size=16).hexdigest()
+
+
+class Chain:
+    def __init__(self, a: argparse.Namespace) -> None:
+        self.a = a
+        self.genesis = a.genesis_time or time.time()
+        self.forks: dict[int, int] = {}  # block -> fork counter, bumped by reorgs
+        self.last_reorg_head = a.start_block
+        self._blocks: OrderedDict[tuple[int, int], dict[str, Any]] = OrderedDict()
+        rnd = random.Random(a.seed)
+        self.contracts = [f"0x{rnd.getrandbits(160):040x}" for _ in range(a.contracts)]
+        self.topics = [f"0x{rnd.getrandbits(256):064x}" for _ in range(a.topics)]
+        # Zipf-like weights: contract k gets 1 / (k + 1) ** skew of the traffic.
+        weights = [1.0 / (k + 1) ** a.hot_skew for k in range(a.contracts)]
+        self.cum = list(itertools.accumulate(weights))
+
+    def head(self) -> int:
+        produced = int((time.time() - self.genesis) / self.a.block_time)
+        head = self.a.start_block + max(0, produced)
+        every = self.a.reorg_every
+        if every and head - self.last_reorg_head >= every:
+            self.last_reorg_head = head
+            for n in range(head - self.a.reorg_depth + 1, head + 1):
+                self.forks[n] = self.forks.get(n, 0) + 1
+        return head
+
+    def produced_at(self, number: int) -> float:
+        return self.genesis + (number - self.a.start_block) * self.a.block_time
+
+    def block_hash(self, number: int) -> str:
+        return "0x" + _digest(self.a.seed, "block", number, self.forks.get(number, 0)) * 2
+
+    def tx_count(self, number: int) -> int:
+        jitter = self.a.txs_jitter
+        if not jitter:
+            return self.a.txs
+        rnd = random.Random(f"{self.a.seed}:n:{number}")
+        return max(0, int(self.a.txs * (1 + rnd.uniform(-jitter, jitter))))
+
+    def block(self, number: int) -> dict[str, Any]:
+        fork = self.forks.get(number, 0)
+        key = (number, fork)
+        cached = self._blocks.get(key)
+        if cached is not None:
+            self._blocks.move_to_end(key)
+            return cached
+
+        rnd = random.Random(f"{self.a.seed}:{number}:{fork}")
+        txs, receipts, gas_total = [], [], 0
+        for i in range(self.tx_count(number)):
+            h = f"0x{number:016x}{fork:08x}{i:08x}{rnd.getrandbits(128):032x}"
+            k = bisect.bisect_left(self.cum, rnd.random() * self.cum[-1])
+            to = self.contracts[min(k, len(self.contracts) - 1)]
+            gas = rnd.randint(21_000, 300_000)
+            gas_total += gas
+            logs = [
+                {
+                    "address": to,
+                    "topics": [rnd.choice(self.topics), f"0x{rnd.getrandbits(256):064x}"],
+                    "data": "0x" + "00" * 32,
+                    "logIndex": hex(j),
+                    "transactionHash": h,
+                }
+                for j in range(rnd.choice((0, 1, 1, 2, 3)))
+            ]
+            txs.append(h)
+            receipts.append(
+                {
+                    "transactionHash": h,
+                    "transactionIndex": hex(i),
+                    "blockNumber": hex(number),
+                    "from": f"0x{rnd.getrandbits(160):040x}",
+                    "to": to,
+                    "status": "0x0" if rnd.random() < self.a.revert_ratio else "0x1",
+                    "gasUsed": hex(gas),
+                    "cumulativeGasUsed": hex(gas_total),
+                    "logsBloom": ZERO_BLOOM,
+                    "logs": logs,
+                }
+            )
+        blk = {
+            "number": hex(number),
+            "hash": self.block_hash(number),
+            "parentHash": self.block_hash(number - 1),
+            "timestamp": hex(int(self.produced_at(number))),
+            "gasUsed": hex(gas_total),
+            "logsBloom": ZERO_BLOOM,
+            "transactions": txs,
+            "_receipts": receipts,
+        }
+        self._blocks[key] = blk
+        while len(self._blocks) > self.a.block_cache:
+            self._blocks.popitem(last=False)
+        return blk
+
+    def receipt(self, tx_hash: str) -> dict[str, Any] | None:
+        try:
+            number = int(tx_hash[2:18], 16)
+            fork, index = int(tx_hash[18:26], 16), int(tx_hash[26:34], 16)
+        except ValueError:
+            return None
+        if number > self.head() or self.forks.get(number, 0) != fork:
+            return None  # unknown, or dropped by a reorg
+        receipts = self.block(number)["_receipts"]
+        return receipts[index] if index < len(receipts) else None
+
+
+class Node:
+    def __init__(self, a: argparse.Namespace) -> None:
+        self.a = a
+        self.chain = Chain(a)
+        self.calls = 0
+
+    def answer(self, req: dict[str, Any]) -> dict[str, Any]:
+        self.calls += 1
+        rid, method, params = req.get("id"), req.get("method"), req.get("params") or []
+        if self.a.error_rate and random.random() < self.a.error_rate:
+            return _error(rid, -32005, "limit exceeded")
+        chain = self.chain
+        if method == "eth_blockNumber":
+            return _result(rid, hex(chain.head()))
+        if method == "eth_chainId":
+            return _result(rid, hex(self.a.chain_id))
+        if method == "eth_getBlockByNumber":
+            n = chain.head() if params[0] == "latest" else int(params[0], 16)
+            if n > chain.head():
+                return _result(rid, None)
+            blk = {k: v for k, v in chain.block(n).items() if k != "_receipts"}
+            return _result(rid, blk)
+        if method == "eth_getTransactionReceipt":
+            return _result(rid, chain.receipt(params[0]))
+        if method == "eth_getBlockReceipts" and not self.a.no_block_receipts:
+            n = int(params[0], 16)
+            return _result(rid, chain.block(n)["_receipts"] if n <= chain.head() else None)
+        return _error(rid, -32601, f"the method {method} does not exist")
+
+    async def handle(self, request: Request) -> Response:
+        if self.a.latency_ms:
+            await asyncio.sleep(random.expovariate(1000.0 / self.a.latency_ms))
+        if self.a.http_error_rate and random.random() < self.a.http_error_rate:
+            return Response(b"overloaded", status_code=503)
+        try:
+            body = orjson.loads(await request.body())
+        except ClientDisconnect:
+            return Response(status_code=499)
+        if isinstance(body, list):
+            if self.a.no_batch:
+                return Response(orjson.dumps(_error(None, -32600, "batch not supported")))
+            out: Any = [self.answer(r) for r in body]
+        else:
+            out = self.answer(body)
+        return Response(orjson.dumps(out), media_type="application/json")
+
+
+def _result(rid: Any, result: Any) -> dict[str, Any]:
+    return {"jsonrpc": "2.0", "id": rid, "result": result}
+
+
+def _error(rid: Any, code: int, message: str) -> dict[str, Any]:
+    return {"jsonrpc": "2.0", "id": rid, "error": {"code": code, "message": message}}
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    p = argparse.ArgumentParser(description="Synthetic Monad JSON-RPC node for load tests.")
+    p.add_argument("--host", default="127.0.0.1")
+    p.add_argument("--port", type=int, default=8799)
+    p.add_argument("--seed", type=int, default=1)
+    p.add_argument("--chain-id", type=int, default=143)
+    p.add_argument("--start-block", type=int, default=1_000_000)
+    p.add_argument("--genesis-time", type=float, default=None, help="Epoch of --start-block")
+    p.add_argument("--block-time", type=float, default=0.4, help="Seconds per block")
+    p.add_argument("--txs", type=int, default=500, help="Transactions per block")
+    p.add_argument("--txs-jitter", type=float, default=0.2, help="+/- fraction of --txs")
+    p.add_argument("--revert-ratio", type=float, default=0.03)
+    p.add_argument("--contracts", type=int, default=2000)
+    p.add_argument("--topics", type=int, default=64)
+    p.add_argument("--hot-skew", type=float, default=1.1, help="Zipf exponent of contract use")
+    p.add_argument("--latency-ms", type=float, default=0.0, help="Mean injected latency")
+    p.add_argument("--error-rate", type=float, default=0.0, help="JSON-RPC -32005 per call")
+    p.add_argument("--http-error-rate", type=float, default=0.0, help="HTTP 503 per request")
+    p.add_argument("--reorg-every", type=int, default=0, help="Reorg every N blocks (0: never)")
+    p.add_argument("--reorg-depth", type=int, default=2)
+    p.add_argument("--no-batch", action="store_true", help="Reject batch payloads")
+    p.add_argument("--no-block-receipts", action="store_true", help="No eth_getBlockReceipts")
+    p.add_argument("--block-cache", type=int, default=64, help="Generated blocks kept")
+    return p.parse_args(argv)
+
+
+def build_app(a: argparse.Namespace) -> Starlette:
+    node = Node(a)
+    app = Starlette(routes=[Route("/", node.handle, methods=["POST"])])
+    app.state.node = node
+    return app
+
+
+def main() -> None:
+    a = parse_args()
+    uvicorn.run(build_app(a), host=a.host, port=a.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+from fake_node import parse_args as node_args
+from sqlalchemy import func, select
+
+from scanner.db import session as db_session
+from scanner.db.base import Base
+from scanner.db.models import Block, Scan
+from scanner.db.session import dispose_async_engine, set_db_url
+from scanner.settings import Settings
+
+# End-to-end load test: starts scripts/fake_node.py as a separate process, runs
+# scanner.main.run_scanner against it from the node's first block and reports blocks/s,
+# head lag and per-block latency (block produced -> scan committed). Arguments not listed
+# below are passed to the fake node, e.g.
+#
+#   python scripts/load_test.py --duration 60 --block-time 0.2 --txs 3000 --latency-ms 10
+
+HERE = Path(__file__).resolve().parent
+
+
+def percentile(xs: list[float], q: float) -> float:
+    if not xs:
+        return float("nan")
+    xs = sorted(xs)
+    return xs[min(len(xs) - 1, int(q * len(xs)))]
+
+
+async def wait_for_node(url: str, timeout: float = 15.0) -> None:
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient() as c:
+        while True:
+            try:
+                await c.post(url, json={"jsonrpc": "2.0", "id": 1, "method": "eth_blockNumber"})
+                return
+            except httpx.HTTPError:
+                if time.monotonic() > deadline:
+                    raise
+                await asyncio.sleep(0.1)
+
+
+def scanned_head(chain_id: str) -> int | None:
+    db = db_session.SessionLocal()
+    try:
+        return db.execute(
+            select(func.max(Scan.block_number)).where(
+                Scan.chain_id == chain_id, Scan.status == "success"
+            )
+        ).scalar()
+    finally:
+        db.close()
+
+
+async def run(a: argparse.Namespace, node: argparse.Namespace, node_argv: list[str]) -> int:
+    from scanner.main import run_scanner  # imports the API app; keep after DB setup
+
+    cfg = Settings(SCANNER_CONFIG=a.config).load()
+    url = f"http://127.0.0.1:{a.port}/"
+    cfg.rpc.url, cfg.rpc.urls, cfg.rpc.ws_url = url, [], None
+    cfg.db.url = a.db_url
+    cfg.scanner.backfill_start_block = node.start_block
+    cfg.scanner.poll_interval_seconds = min(cfg.scanner.poll_interval_seconds, node.block_time)
+    chain_id = cfg.chain.id
+
+    genesis = time.time() + 2.0  # leave the node time to boot before block one
+    argv = [*node_argv, "--port", str(a.port), "--genesis-time", repr(genesis)]
+    proc = subprocess.Popen([sys.executable, str(HERE / "fake_node.py"), *argv])
+    lags: list[int] = []
+    try:
+        await wait_for_node(url)
+        await asyncio.sleep(max(0.0, genesis - time.time()))
+        t0 = time.time()
+        scanner = asyncio.create_task(run_scanner(cfg))
+        while time.time() - t0 < a.duration and not scanner.done():
+            await asyncio.sleep(a.sample_seconds)
+            head = node.start_block + int((time.time() - genesis) / node.block_time)
+            done = scanned_head(chain_id)
+            lags.append(head - (done if done is not None else node.start_block - 1))
+        elapsed = time.time() - t0
+        scanner.cancel()
+        try:
+            await scanner
+        except asyncio.CancelledError:
+            pass
+    finally:
+        await dispose_async_engine()
+        proc.terminate()
+        proc.wait(timeout=10)
+
+    db = db_session.SessionLocal()
+    try:
+        scans = db.execute(select(Scan).where(Scan.chain_id == chain_id)).scalars().all()
+        txs = db.execute(
+            select(func.coalesce(func.sum(Block.tx_count), 0)).where(Block.chain_id == chain_id)
+        ).scalar()
+    finally:
+        db.close()
+    ok = [s for s in scans if s.status == "success" and s.finished_at is not None]
+    # Latency: from the moment the node produced the block to its scan being committed.
+    def produced_at(n: int) -> float:
+        return genesis + (n - node.start_block) * node.block_time
+
+    latencies = [s.finished_at.timestamp() - produced_at(s.block_number) for s in ok]
+    produced = int(elapsed / node.block_time)
+
+    print(
+        f"node: block_time={node.block_time}s txs/block~{node.txs} "
+        f"latency_ms={node.latency_ms} error_rate={node.error_rate} reorg_every={node.reorg_every}"
+    )
+    print(f"duration          {elapsed:8.1f} s")
+    print(f"blocks produced   {produced:8d}   ({produced / elapsed:.1f}/s)")
+    failed = len(scans) - len(ok)
+    print(f"blocks scanned    {len(ok):8d}   ({len(ok) / elapsed:.1f}/s)  failed={failed}")
+    print(f"txs scanned       {txs:8d}   ({txs / elapsed:.0f}/s)")
+    print(
+        f"head lag blocks   p50={percentile(lags, 0.5):.0f} max={max(lags, default=0)} "
+        f"final={lags[-1] if lags else 0}"
+    )
+    print(
+        f"block latency s   p50={percentile(latencies, 0.5):.3f} "
+        f"p99={percentile(latencies, 0.99):.3f} max={max(latencies, default=float('nan')):.3f}"
+    )
+    # Saturated: the lag is still growing at the end of the run rather than holding steady.
+    tail = lags[len(lags) // 2 :]
+    saturated = len(tail) >= 2 and tail[-1] > tail[0] + 2
+    print("verdict           " + ("falling behind (saturated)" if saturated else "keeping up"))
+    return 0
+
+
+def main() -> int:
+    p = argparse.ArgumentParser(description="End-to-end scanner load test against fake_node.py.")
+    p.add_argument("--duration", type=float, default=30.0)
+    p.add_argument("--config", default="configs/config.example.yaml")
+    p.add_argument("--db-url", default=None, help="Default: a fresh SQLite file")
+    p.add_argument("--port", type=int, default=8799)
+    p.add_argument("--sample-seconds", type=float, default=0.5)
+    p.add_argument("--log-level", default="ERROR", help="Scanner log level during the run")
+    a, node_argv = p.parse_known_args()
+    node = node_args(node_argv)
+    logging.basicConfig(level=a.log_level, format="%(levelname)s %(name)s :: %(message)s")
+
+    if a.db_url is None:
+        tmp = tempfile.mkdtemp(prefix="scanner-load-")
+        a.db_url = f"sqlite:///{os.path.join(tmp, 'load.db')}"
+    set_db_url(a.db_url)
+    if a.db_url.startswith("sqlite"):
+        Base.metadata.create_all(db_session.get_engine())
+    return asyncio.run(run(a, node, node_argv))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+import gc
+import tracemalloc
+
+from synth import synth_rpc_block
+
+from scanner.analyzers.features import BlockFeaturesBuilder
+from scanner.rpc.types import BlockRef, Receipt, TxHashes
+
+# Retained memory per in-flight block: what the pipeline keeps between fetch and persist.
+# "dicts" holds the RPC block dict plus every receipt dict (the pre-streaming layout);
+# "compact" holds a slotted BlockRef with packed tx hashes plus the reduced BlockFeatures.
+
+
+def retained(build) -> int:
+    gc.collect()
+    tracemalloc.start()
+    base = tracemalloc.get_traced_memory()[0]
+    kept = build()
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0] - base
+    tracemalloc.stop()
+    del kept
+    return size
+
+
+def main() -> None:
+    p = argparse.ArgumentParser(description="Measure retained memory per in-flight block.")
+    p.add_argument("--txs", type=int, default=10_000)
+    p.add_argument("--seed", type=int, default=7)
+    a = p.parse_args()
+
+    # Each build decodes its own copy so nothing is shared with the source objects.
+    def dicts():
+        block, receipts = synth_rpc_block(a.txs, a.seed)
+        return block, {r["transactionHash"]: r for r in receipts}
+
+    def compact():
+        block, receipts = synth_rpc_block(a.txs, a.seed)
+        ref = BlockRef(
+            number=int(block["number"], 16),
+            hash=block["hash"],
+            parent_hash=block["parentHash"],
+            timestamp=None,
+            tx_hashes=TxHashes.pack(block["transactions"]),
+        )
+        builder = BlockFeaturesBuilder()
+        builder.add(Receipt.from_rpc(r, builder.seen) for r in receipts)
+        del block, receipts
+        return ref, builder.build()
+
+    before, after = retained(dicts), retained(compact)
+    print(f"txs={a.txs}")
+    print(f"dicts    {before / 1e6:8.2f} MB/block")
+    print(f"compact  {after / 1e6:8.2f} MB/block  ({before / after:.1f}x smaller)")
+
+
+if __name__ == "__main__":
+    main()
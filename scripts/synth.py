@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import bisect
+import itertools
+import random
+from typing import Any
+
+# Seeded synthetic blocks for benchmarks and parity checks. The same (n_txs, seed) always yields
+# the same block, so results from different commits are comparable. Contract use is Zipf-skewed
+# like real traffic and targets are mixed-case (checksummed-looking) so normalization is exercised.
+
+ZERO_BLOOM = "0x" + "00" * 256
+
+
+def synth_rpc_block(
+    n_txs: int,
+    seed: int = 1,
+    number: int = 1000,
+    revert_ratio: float = 0.05,
+    hot_skew: float = 1.1,
+) -> tuple[dict[str, Any], list[dict[str, Any]]]:
+    """An eth_getBlockByNumber result (hashes only) and its eth_getBlockReceipts result."""
+    rnd = random.Random(f"{seed}:{n_txs}:{number}")
+    n_targets = max(1, n_txs // 20)
+    targets = [f"0x{rnd.getrandbits(160):040X}" for _ in range(n_targets)]
+    topics = [f"0x{rnd.getrandbits(256):064x}" for _ in range(64)]
+    cum = list(itertools.accumulate(1.0 / (k + 1) ** hot_skew for k in range(n_targets)))
+
+    hashes, receipts, gas_total = [], [], 0
+    for i in range(n_txs):
+        h = f"0x{rnd.getrandbits(256):064x}"
+        to = targets[min(bisect.bisect_left(cum, rnd.random() * cum[-1]), n_targets - 1)]
+        gas = rnd.randint(21_000, 300_000)
+        gas_total += gas
+        logs = [
+            {
+                "address": to,
+                "topics": [rnd.choice(topics), f"0x{rnd.getrandbits(256):064x}"],
+                "data": "0x" + "00" * 32,
+                "logIndex": hex(j),
+                "transactionHash": h,
+            }
+            for j in range(rnd.choice((0, 1, 1, 2, 3, 5)))
+        ]
+        hashes.append(h)
+        receipts.append(
+            {
+                "transactionHash": h,
+                "transactionIndex": hex(i),
+                "blockNumber": hex(number),
+                "to": to,
+                "status": "0x0" if rnd.random() < revert_ratio else "0x1",
+                "gasUsed": hex(gas),
+                "cumulativeGasUsed": hex(gas_total),
+                "logsBloom": ZERO_BLOOM,
+                "logs": logs,
+            }
+        )
+    block = {
+        "number": hex(number),
+        "hash": f"0x{rnd.getrandbits(256):064x}",
+        "parentHash": f"0x{rnd.getrandbits(256):064x}",
+        "timestamp": hex(1_700_000_000 + number),
+        "gasUsed": hex(gas_total),
+        "logsBloom": ZERO_BLOOM,
+        "transactions": hashes,
+    }
+    return block, receipts
+
+
+def synth_block(n_txs: int, seed: int = 1) -> tuple[list[str], dict[str, dict[str, Any]]]:
+    """Tx hashes and a tx_hash -> receipt map, the AnalyzerContext inputs."""
+    block, receipts = synth_rpc_block(n_txs, seed)
+    return block["transactions"], {r["transactionHash"]: r for r in receipts}
+
+
+def synth_edge_block(rnd: random.Random, n_txs: int) -> tuple[list[str], dict[str, dict | None]]:
+    """
+    Tx hashes and receipts full of edge cases for parity checks: missing receipts, contract
+    creations, topic-less logs, >50 logs per tx, and few targets/topics so adjacency flips and
+    count ties actually happen.
+    """
+    targets = [f"0x{rnd.getrandbits(160):040X}" for _ in range(rnd.randint(1, 12))]
+    topics = [f"0x{rnd.getrandbits(256):064X}" for _ in range(rnd.randint(1, 8))]
+    tx_hashes, receipts = [], {}
+    for i in range(n_txs):
+        h = f"0x{i:064x}"
+        tx_hashes.append(h)
+        roll = rnd.random()
+        if roll < 0.03:
+            continue  # receipt missing entirely
+        if roll < 0.05:
+            receipts[h] = None
+            continue
+        n_logs = 60 if rnd.random() < 0.01 else rnd.choice((0, 1, 1, 2, 4))
+        logs = []
+        for _ in range(n_logs):
+            logs.append({"topics": [rnd.choice(topics)] if rnd.random() > 0.1 else []})
+        receipts[h] = {
+            "to": None if rnd.random() < 0.05 else rnd.choice(targets),
+            "status": rnd.choice(("0x1", "0x1", "0x0", "0x1", None)),
+            "gasUsed": hex(rnd.randint(21_000, 500_000)),
+            "logs": logs,
+        }
+    return tx_hashes, receipts
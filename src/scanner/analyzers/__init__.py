@@ -2,10 +2,12 @@ from .ordering_sensitivity import OrderingSensitivityAnalyzer
 from .conflict_patterns import ConflictPatternsAnalyzer
 from .hot_state import HotStateAnalyzer
 from .hidden_dependencies import HiddenDependenciesAnalyzer
+from .registry import AnalyzerRegistry
 
 __all__ = [
     "OrderingSensitivityAnalyzer",
     "ConflictPatternsAnalyzer",
     "HotStateAnalyzer",
     "HiddenDependenciesAnalyzer",
+    "AnalyzerRegistry",
 ]
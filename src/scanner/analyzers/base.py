@@ -1,21 +1,42 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+from functools import cached_property
 from typing import Any, Protocol
 
+from scanner.analyzers.columnar import ReceiptTable, build_table
+from scanner.analyzers.features import BlockFeatures
+
 
 @dataclass
 class AnalyzerContext:
     chain_id: str
     block_number: int
     block_hash: str
-    tx_hashes: list[str]
+    tx_hashes: Sequence[str]
     receipts: dict[str, dict[str, Any] | None]  # tx_hash -> receipt (optional)
-    raw_block: dict[str, Any]
+    raw_block: dict[str, Any]  # empty unless raw block storage is enabled
+    # Built once from receipts unless passed in (out-of-process analyzers get features only);
+    # analyzers read this instead of walking raw receipt dicts.
+    features: BlockFeatures | None = field(default=None, repr=False)
+
+    def __post_init__(self) -> None:
+        if self.features is None:
+            self.features = BlockFeatures.from_receipts(self.tx_hashes, self.receipts)
+
+    @cached_property
+    def table(self) -> ReceiptTable | None:
+        # Columnar NumPy view of the same data for heavy blocks; None without numpy or on small
+        # blocks. Built on first access, so a block pays for it only when a vectorized analyzer
+        # runs. Analyzers with a vectorized path use it when present, with identical results.
+        return build_table(self.features)
 
 
 class Analyzer(Protocol):
     name: str
+    category: str  # selects the signal explainer: ordering/conflict/hot_state/dependency/...
+    optional: bool  # may be skipped by the block cost budget when behind head
 
     async def analyze(self, ctx: AnalyzerContext) -> list[dict[str, Any]]:
         """
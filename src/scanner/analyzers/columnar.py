@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from itertools import chain
+
+from scanner.analyzers.features import BlockFeatures
+
+try:  # optional: pip install 'chain-digital-monad-scanner[fast]'
+    import numpy as np
+except ImportError:  # pragma: no cover - depends on the install
+    np = None
+
+HAS_NUMPY = np is not None
+
+# Below this many txs the array setup costs more than the Python loops it replaces.
+COLUMNAR_MIN_TXS = 256
+
+
+@dataclass
+class ReceiptTable:
+    """
+    Columnar view of a block's receipts for vectorized analyzers.
+
+    Per-tx arrays (length = tx count): `to_id` (-1 = none), `status` (1 ok, 0 failed,
+    -1 unknown), `gas_used`, `log_counts`. Per-log arrays (one entry per log, in tx order):
+    `topic_id` (first topic, -1 = none), `topic_tx` (owning tx index), `topic_pos` (index of
+    the log within its tx). Ids index into `addresses` / `topics`, assigned in order of first
+    appearance so results can be ordered exactly like the dict-based path.
+    """
+
+    addresses: list[str]
+    topics: list[str]
+    to_id: np.ndarray
+    status: np.ndarray
+    gas_used: np.ndarray
+    log_counts: np.ndarray
+    topic_id: np.ndarray
+    topic_tx: np.ndarray
+    topic_pos: np.ndarray
+
+    @classmethod
+    def from_features(cls, f: BlockFeatures) -> ReceiptTable:
+        n = len(f.to)
+        addresses, to_id = _encode(f.to)
+        status = np.array([-1 if s is None else s for s in f.status], dtype=np.int8)
+
+        log_counts = np.asarray(f.log_counts, dtype=np.int32)
+        flat = list(chain.from_iterable(f.first_topics))
+        topics, topic_id = _encode(flat)
+        total = len(flat)
+        topic_tx = np.repeat(np.arange(n, dtype=np.int32), log_counts)
+        starts = np.cumsum(log_counts) - log_counts
+        topic_pos = np.arange(total, dtype=np.int32) - np.repeat(starts, log_counts)
+
+        return cls(
+            addresses=list(addresses),
+            topics=list(topics),
+            to_id=to_id,
+            status=status,
+            gas_used=np.asarray(f.gas_used, dtype=np.int64),
+            log_counts=log_counts,
+            topic_id=topic_id,
+            topic_tx=topic_tx,
+            topic_pos=topic_pos.astype(np.int32),
+        )
+
+
+def _encode(values: list[str | None]) -> tuple[dict[str, int], np.ndarray]:
+    # Integer-code values in order of first appearance; None/empty -> -1.
+    vocab: dict[str, int] = {}
+    setdefault = vocab.setdefault
+    codes = [setdefault(v, len(vocab)) if v else -1 for v in values]
+    return vocab, np.array(codes, dtype=np.int32)
+
+
+def build_table(f: BlockFeatures) -> ReceiptTable | None:
+    if not HAS_NUMPY or len(f.to) < COLUMNAR_MIN_TXS:
+        return None
+    return ReceiptTable.from_features(f)
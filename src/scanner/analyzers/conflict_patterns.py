@@ -1,25 +1,28 @@
 from __future__ import annotations
 
 from scanner.analyzers.base import AnalyzerContext
+from scanner.analyzers.columnar import np
 
 
 class ConflictPatternsAnalyzer:
     name = "conflict_patterns"
+    category = "conflict"
+    optional = False
 
     async def analyze(self, ctx: AnalyzerContext) -> list[dict]:
         # Simple: bursts of failures/reverts in the same block.
-        failures = 0
-        samples = []
-        for h in ctx.tx_hashes:
-            r = ctx.receipts.get(h) or {}
-            st = r.get("status")
-            if st is None:
-                continue
-            # EVM convention: "0x0" fail, "0x1" success
-            if isinstance(st, str) and st.lower() == "0x0":
-                failures += 1
-                if len(samples) < 10:
-                    samples.append(h)
+        if ctx.table is not None:
+            failed = np.flatnonzero(ctx.table.status == 0)
+            failures = int(failed.size)
+            samples = [ctx.tx_hashes[i] for i in failed[:10].tolist()]
+        else:
+            failures = 0
+            samples = []
+            for i, ok in enumerate(ctx.features.status):
+                if ok is False:
+                    failures += 1
+                    if len(samples) < 10:
+                        samples.append(ctx.tx_hashes[i])
 
         if failures == 0:
             return []
@@ -0,0 +1,196 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import multiprocessing as mp
+import pickle
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any
+
+from scanner.analyzers.base import Analyzer, AnalyzerContext
+from scanner.tracing import TRACER
+
+log = logging.getLogger("scanner.analyzers.executor")
+
+MODES = ("inline", "thread", "process")
+
+
+def _run(analyzer: Analyzer, ctx: AnalyzerContext) -> tuple[list[dict[str, Any]], float]:
+    # Analyzers are `async` by interface but never await anything; drive them to completion.
+    t0 = time.perf_counter()
+    findings = asyncio.run(analyzer.analyze(ctx))
+    return findings, time.perf_counter() - t0
+
+
+def _warmup() -> None:
+    # Importing the analyzers (and numpy) in a fresh worker is slow; do it before the first
+    # block so cold start does not count against analyzer timeouts.
+    import scanner.analyzers  # noqa: F401
+
+
+def _run_packed(analyzer: Analyzer, payload: bytes) -> tuple[list[dict[str, Any]], float]:
+    chain_id, block_number, block_hash, tx_hashes, features = pickle.loads(payload)
+    ctx = AnalyzerContext(
+        chain_id=chain_id,
+        block_number=block_number,
+        block_hash=block_hash,
+        tx_hashes=tx_hashes,
+        receipts={},
+        raw_block={},
+        features=features,
+    )
+    return _run(analyzer, ctx)
+
+
+class AnalyzerExecutor:
+    """
+    Runs a block's analyzers and collects their findings.
+
+    - inline: awaited one after another on the event loop (no timeouts: CPU-bound code on the
+      loop cannot be interrupted);
+    - thread: concurrently in a thread pool; helps when analyzers release the GIL (NumPy);
+    - process: concurrently in a process pool. Only the block's precomputed features are
+      shipped, pickled once per block, so out-of-process analyzers see empty `receipts` and
+      `raw_block` and must read `ctx.features` / `ctx.table`.
+
+    In pool modes each analyzer gets `timeout` seconds of wall clock. A timed-out or failing
+    analyzer is recorded and skipped; the scan keeps the other analyzers' findings. A process
+    pool with a timed-out task is replaced so a hung analyzer cannot pin a worker; a thread
+    cannot be killed, so in thread mode a hung analyzer keeps its thread until it returns.
+    """
+
+    def __init__(self, mode: str = "inline", workers: int = 2, timeout: float = 10.0) -> None:
+        if mode not in MODES:
+            raise ValueError(f"analysis executor must be one of {MODES}, got {mode!r}")
+        self.mode = mode
+        self.workers = max(1, workers)
+        self.timeout = timeout
+        self._pool: Executor | None = None
+        # Blocks analyzed concurrently on a cold start (or after _recycle) share one pool.
+        self._pool_lock = asyncio.Lock()
+
+    async def _executor(self) -> Executor:
+        if self._pool is None:
+            async with self._pool_lock:
+                if self._pool is None:
+                    self._pool = await self._new_pool()
+        return self._pool
+
+    async def _new_pool(self) -> Executor:
+        if self.mode != "process":
+            return ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="analyzer")
+        pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=mp.get_context("spawn"))
+        try:
+            await asyncio.gather(
+                *(asyncio.wrap_future(pool.submit(_warmup)) for _ in range(self.workers))
+            )
+        except BaseException:
+            pool.shutdown(wait=False, cancel_futures=True)
+            raise
+        return pool
+
+    async def run(
+        self, analyzers: list[tuple[str, Analyzer]], ctx: AnalyzerContext
+    ) -> tuple[list[tuple[str, dict[str, Any]]], dict[str, dict[str, Any]]]:
+        """
+        Returns (category, finding) pairs in `analyzers` order and a per-analyzer report
+        {name: {"status": ok|timeout|error, "seconds": ..., "findings": n}} for scan meta.
+        """
+        if self.mode == "inline":
+            return await self._run_inline(analyzers, ctx)
+
+        loop = asyncio.get_running_loop()
+        pool = await self._executor()
+        if self.mode == "process":
+            payload = pickle.dumps(
+                (ctx.chain_id, ctx.block_number, ctx.block_hash, ctx.tx_hashes, ctx.features),
+                protocol=pickle.HIGHEST_PROTOCOL,
+            )
+            futs = [
+                asyncio.wrap_future(pool.submit(_run_packed, a, payload)) for _, a in analyzers
+            ]
+        else:
+            futs = [loop.run_in_executor(pool, _run, a, ctx) for _, a in analyzers]
+
+        outcomes = await asyncio.gather(
+            *(self._await(f, a.name) for f, (_, a) in zip(futs, analyzers, strict=True))
+        )
+
+        findings: list[tuple[str, dict[str, Any]]] = []
+        report: dict[str, dict[str, Any]] = {}
+        hung = False
+        for (category, a), (found, entry) in zip(analyzers, outcomes, strict=True):
+            report[a.name] = entry
+            findings += [(category, x) for x in found]
+            hung = hung or entry["status"] == "timeout"
+        if hung and self.mode == "process":
+            self._recycle()
+        return findings, report
+
+    async def _run_inline(
+        self, analyzers: list[tuple[str, Analyzer]], ctx: AnalyzerContext
+    ) -> tuple[list[tuple[str, dict[str, Any]]], dict[str, dict[str, Any]]]:
+        findings: list[tuple[str, dict[str, Any]]] = []
+        report: dict[str, dict[str, Any]] = {}
+        for category, a in analyzers:
+            t0 = time.perf_counter()
+            try:
+                with TRACER.span(f"analyzer.{a.name}") as span:
+                    found = await a.analyze(ctx)
+                    span.set("findings", len(found))
+            except Exception as e:
+                log.exception("Analyzer failed analyzer=%s block=%s", a.name, ctx.block_number)
+                report[a.name] = _entry("error", time.perf_counter() - t0, error=str(e))
+                continue
+            report[a.name] = _entry("ok", time.perf_counter() - t0, findings=len(found))
+            findings += [(category, x) for x in found]
+        return findings, report
+
+    async def _await(
+        self, fut: asyncio.Future, name: str
+    ) -> tuple[list[dict[str, Any]], dict[str, Any]]:
+        t0 = time.perf_counter()
+        try:
+            # Wall time from submit, queueing included; cpu_seconds is the analyzer's own.
+            with TRACER.span(f"analyzer.{name}") as span:
+                # shield: a running task cannot be cancelled anyway, and cancelling its future
+                # races the pool's own bookkeeping when a recycled pool fails it later.
+                found, seconds = await asyncio.wait_for(asyncio.shield(fut), self.timeout)
+                span.set("cpu_seconds", seconds)
+                span.set("findings", len(found))
+        except TimeoutError:
+            fut.add_done_callback(_discard)
+            log.warning("Analyzer timed out analyzer=%s timeout=%ss", name, self.timeout)
+            return [], _entry("timeout", time.perf_counter() - t0)
+        except Exception as e:
+            log.warning("Analyzer failed analyzer=%s err=%s", name, e)
+            return [], _entry("error", time.perf_counter() - t0, error=str(e))
+        return found, _entry("ok", seconds, findings=len(found))
+
+    def _recycle(self) -> None:
+        pool, self._pool = self._pool, None
+        if pool is None:
+            return
+        # The hung task cannot be cancelled, so kill the workers. Other blocks' tasks still in
+        # this pool then fail with BrokenProcessPool and are recorded as analyzer errors.
+        procs = list(getattr(pool, "_processes", {}).values())
+        pool.shutdown(wait=False)
+        for p in procs:
+            p.terminate()
+        log.warning("Analyzer process pool replaced after a timeout")
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+
+def _discard(fut: asyncio.Future) -> None:
+    # Late result of a timed-out analyzer: retrieve it so asyncio does not log it as lost.
+    if not fut.cancelled():
+        fut.exception()
+
+
+def _entry(status: str, seconds: float, **extra: Any) -> dict[str, Any]:
+    return {"status": status, "seconds": round(seconds, 4), **extra}
@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+from array import array
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass
+from typing import Any
+
+from scanner.rpc.types import Receipt
+
+
+@dataclass
+class BlockFeatures:
+    """
+    Per-tx receipt features shared by all analyzers, extracted in a single pass.
+    Columns are parallel to the block's tx_hashes; a tx without a receipt has to=None,
+    status=None, gas_used=0, no topics and a log count of 0.
+
+    Addresses and topics are lowercased and interned, so equal values are the same object
+    and comparisons/hashing across analyzers are cheap. Numeric columns are `array`s.
+    """
+
+    to: list[str | None]
+    status: list[bool | None]
+    first_topics: list[tuple[str | None, ...]]  # topics[0] of each log, None if it has none
+    log_counts: Sequence[int]
+    gas_used: Sequence[int]
+
+    @classmethod
+    def from_receipts(
+        cls, tx_hashes: Sequence[str], receipts: dict[str, dict[str, Any] | None]
+    ) -> BlockFeatures:
+        builder = BlockFeaturesBuilder()
+        builder.add(map(receipts.get, tx_hashes))
+        return builder.build()
+
+
+class BlockFeaturesBuilder:
+    """
+    Builds BlockFeatures incrementally from receipts fed in tx order, so a caller can fetch
+    receipts in chunks and drop each chunk once it has been added. Accepts decoded
+    `Receipt`s or raw RPC dicts.
+    """
+
+    def __init__(self) -> None:
+        self._to: list[str | None] = []
+        self._status: list[bool | None] = []
+        self._topics: list[tuple[str | None, ...]] = []
+        self._counts = array("l")
+        self._gas = array("q")
+        # raw value -> interned lowercase; blocks repeat the same targets and topics a lot.
+        self.seen: dict[str, str] = {}
+
+    def __len__(self) -> int:
+        return len(self._to)
+
+    def add(self, receipts: Iterable[Receipt | dict[str, Any] | None]) -> None:
+        to_col, status_col, topics_col = self._to, self._status, self._topics
+        counts_col, gas_col, seen = self._counts, self._gas, self.seen
+        for r in receipts:
+            if not r:
+                to_col.append(None)
+                status_col.append(None)
+                topics_col.append(())
+                counts_col.append(0)
+                gas_col.append(0)
+                continue
+            if isinstance(r, dict):
+                r = Receipt.from_rpc(r, seen)
+            to_col.append(r.to)
+            status_col.append(r.status)
+            gas_col.append(r.gas_used)
+            topics_col.append(r.first_topics)
+            counts_col.append(len(r.first_topics))
+
+    def build(self) -> BlockFeatures:
+        return BlockFeatures(
+            to=self._to,
+            status=self._status,
+            first_topics=self._topics,
+            log_counts=self._counts,
+            gas_used=self._gas,
+        )
@@ -7,40 +7,38 @@ from scanner.analyzers.base import AnalyzerContext
 
 class HiddenDependenciesAnalyzer:
     name = "hidden_dependencies"
+    category = "dependency"
+    optional = True
 
     async def analyze(self, ctx: AnalyzerContext) -> list[dict]:
         # Build a weak dependency graph based on shared "to" and shared first-topic.
-        groups = defaultdict(list)
-
-        for h in ctx.tx_hashes:
-            r = ctx.receipts.get(h) or {}
-            to = (r.get("to") or "").lower()
-            logs = r.get("logs") or []
-            t0 = None
-            if logs and isinstance(logs, list):
-                topics = (logs[0].get("topics") or []) if isinstance(logs[0], dict) else []
-                if topics:
-                    t0 = topics[0].lower()
+        # Groups hold tx indices; hashes are decoded only for the groups reported.
+        groups: defaultdict[tuple[str, str], list[int]] = defaultdict(list)
 
+        f = ctx.features
+        for i, (to, firsts) in enumerate(zip(f.to, f.first_topics, strict=True)):
             if to:
-                groups[f"to:{to}"].append(h)
+                groups[("to", to)].append(i)
+            t0 = firsts[0] if firsts else None
             if t0:
-                groups[f"topic:{t0}"].append(h)
+                groups[("topic", t0)].append(i)
 
         # Find non-trivial groups
-        findings = []
-        for k, txs in groups.items():
-            if len(txs) >= 8:
-                findings.append({"key": k, "txs": txs[:50]})
-
-        if not findings:
+        found = [(key, idx) for key, idx in groups.items() if len(idx) >= 8]
+        if not found:
             return []
 
+        txs = ctx.tx_hashes
+        findings = [
+            {"key": f"{prefix}:{value}", "txs": [txs[i] for i in idx[:50]]}
+            for (prefix, value), idx in found[:10]
+        ]
+
         return [
             {
                 "kind": "coupling_groups",
-                "groups": findings[:10],
+                "groups": findings,
                 "reason": "Multiple txs share implicit resources; hidden coupling risk increases under load.",
-                "strength": min(1.0, 0.25 + 0.02 * len(findings)),
+                "strength": min(1.0, 0.25 + 0.02 * len(found)),
             }
         ]
@@ -3,33 +3,22 @@ from __future__ import annotations
 from collections import Counter
 
 from scanner.analyzers.base import AnalyzerContext
+from scanner.analyzers.columnar import ReceiptTable, np
 
 
 class HotStateAnalyzer:
     name = "hot_state"
+    category = "hot_state"
+    optional = True
 
     async def analyze(self, ctx: AnalyzerContext) -> list[dict]:
         # Approximate hot zones from log topics (if present) and target addresses.
         # This is intentionally heuristic: it produces "hot candidates" that can be enriched later.
-        c = Counter()
-
-        for h in ctx.tx_hashes:
-            r = ctx.receipts.get(h) or {}
-            to = (r.get("to") or "").lower()
-            if to:
-                c[f"to:{to}"] += 1
-
-            logs = r.get("logs") or []
-            for lg in logs[:50]:
-                topics = lg.get("topics") or []
-                if topics:
-                    c[f"topic:{topics[0].lower()}"] += 1
-
-        if not c:
-            return []
-
-        top = c.most_common(5)
-        if top[0][1] < 5:
+        if ctx.table is not None:
+            top = self._top_vectorized(ctx.table)
+        else:
+            top = self._top(ctx)
+        if not top or top[0][1] < 5:
             return []  # avoid noise on tiny blocks
 
         return [
@@ -40,3 +29,40 @@ class HotStateAnalyzer:
                 "strength": min(1.0, 0.15 + 0.05 * top[0][1]),
             }
         ]
+
+    @staticmethod
+    def _top(ctx: AnalyzerContext) -> list[tuple[str, int]]:
+        f = ctx.features
+        c: Counter[str] = Counter()
+        for to, firsts in zip(f.to, f.first_topics, strict=True):
+            if to:
+                c[f"to:{to}"] += 1
+            for t in firsts[:50]:
+                if t:
+                    c[f"topic:{t}"] += 1
+        return c.most_common(5)
+
+    @staticmethod
+    def _top_vectorized(t: ReceiptTable) -> list[tuple[str, int]]:
+        has_to = t.to_id >= 0
+        in_cap = (t.topic_id >= 0) & (t.topic_pos < 50)
+        to = t.to_id[has_to]
+        topic = t.topic_id[in_cap]
+        n = len(t.addresses)
+        counts = np.concatenate(
+            [np.bincount(to, minlength=n), np.bincount(topic, minlength=len(t.topics))]
+        )
+        # Same tie order as the dict path: first touch, tx by tx, target before topics.
+        touch = np.full(len(counts), np.iinfo(np.int64).max, dtype=np.int64)
+        np.minimum.at(touch, to, np.flatnonzero(has_to).astype(np.int64) * 51)
+        np.minimum.at(
+            touch,
+            n + topic,
+            t.topic_tx[in_cap].astype(np.int64) * 51 + t.topic_pos[in_cap] + 1,
+        )
+        order = np.lexsort((touch, -counts))[:5]
+        return [
+            (f"to:{t.addresses[i]}" if i < n else f"topic:{t.topics[i - n]}", int(counts[i]))
+            for i in order.tolist()
+            if counts[i] > 0
+        ]
@@ -3,12 +3,15 @@ from __future__ import annotations
 from typing import Any
 
 from scanner.analyzers.base import AnalyzerContext
+from scanner.analyzers.columnar import ReceiptTable, np
 
 # Heuristic module: designed to be upgraded as richer traces become available.
 
 
 class OrderingSensitivityAnalyzer:
     name = "ordering_sensitivity"
+    category = "ordering"
+    optional = False
 
     async def analyze(self, ctx: AnalyzerContext) -> list[dict[str, Any]]:
         # Minimal heuristic: repeated status flips across adjacent txs with shared "to" addresses.
@@ -17,26 +20,44 @@ class OrderingSensitivityAnalyzer:
         if not txs:
             return []
 
-        pairs: list[tuple[str, str]] = []
-        for i in range(len(txs) - 1):
-            a, b = txs[i], txs[i + 1]
-            ra = ctx.receipts.get(a) or {}
-            rb = ctx.receipts.get(b) or {}
-            ta = (ra.get("to") or "").lower()
-            tb = (rb.get("to") or "").lower()
-            sa = ra.get("status")
-            sb = rb.get("status")
-            if ta and tb and ta == tb and sa is not None and sb is not None and sa != sb:
-                pairs.append((a, b))
-
-        if not pairs:
+        if ctx.table is not None:
+            total, pairs = self._flips_vectorized(ctx.table, txs)
+        else:
+            total, pairs = self._flips(ctx, txs)
+
+        if not total:
             return []
 
         return [
             {
                 "kind": "ordering_cluster",
-                "pairs": pairs[:25],
+                "pairs": pairs,
                 "reason": "Adjacent txs to same target show divergent statuses (order-sensitive hint).",
-                "strength": min(1.0, 0.2 + 0.03 * len(pairs)),
+                "strength": min(1.0, 0.2 + 0.03 * total),
             }
         ]
+
+    @staticmethod
+    def _flips(ctx: AnalyzerContext, txs: list[str]) -> tuple[int, list[tuple[str, str]]]:
+        f = ctx.features
+        to, status = f.to, f.status
+        total = 0
+        pairs: list[tuple[str, str]] = []
+        for i in range(len(txs) - 1):
+            ta, tb = to[i], to[i + 1]
+            if ta is None or ta is not tb:  # interned: identity is equality
+                continue
+            sa, sb = status[i], status[i + 1]
+            if sa is not None and sb is not None and sa != sb:
+                total += 1
+                if len(pairs) < 25:
+                    pairs.append((txs[i], txs[i + 1]))
+        return total, pairs
+
+    @staticmethod
+    def _flips_vectorized(t: ReceiptTable, txs: list[str]) -> tuple[int, list[tuple[str, str]]]:
+        a, b = t.to_id[:-1], t.to_id[1:]
+        sa, sb = t.status[:-1], t.status[1:]
+        hit = (a >= 0) & (a == b) & (sa >= 0) & (sb >= 0) & (sa != sb)
+        idx = np.flatnonzero(hit)
+        return int(idx.size), [(txs[i], txs[i + 1]) for i in idx[:25].tolist()]
@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass, field
+from importlib.metadata import entry_points
+from typing import Any
+
+from scanner.analyzers.base import Analyzer, AnalyzerContext
+from scanner.analyzers.conflict_patterns import ConflictPatternsAnalyzer
+from scanner.analyzers.hidden_dependencies import HiddenDependenciesAnalyzer
+from scanner.analyzers.hot_state import HotStateAnalyzer
+from scanner.analyzers.ordering_sensitivity import OrderingSensitivityAnalyzer
+from scanner.metrics import DEFAULT_BUCKETS, REGISTRY
+
+log = logging.getLogger("scanner.analyzers.registry")
+
+ENTRY_POINT_GROUP = "scanner.analyzers"
+
+# Always available, even from a source checkout whose entry points were never installed.
+BUILTINS: dict[str, type] = {
+    "ordering_sensitivity": OrderingSensitivityAnalyzer,
+    "conflict_patterns": ConflictPatternsAnalyzer,
+    "hot_state": HotStateAnalyzer,
+    "hidden_dependencies": HiddenDependenciesAnalyzer,
+}
+
+ANALYZER_SECONDS = REGISTRY.counter(
+    "scanner_analyzer_seconds_total", "Wall time spent per analyzer."
+)
+ANALYZER_DURATION = REGISTRY.histogram(
+    "scanner_analyzer_duration_seconds",
+    "Per-block analyzer run time.",
+    buckets=(0.0001, 0.00025, 0.0005, *DEFAULT_BUCKETS),  # small blocks finish in microseconds
+)
+ANALYZER_RUNS = REGISTRY.counter("scanner_analyzer_runs_total", "Analyzer runs by outcome.")
+ANALYZER_FINDINGS = REGISTRY.counter(
+    "scanner_analyzer_findings_total", "Findings produced per analyzer."
+)
+ANALYZER_INPUT_TXS = REGISTRY.counter(
+    "scanner_analyzer_input_txs_total", "Transactions fed to each analyzer."
+)
+ANALYZER_SKIPPED = REGISTRY.counter(
+    "scanner_analyzer_skipped_total", "Optional analyzer runs skipped by the block budget."
+)
+
+
+def discover() -> dict[str, type]:
+    """Built-ins plus every class registered under the `scanner.analyzers` entry point group."""
+    found = dict(BUILTINS)
+    for ep in entry_points(group=ENTRY_POINT_GROUP):
+        try:
+            found[ep.name] = ep.load()
+        except Exception as e:
+            log.warning(
+                "Analyzer plugin failed to load name=%s value=%s err=%s", ep.name, ep.value, e
+            )
+    return found
+
+
+@dataclass
+class Plan:
+    run: list[tuple[str, Analyzer]]
+    skipped: list[str] = field(default_factory=list)
+
+
+class AnalyzerRegistry:
+    """
+    The set of enabled analyzers plus a running cost model for each.
+
+    Analyzers declare `name`, `category` (selects the signal explainer) and `optional`. When the
+    block being analyzed is at least `budget_lag_blocks` behind head and `budget_ms` is set,
+    optional analyzers are admitted cheapest-first while their predicted cost (EWMA seconds
+    per tx x block tx count) fits the budget; required analyzers always run.
+    """
+
+    def __init__(
+        self,
+        analyzers: list[Analyzer],
+        budget_ms: float | None = None,
+        budget_lag_blocks: int = 20,
+        alpha: float = 0.2,
+    ) -> None:
+        self.analyzers = analyzers
+        self.budget_ms = budget_ms
+        self.budget_lag_blocks = budget_lag_blocks
+        self.alpha = alpha
+        self._cost_per_tx: dict[str, float] = {}
+
+    @classmethod
+    def from_toggles(cls, enabled: dict[str, bool], **kwargs: Any) -> AnalyzerRegistry:
+        # Everything discovered runs unless switched off by name.
+        analyzers = [f() for name, f in discover().items() if enabled.get(name, True)]
+        log.info("Analyzers enabled %s", [a.name for a in analyzers])
+        return cls(analyzers, **kwargs)
+
+    def predicted_seconds(self, name: str, n_txs: int) -> float:
+        # Unmeasured analyzers predict 0 so they get measured.
+        return self._cost_per_tx.get(name, 0.0) * max(1, n_txs)
+
+    def plan(self, ctx: AnalyzerContext, lag: int) -> Plan:
+        entries = [(getattr(a, "category", a.name), a) for a in self.analyzers]
+        if self.budget_ms is None or lag < self.budget_lag_blocks:
+            return Plan(run=entries)
+
+        n = len(ctx.tx_hashes)
+        run = [(c, a) for c, a in entries if not getattr(a, "optional", False)]
+        left = self.budget_ms / 1000.0 - sum(self.predicted_seconds(a.name, n) for _, a in run)
+        optional = [(c, a) for c, a in entries if getattr(a, "optional", False)]
+        optional.sort(key=lambda e: self.predicted_seconds(e[1].name, n))
+        skipped = []
+        for c, a in optional:
+            cost = self.predicted_seconds(a.name, n)
+            if cost <= left:
+                run.append((c, a))
+                left -= cost
+            else:
+                skipped.append(a.name)
+                ANALYZER_SKIPPED.inc(analyzer=a.name)
+        # Keep registry order so findings (and signals) come out in a stable order.
+        order = {id(a): i for i, a in enumerate(self.analyzers)}
+        run.sort(key=lambda e: order[id(e[1])])
+        return Plan(run=run, skipped=skipped)
+
+    def record(self, report: dict[str, dict[str, Any]], n_txs: int) -> None:
+        """Feeds one block's executor report into the cost model and metrics."""
+        a = self.alpha
+        for name, r in report.items():
+            r["input_txs"] = n_txs
+            ANALYZER_RUNS.inc(analyzer=name, status=r["status"])
+            ANALYZER_SECONDS.inc(r["seconds"], analyzer=name)
+            ANALYZER_DURATION.observe(r["seconds"], analyzer=name)
+            ANALYZER_INPUT_TXS.inc(n_txs, analyzer=name)
+            if r["status"] != "ok":
+                continue
+            ANALYZER_FINDINGS.inc(r.get("findings", 0), analyzer=name)
+            per_tx = r["seconds"] / max(1, n_txs)
+            prev = self._cost_per_tx.get(name)
+            self._cost_per_tx[name] = per_tx if prev is None else (1 - a) * prev + a * per_tx
+
+    def costs(self) -> dict[str, float]:
+        return dict(self._cost_per_tx)
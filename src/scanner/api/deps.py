@@ -1,11 +1,9 @@
 from __future__ import annotations
 
-from scanner.db.session import SessionLocal
+from scanner.db import session as db_session
 
 
-def get_db():
-    db = SessionLocal()
-    try:
+async def get_db():
+    # Resolve at call time so set_db_url() at startup takes effect.
+    async with db_session.AsyncSessionLocal() as db:
         yield db
-    finally:
-        db.close()
@@ -2,10 +2,12 @@ from __future__ import annotations
 
 from fastapi import APIRouter
 
-from scanner.api.routes import blocks, health, scans, signals
+from scanner.api.routes import admin, blocks, health, metrics, scans, signals
 
 router = APIRouter(prefix="/v1")
-router.include_router(health.router)
-router.include_router(blocks.router)
-router.include_router(scans.router)
-router.include_router(signals.router)
+router.include_router(health)
+router.include_router(blocks)
+router.include_router(scans)
+router.include_router(signals)
+router.include_router(metrics)
+router.include_router(admin)
@@ -1,6 +1,8 @@
+from .admin import router as admin
 from .health import router as health
 from .scans import router as scans
 from .signals import router as signals
 from .blocks import router as blocks
+from .metrics import router as metrics
 
-__all__ = ["health", "scans", "signals", "blocks"]
+__all__ = ["admin", "health", "scans", "signals", "blocks", "metrics"]
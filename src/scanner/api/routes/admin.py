@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import asyncio
+import hmac
+import threading
+import time
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request
+from fastapi.responses import PlainTextResponse
+
+from scanner.profiling import SamplingProfiler, blocks_done
+
+router = APIRouter(prefix="/admin", tags=["admin"])
+
+_profiling = asyncio.Lock()
+
+
+def require_admin(request: Request, x_admin_token: str | None = Header(default=None)) -> None:
+    # Admin routes do not exist unless app.admin_token is configured.
+    token = getattr(request.app.state, "admin_token", None)
+    if not token:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if not x_admin_token or not hmac.compare_digest(x_admin_token, token):
+        raise HTTPException(status_code=403, detail="invalid admin token")
+
+
+@router.post("/profile", response_class=PlainTextResponse, dependencies=[Depends(require_admin)])
+async def profile(
+    seconds: float | None = Query(default=None, gt=0, le=600),
+    blocks: int | None = Query(default=None, gt=0),
+    max_seconds: float = Query(default=300, gt=0, le=3600),
+    interval_ms: float = Query(default=5.0, ge=1, le=1000),
+    all_threads: bool = Query(default=False),
+    include_idle: bool = Query(default=False),
+):
+    """
+    Samples the scanner for `seconds`, or until `blocks` more blocks are persisted (at most
+    `max_seconds`), and returns collapsed stacks for flamegraph.pl / speedscope. By default
+    only the event loop thread is sampled; `all_threads` adds analyzer and pool threads.
+    """
+    if (seconds is None) == (blocks is None):
+        raise HTTPException(status_code=400, detail="give exactly one of seconds or blocks")
+    if _profiling.locked():
+        raise HTTPException(status_code=409, detail="a profile is already running")
+
+    async with _profiling:
+        # Async route: this runs on the event loop thread, the one doing the scanning.
+        threads = None if all_threads else {threading.get_ident()}
+        prof = SamplingProfiler(interval_ms / 1000.0, threads, include_idle=include_idle)
+        first = blocks_done()
+        prof.start()
+        try:
+            if seconds is not None:
+                await asyncio.sleep(seconds)
+            else:
+                deadline = time.monotonic() + max_seconds
+                while blocks_done() - first < blocks and time.monotonic() < deadline:
+                    await asyncio.sleep(0.05)
+        finally:
+            prof.stop()
+            done = blocks_done() - first
+
+    headers = {
+        "X-Profile-Samples": str(prof.samples),
+        "X-Profile-Seconds": f"{prof.elapsed:.3f}",
+        "X-Profile-Blocks": str(done),
+    }
+    return PlainTextResponse(prof.collapsed(), headers=headers)
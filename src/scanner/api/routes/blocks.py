@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from fastapi import APIRouter, Depends
 from sqlalchemy import desc, select
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from scanner.api.deps import get_db
 from scanner.db.models import Block
@@ -11,8 +11,8 @@ router = APIRouter(tags=["blocks"])
 
 
 @router.get("/blocks/latest")
-def latest_block(db: Session = Depends(get_db)):
-    b = db.execute(select(Block).order_by(desc(Block.number)).limit(1)).scalar_one_or_none()
+async def latest_block(db: AsyncSession = Depends(get_db)):
+    b = await db.scalar(select(Block).order_by(desc(Block.number)).limit(1))
     if not b:
         return {"latest": None}
     return {
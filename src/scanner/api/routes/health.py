@@ -6,5 +6,5 @@ router = APIRouter(tags=["health"])
 
 
 @router.get("/health")
-def health():
+async def health():
     return {"ok": True}
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from fastapi import APIRouter, Depends, Query
 from sqlalchemy import desc, select
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from scanner.api.deps import get_db
 from scanner.db.models import Scan
@@ -11,11 +11,11 @@ router = APIRouter(tags=["scans"])
 
 
 @router.get("/scans")
-def list_scans(
+async def list_scans(
     limit: int = Query(default=50, ge=1, le=500),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
-    rows = db.execute(select(Scan).order_by(desc(Scan.block_number)).limit(limit)).scalars().all()
+    rows = (await db.scalars(select(Scan).order_by(desc(Scan.block_number)).limit(limit))).all()
     return {
         "items": [
             {
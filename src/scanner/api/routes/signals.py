@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from fastapi import APIRouter, Depends, Query
 from sqlalchemy import and_, desc, select
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from scanner.api.deps import get_db
 from scanner.db.models import Signal
@@ -11,21 +11,21 @@ router = APIRouter(tags=["signals"])
 
 
 @router.get("/signals")
-def list_signals(
+async def list_signals(
     limit: int = Query(default=50, ge=1, le=500),
     severity_gte: int = Query(default=0, ge=0, le=100),
     category: str | None = Query(default=None),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     conds = [Signal.severity >= severity_gte]
     if category:
         conds.append(Signal.category == category)
 
     rows = (
-        db.execute(select(Signal).where(and_(*conds)).order_by(desc(Signal.block_number)).limit(limit))
-        .scalars()
-        .all()
-    )
+        await db.scalars(
+            select(Signal).where(and_(*conds)).order_by(desc(Signal.block_number)).limit(limit)
+        )
+    ).all()
 
     return {
         "items": [
@@ -10,6 +10,23 @@ from scanner.settings import Settings
 def main() -> None:
     p = argparse.ArgumentParser(prog="monad-scanner", description="Chain Digital — Monad risk scanner")
     p.add_argument("--print-config", action="store_true", help="Print parsed YAML config and exit")
+    sub = p.add_subparsers(dest="command")
+
+    bf = sub.add_parser("backfill", help="Scan a historical block range with parallel workers")
+    bf.add_argument("--from", dest="start", type=int, required=True, help="First block (inclusive)")
+    bf.add_argument("--to", dest="end", type=int, required=True, help="Last block (inclusive)")
+    bf.add_argument("--workers", type=int, default=4, help="Worker processes (one shard each)")
+
+    rec = sub.add_parser("record", help="Record the RPC traffic for a block range to a file")
+    rec.add_argument("--from", dest="start", type=int, required=True, help="First block")
+    rec.add_argument("--to", dest="end", type=int, required=True, help="Last block (inclusive)")
+    rec.add_argument("--out", required=True, help="Recording file (appended to if it exists)")
+
+    rp = sub.add_parser("replay", help="Run recorded blocks offline and report stage throughput")
+    rp.add_argument("path", help="Recording file written by `record`")
+    rp.add_argument("--from", dest="start", type=int, default=None, help="First block to replay")
+    rp.add_argument("--to", dest="end", type=int, default=None, help="Last block to replay")
+    rp.add_argument("--no-store", action="store_true", help="Skip the database stage")
     args = p.parse_args()
 
     s = Settings()
@@ -19,6 +36,29 @@ def main() -> None:
         print(cfg.model_dump())
         sys.exit(0)
 
+    if args.command == "backfill":
+        from scanner.logging import setup_logging
+        from scanner.pipeline.backfill import backfill
+
+        setup_logging(logging_yaml_path="configs/logging.yaml", default_level=cfg.app.log_level)
+        backfill(s.config_path, args.start, args.end, args.workers)
+        sys.exit(0)
+
+    if args.command in ("record", "replay"):
+        import asyncio
+
+        from scanner.logging import setup_logging
+        from scanner.pipeline.replay import record_range, replay_range
+
+        setup_logging(logging_yaml_path="configs/logging.yaml", default_level=cfg.app.log_level)
+        if args.command == "record":
+            asyncio.run(record_range(cfg, args.start, args.end, args.out))
+        else:
+            asyncio.run(
+                replay_range(cfg, args.path, args.start, args.end, persist=not args.no_store)
+            )
+        sys.exit(0)
+
     # Lightweight CLI entry point; main runtime starts in scanner.main.
     os.execvp("python", ["python", "-m", "scanner.main"])
 
@@ -6,11 +6,14 @@ from sqlalchemy.orm import Mapped, mapped_column
 
 from .base import Base
 
+# SQLite only autoincrements INTEGER PRIMARY KEY columns (local runs, load tests).
+PK = BigInteger().with_variant(Integer, "sqlite")
+
 
 class Block(Base):
     __tablename__ = "blocks"
 
-    id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
+    id: Mapped[int] = mapped_column(PK, primary_key=True, autoincrement=True)
     chain_id: Mapped[str] = mapped_column(String(64), nullable=False, index=True)
     number: Mapped[int] = mapped_column(BigInteger, nullable=False, index=True)
     hash: Mapped[str] = mapped_column(String(128), nullable=False, unique=True, index=True)
@@ -26,7 +29,7 @@ class Block(Base):
 class Scan(Base):
     __tablename__ = "scans"
 
-    id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
+    id: Mapped[int] = mapped_column(PK, primary_key=True, autoincrement=True)
     chain_id: Mapped[str] = mapped_column(String(64), nullable=False, index=True)
     block_number: Mapped[int] = mapped_column(BigInteger, nullable=False, index=True)
     block_hash: Mapped[str] = mapped_column(String(128), nullable=False, index=True)
@@ -41,7 +44,7 @@ class Scan(Base):
 class Signal(Base):
     __tablename__ = "signals"
 
-    id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
+    id: Mapped[int] = mapped_column(PK, primary_key=True, autoincrement=True)
     signal_id: Mapped[str] = mapped_column(String(128), nullable=False, unique=True, index=True)
     chain_id: Mapped[str] = mapped_column(String(64), nullable=False, index=True)
     block_number: Mapped[int] = mapped_column(BigInteger, nullable=False, index=True)
@@ -55,3 +58,18 @@ class Signal(Base):
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
 
     __table_args__ = (Index("ix_signals_chain_block", "chain_id", "block_number", unique=False),)
+
+
+class ScanCursor(Base):
+    __tablename__ = "scan_cursors"
+
+    id: Mapped[int] = mapped_column(PK, primary_key=True, autoincrement=True)
+    chain_id: Mapped[str] = mapped_column(String(64), nullable=False, index=True)
+    name: Mapped[str] = mapped_column(String(128), nullable=False)  # live / backfill:<range>
+    position: Mapped[int] = mapped_column(BigInteger, nullable=False)  # next block to scan
+    range_start: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
+    range_end: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
+    status: Mapped[str] = mapped_column(String(32), nullable=False)  # active/done
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+
+    __table_args__ = (Index("ix_scan_cursors_chain_name", "chain_id", "name", unique=True),)
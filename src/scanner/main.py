@@ -8,55 +8,125 @@ import uvicorn
 from fastapi import FastAPI
 
 from scanner.api import router as api_router
-from scanner.db.session import set_db_url
+from scanner.db.session import configure_db, dispose_async_engine
 from scanner.logging import setup_logging
-from scanner.pipeline import PipelineRunner, Scheduler, Store
-from scanner.rpc import JsonRpcClient, MonadClient
+from scanner.metrics import REGISTRY
+from scanner.pipeline import PipelineRunner, Scheduler, StagedPipeline, Store
+from scanner.pipeline.backfill import LIVE_CURSOR
+from scanner.pipeline.gaps import GapFiller
+from scanner.rpc.factory import build_client
+from scanner.rpc.ws import NewHeadsSubscriber
 from scanner.settings import Settings
+from scanner.tracing import TRACER, configure_tracing
 
 log = logging.getLogger("scanner.main")
 
+HEAD_LAG = REGISTRY.gauge(
+    "scanner_head_lag_blocks", "Blocks at or below the safe head not yet handed to the live lane."
+)
 
-def build_app() -> FastAPI:
+
+def build_app(admin_token: str | None = None) -> FastAPI:
     app = FastAPI(title="Chain Digital — Monad Risk Scanner", version="0.1.0")
+    app.state.admin_token = admin_token
     app.include_router(api_router)
     return app
 
 
 async def run_scanner(cfg) -> None:
     chain_id = cfg.chain.id
-    rpc = JsonRpcClient(cfg.rpc.url, timeout=cfg.rpc.timeout_seconds, max_retries=cfg.rpc.max_retries)
-    client = MonadClient(rpc)
+    configure_tracing(cfg.tracing, chain_id)
+    client = build_client(cfg)
     store = Store(chain_id=chain_id)
+    caps = await client.probe_capabilities()
+    log.info("RPC capabilities %s", caps)
 
-    runner = PipelineRunner(
-        chain_id=chain_id,
-        client=client,
-        store=store,
-        cfg={
-            "ordering_sensitivity": cfg.analysis.ordering_sensitivity,
-            "conflict_patterns": cfg.analysis.conflict_patterns,
-            "hot_state": cfg.analysis.hot_state,
-            "hidden_dependencies": cfg.analysis.hidden_dependencies,
-            "min_severity_to_store": cfg.signals.min_severity_to_store,
-        },
-    )
+    runner = PipelineRunner.from_config(cfg, client=client, store=store)
 
     confirmations = int(cfg.chain.confirmations or 0)
     max_blocks = int(cfg.scanner.max_blocks_per_tick)
     start_override = cfg.scanner.backfill_start_block
 
-    state = {"next": None}
-
-    async def tick(n: int) -> None:
-        head = await client.get_latest_block_number()
+    # "next": next block to hand to the live lane; "saved": durable cursor position, i.e.
+    # every block below it has been committed (or recorded as failed for the gap lane).
+    state: dict[str, int | None] = {"next": None, "saved": None, "safe_head": None}
+    live = await store.get_cursor(LIVE_CURSOR)
+    if live is not None:
+        state["next"] = state["saved"] = live.position
+        log.info("Resuming live cursor block=%s range_start=%s", live.position, live.range_start)
+
+    pipeline: StagedPipeline | None = None
+    if cfg.scanner.pipelined:
+        pipeline = StagedPipeline(
+            runner,
+            fetch_concurrency=cfg.scanner.fetch_concurrency,
+            analyze_concurrency=cfg.scanner.analyze_concurrency,
+            max_inflight=cfg.scanner.max_inflight_blocks,
+            max_attempts=cfg.scanner.block_max_attempts,
+        )
+        pipeline.start()
+
+    def committed_position() -> int | None:
+        if pipeline is None:
+            return state["next"]
+        if pipeline.committed is None:
+            return state["saved"]
+        return pipeline.committed + 1
+
+    def update_lag() -> None:
+        if state["safe_head"] is not None and state["next"] is not None:
+            HEAD_LAG.set(max(0, state["safe_head"] + 1 - state["next"]), chain=chain_id)
+
+    async def save_position() -> None:
+        update_lag()
+        pos = committed_position()
+        if pos is not None and pos != state["saved"]:
+            await store.save_cursor(LIVE_CURSOR, pos)
+            state["saved"] = pos
+
+    tasks: dict[str, asyncio.Task] = {}
+
+    def start_gap_lane(range_start: int) -> None:
+        if not cfg.scanner.gap_fill or "gaps" in tasks:
+            return
+        gaps = GapFiller(
+            runner,
+            store,
+            start=range_start,
+            busy=live_busy,
+            rescan_interval=cfg.scanner.gap_rescan_interval_seconds,
+        )
+        tasks["gaps"] = asyncio.create_task(gaps.run(lambda: state["saved"]))
+
+    async def tick(n: int, head: int | None = None) -> None:
+        # Push mode hands us the head from newHeads; polling asks the node.
+        if head is None:
+            head = await client.get_latest_block_number()
+        else:
+            # Polling records it in get_latest_block_number; the RPC cache's finality check
+            # and the analysis lag budget both read it.
+            client.head = head
         safe_head = max(0, head - confirmations)
+        state["safe_head"] = safe_head
 
         if state["next"] is None:
-            state["next"] = int(start_override) if start_override is not None else safe_head
-        # Catch up forward if we started behind
-        if state["next"] < 0:
-            state["next"] = 0
+            first = max(0, int(start_override) if start_override is not None else safe_head)
+            state["next"] = state["saved"] = first
+            # Publish where the live tail starts so backfill workers stay below it.
+            await store.save_cursor(LIVE_CURSOR, first, range_start=first)
+            start_gap_lane(first)
+        update_lag()
+
+        if pipeline is not None:
+            # Submit everything up to head; submit() blocks once the in-flight window is full,
+            # so catching up after downtime runs at pipeline speed, not max_blocks per tick.
+            while state["next"] <= safe_head:
+                await pipeline.submit(state["next"])
+                state["next"] += 1
+                if state["next"] % 50 == 0:
+                    await save_position()
+            await save_position()
+            return
 
         processed = 0
         while processed < min(n, max_blocks) and state["next"] <= safe_head:
@@ -64,12 +134,48 @@ async def run_scanner(cfg) -> None:
             await runner.process_block(bn)
             state["next"] = bn + 1
             processed += 1
+        await save_position()
+
+    def live_busy() -> bool:
+        # Gap filling yields while the live tail is catching up.
+        if pipeline is not None:
+            return pipeline.queue_depths()["inflight"] > pipeline.fetch_concurrency
+        return state["safe_head"] is not None and state["next"] <= state["safe_head"]
 
     sched = Scheduler(
         poll_interval_seconds=cfg.scanner.poll_interval_seconds,
         max_blocks_per_tick=cfg.scanner.max_blocks_per_tick,
     )
-    await sched.loop(tick)
+    heads: asyncio.Queue[int] | None = None
+    sub_task: asyncio.Task | None = None
+    if cfg.rpc.ws_url:
+        heads = asyncio.Queue()
+        sub = NewHeadsSubscriber(cfg.rpc.ws_url)
+        sub_task = asyncio.create_task(sub.run(heads.put_nowait))
+        sub_task.add_done_callback(_log_subscriber_exit)
+
+    if live is not None and live.range_start is not None:
+        start_gap_lane(live.range_start)
+
+    try:
+        await sched.loop(tick, heads=heads)
+    finally:
+        for t in (sub_task, tasks.get("gaps")):
+            if t is not None:
+                t.cancel()
+        if pipeline is not None:
+            await pipeline.stop()
+        await save_position()
+        runner.close()
+        await client.aclose()
+        TRACER.shutdown()
+
+
+def _log_subscriber_exit(task: asyncio.Task) -> None:
+    if task.cancelled():
+        return
+    # The scheduler keeps ticking on its poll interval, so this degrades to polling.
+    log.warning("newHeads subscription ended, falling back to polling err=%s", task.exception())
 
 
 async def main_async() -> None:
@@ -78,8 +184,8 @@ async def main_async() -> None:
 
     setup_logging(logging_yaml_path="configs/logging.yaml", default_level=cfg.app.log_level)
 
-    set_db_url(cfg.db.url)
-    app = build_app()
+    configure_db(cfg.db)
+    app = build_app(admin_token=cfg.app.admin_token)
 
     # Run both: API server + scanner loop in the same process (simple deploy).
     # For scale: split into separate services (api + worker) using the same codebase.
@@ -92,7 +198,10 @@ async def main_async() -> None:
     async def scanner_task():
         await run_scanner(cfg)
 
-    await asyncio.gather(api_task(), scanner_task())
+    try:
+        await asyncio.gather(api_task(), scanner_task())
+    finally:
+        await dispose_async_engine()
 
 
 def main() -> None:
@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+import threading
+from bisect import bisect_left
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from time import perf_counter
+
+# Minimal in-process metrics registry. Values are keyed by a sorted label tuple so
+# recording is a dict update; exporters read snapshots via Registry.collect().
+
+# Seconds; spans a cached RPC hit up to a slow store commit or heavy block.
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+LabelKey = tuple[tuple[str, str], ...]
+
+
+def _key(labels: dict[str, str]) -> LabelKey:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+class Gauge:
+    kind = "gauge"
+
+    def __init__(self, name: str, help: str) -> None:
+        self.name = name
+        self.help = help
+        self._values: dict[LabelKey, float] = {}
+
+    def set(self, value: float, **labels: str) -> None:
+        self._values[_key(labels)] = float(value)
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        k = _key(labels)
+        self._values[k] = self._values.get(k, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels: str) -> None:
+        self.inc(-amount, **labels)
+
+    def get(self, **labels: str) -> float | None:
+        return self._values.get(_key(labels))
+
+    def samples(self) -> list[tuple[LabelKey, float]]:
+        return list(self._values.items())
+
+
+class Counter(Gauge):
+    kind = "counter"
+
+
+class Histogram:
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, buckets: tuple[float, ...] = DEFAULT_BUCKETS) -> None:
+        self.name = name
+        self.help = help
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: a count per bucket (values <= bound), +Inf last, then the sum.
+        self._values: dict[LabelKey, list[float]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        k = _key(labels)
+        row = self._values.get(k)
+        if row is None:
+            row = self._values[k] = [0] * (len(self.buckets) + 2)
+        row[bisect_left(self.buckets, value)] += 1
+        row[-1] += value
+
+    @contextmanager
+    def time(self, **labels: str) -> Iterator[None]:
+        t0 = perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(perf_counter() - t0, **labels)
+
+    def samples(self) -> list[tuple[LabelKey, list[float]]]:
+        return [(k, list(row)) for k, row in list(self._values.items())]
+
+
+class Registry:
+    def __init__(self) -> None:
+        self._metrics: dict[str, Gauge | Histogram] = {}
+        self._collectors: list[Callable[[], None]] = []
+        self._lock = threading.Lock()
+
+    def gauge(self, name: str, help: str = "") -> Gauge:
+        return self._get_or_create(Gauge, name, help)
+
+    def counter(self, name: str, help: str = "") -> Counter:
+        return self._get_or_create(Counter, name, help)
+
+    def histogram(
+        self, name: str, help: str = "", buckets: tuple[float, ...] = DEFAULT_BUCKETS
+    ) -> Histogram:
+        return self._get_or_create(Histogram, name, help, buckets)
+
+    def _get_or_create(self, cls, name: str, help: str, *args):
+        with self._lock:
+            m = self._metrics.get(name)
+            if m is None:
+                m = self._metrics[name] = cls(name, help, *args)
+            return m
+
+    def add_collector(self, fn: Callable[[], None]) -> None:
+        """`fn` runs on every collect(), for gauges that are cheaper to read than to track."""
+        self._collectors.append(fn)
+
+    def remove_collector(self, fn: Callable[[], None]) -> None:
+        if fn in self._collectors:
+            self._collectors.remove(fn)
+
+    def collect(self) -> list[Gauge | Histogram]:
+        for fn in list(self._collectors):
+            fn()
+        return list(self._metrics.values())
+
+
+REGISTRY = Registry()
+
+
+def _labels(key: LabelKey, extra: tuple[str, str] | None = None) -> str:
+    pairs = [*key, extra] if extra is not None else key
+    if not pairs:
+        return ""
+    esc = (v.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, v in pairs)
+    return "{" + ",".join(f'{k}="{v}"' for (k, _), v in zip(pairs, esc, strict=True)) + "}"
+
+
+def _num(v: float) -> str:
+    v = float(v)
+    if v.is_integer():
+        return str(int(v))
+    if v != v:
+        return "NaN"
+    if v in (float("inf"), float("-inf")):
+        return "+Inf" if v > 0 else "-Inf"
+    return repr(v)
+
+
+def render(registry: Registry = REGISTRY) -> str:
+    """Prometheus text exposition format (version 0.0.4)."""
+    out: list[str] = []
+    for m in sorted(registry.collect(), key=lambda m: m.name):
+        if m.help:
+            out.append(f"# HELP {m.name} {m.help}")
+        out.append(f"# TYPE {m.name} {m.kind}")
+        if isinstance(m, Histogram):
+            bounds = [*(_num(b) for b in m.buckets), "+Inf"]
+            for key, row in m.samples():
+                cum = 0
+                for le, n in zip(bounds, row[:-1], strict=True):
+                    cum += n
+                    out.append(f"{m.name}_bucket{_labels(key, ('le', le))} {cum}")
+                out.append(f"{m.name}_sum{_labels(key)} {_num(row[-1])}")
+                out.append(f"{m.name}_count{_labels(key)} {cum}")
+        else:
+            for key, value in m.samples():
+                out.append(f"{m.name}{_labels(key)} {_num(value)}")
+    return "\n".join(out) + "\n"
@@ -1,5 +1,6 @@
 from .scheduler import Scheduler
 from .runner import PipelineRunner
 from .store import Store
+from .staged import StagedPipeline
 
-__all__ = ["Scheduler", "PipelineRunner", "Store"]
+__all__ = ["Scheduler", "PipelineRunner", "Store", "StagedPipeline"]
@@ -0,0 +1,214 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import multiprocessing as mp
+import time
+from collections.abc import Awaitable
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+
+from scanner.db.session import configure_db, dispose_async_engine
+from scanner.pipeline.runner import PipelineRunner
+from scanner.pipeline.staged import StagedPipeline
+from scanner.pipeline.store import Store
+from scanner.rpc.factory import build_client
+from scanner.settings import FileConfig, Settings
+from scanner.tracing import TRACER, configure_tracing
+
+log = logging.getLogger("scanner.pipeline.backfill")
+
+LIVE_CURSOR = "live"
+
+
+@dataclass(frozen=True)
+class Shard:
+    start: int
+    end: int  # inclusive
+
+    @property
+    def name(self) -> str:
+        return f"backfill:{self.start}-{self.end}"
+
+    @property
+    def size(self) -> int:
+        return self.end - self.start + 1
+
+
+def plan_shards(start: int, end: int, workers: int) -> list[Shard]:
+    # Contiguous ranges keep each shard's commits in block order.
+    total = end - start + 1
+    if total <= 0:
+        return []
+    n = max(1, min(workers, total))
+    step, extra = divmod(total, n)
+    shards, lo = [], start
+    for i in range(n):
+        hi = lo + step + (1 if i < extra else 0) - 1
+        shards.append(Shard(lo, hi))
+        lo = hi + 1
+    return shards
+
+
+async def clip_to_live(store: Store, end: int) -> int:
+    """Never backfill into the live tail's range: it owns everything from its start block."""
+    live = await store.get_cursor(LIVE_CURSOR)
+    if live is not None and live.range_start is not None and live.range_start <= end:
+        return live.range_start - 1
+    return end
+
+
+def run_shard(config_path: str, shard: Shard, checkpoint_every: int = 50) -> int:
+    """Worker process entry point: own RPC client, own DB engine, own event loop."""
+    cfg = Settings(SCANNER_CONFIG=config_path).load()
+    configure_db(cfg.db)
+    return asyncio.run(_disposing(_run_shard(cfg, shard, checkpoint_every)))
+
+
+async def _disposing(coro: Awaitable[int]) -> int:
+    # Pooled async connections belong to this event loop; close them before it ends.
+    try:
+        return await coro
+    finally:
+        await dispose_async_engine()
+
+
+async def _run_shard(cfg: FileConfig, shard: Shard, checkpoint_every: int) -> int:
+    store = Store(chain_id=cfg.chain.id)
+    cp = await store.get_cursor(shard.name)
+    # The checkpoint only moves past successful scans, so everything below it is done. Work is
+    # read as ranges from there on (one row per gap, not per block): blocks never reached and
+    # blocks that failed on an earlier run, which the gap lane does not cover behind the live
+    # range. Successful scans by the live tail or another sharding of the range are skipped.
+    resume = max(shard.start, cp.position) if cp is not None else shard.start
+    end = await clip_to_live(store, shard.end)
+    gaps = await store.find_gaps(resume, end)
+    todo = sum(hi - lo + 1 for lo, hi in gaps)
+    log.info("backfill shard=%s resume=%s todo=%s", shard.name, resume, todo)
+    if not todo:
+        if cp is None or cp.status != "done":
+            await store.save_cursor(shard.name, shard.end + 1, shard.start, shard.end, "done")
+        return 0
+
+    # Each worker process has its own tracer; spans from all shards share the exporters' sinks.
+    configure_tracing(cfg.tracing, cfg.chain.id)
+    client = build_client(cfg)
+    runner = PipelineRunner.from_config(cfg, client=client, store=store)
+    pipeline = StagedPipeline(
+        runner,
+        fetch_concurrency=cfg.scanner.fetch_concurrency,
+        analyze_concurrency=cfg.scanner.analyze_concurrency,
+        max_inflight=cfg.scanner.max_inflight_blocks,
+        max_attempts=cfg.scanner.block_max_attempts,
+    )
+    saved, checked, pinned, scanned = resume, resume, False, 0
+
+    async def checkpoint(upto: int) -> None:
+        nonlocal saved, pinned, end
+        # Only [saved, upto] is new since the last checkpoint. A failed block pins the
+        # checkpoint for the rest of the run so a rerun starts at it.
+        if not pinned:
+            failed = await store.find_gaps(saved, upto)
+            pinned = bool(failed)
+            position = failed[0][0] if failed else upto + 1
+            if position != saved:
+                saved = position
+                await store.save_cursor(shard.name, saved, shard.start, shard.end)
+        # The live tail may have started since: stay below it.
+        end = await clip_to_live(store, end)
+
+    # Backfill blocks sit below the head; knowing it lets the RPC cache treat them as final, so
+    # rescanning a range is served from the cache instead of the node.
+    await client.get_latest_block_number()
+    await client.probe_capabilities()
+    pipeline.start()
+    try:
+        for lo, hi in gaps:
+            for bn in range(lo, hi + 1):
+                if bn > end:
+                    break
+                await pipeline.submit(bn)
+                scanned += 1
+                committed = pipeline.committed
+                if committed is not None and committed + 1 - checked >= checkpoint_every:
+                    checked = committed + 1
+                    await checkpoint(committed)
+        await pipeline.drain()
+    finally:
+        await pipeline.stop()
+        runner.close()
+        await client.aclose()
+        TRACER.shutdown()
+
+    # Failed scans still advance the pipeline; the shard is done only once none are left.
+    left = await store.find_gaps(saved, end)
+    if left:
+        missing = sum(hi - lo + 1 for lo, hi in left)
+        log.warning("backfill shard=%s failed_blocks=%s; rerun to retry them", shard.name, missing)
+        await store.save_cursor(shard.name, left[0][0], shard.start, shard.end, "active")
+    else:
+        await store.save_cursor(shard.name, shard.end + 1, shard.start, shard.end, "done")
+    return scanned
+
+
+def backfill(
+    config_path: str, start: int, end: int, workers: int, poll_seconds: float = 5.0
+) -> int:
+    """Shards [start, end] across `workers` processes and prints throughput/ETA while running."""
+    cfg = Settings(SCANNER_CONFIG=config_path).load()
+    configure_db(cfg.db)
+    store = Store(chain_id=cfg.chain.id)
+    return asyncio.run(_disposing(_backfill(store, config_path, start, end, workers, poll_seconds)))
+
+
+async def _backfill(
+    store: Store, config_path: str, start: int, end: int, workers: int, poll_seconds: float
+) -> int:
+    clipped = await clip_to_live(store, end)
+    if clipped < end:
+        print(f"Clipping backfill end {end} -> {clipped}: live tail owns blocks from {clipped + 1}")
+        end = clipped
+    shards = plan_shards(start, end, workers)
+    if not shards:
+        print("Nothing to backfill.")
+        return 0
+
+    total = sum(s.size for s in shards)
+    t0 = time.monotonic()
+    baseline = await _progress(store, shards)
+    # spawn: workers must not inherit the parent's DB connections or event loop.
+    ctx = mp.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=len(shards), mp_context=ctx) as ex:
+        futs = [ex.submit(run_shard, config_path, s) for s in shards]
+        while not all(f.done() for f in futs):
+            await asyncio.sleep(poll_seconds)
+            await _report(store, shards, total, baseline, t0)
+        scanned = sum(f.result() for f in futs)
+
+    elapsed = max(1e-9, time.monotonic() - t0)
+    print(
+        f"Backfill done blocks={start}..{end} shards={len(shards)} scanned={scanned} "
+        f"elapsed={elapsed:.1f}s rate={scanned / elapsed:.1f} blocks/s"
+    )
+    return scanned
+
+
+async def _progress(store: Store, shards: list[Shard]) -> int:
+    done = 0
+    for s in shards:
+        cp = await store.get_cursor(s.name)
+        if cp is not None:
+            done += min(s.size, max(0, cp.position - s.start))
+    return done
+
+
+async def _report(store: Store, shards: list[Shard], total: int, baseline: int, t0: float) -> None:
+    done = await _progress(store, shards)
+    elapsed = max(1e-9, time.monotonic() - t0)
+    rate = (done - baseline) / elapsed
+    eta = (total - done) / rate if rate > 0 else float("inf")
+    print(
+        f"backfill {done}/{total} ({100.0 * done / total:.1f}%) "
+        f"rate={rate:.1f} blocks/s eta={eta:.0f}s",
+        flush=True,
+    )
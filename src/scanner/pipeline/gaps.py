@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections.abc import Callable
+
+from scanner.pipeline.runner import PipelineRunner
+from scanner.pipeline.store import Store
+
+log = logging.getLogger("scanner.pipeline.gaps")
+
+
+class GapFiller:
+    """
+    Low-priority lane beside the live tail. Rescans blocks in [start, upper()) that have no
+    successful scan (failed scans, scans a crash left "running", blocks never reached) and
+    repeats the check every `rescan_interval` seconds.
+
+    The lane yields: before each block it waits while `busy()` is true, i.e. while the live
+    tail is behind, so gap filling only uses capacity the live tail is not using.
+    """
+
+    def __init__(
+        self,
+        runner: PipelineRunner,
+        store: Store,
+        start: int,
+        busy: Callable[[], bool],
+        rescan_interval: float = 300.0,
+        idle_sleep: float = 0.5,
+    ) -> None:
+        self.runner = runner
+        self.store = store
+        self.start = start
+        self.busy = busy
+        self.rescan_interval = rescan_interval
+        self.idle_sleep = idle_sleep
+        self.filled = 0
+
+    async def run(self, upper: Callable[[], int]) -> None:
+        """`upper()` is the live tail's committed cursor: everything below it is settled."""
+        while True:
+            try:
+                await self.fill(upper() - 1)
+            except Exception as e:
+                # A failed pass (e.g. the DB is briefly unreachable) must not end the lane.
+                log.warning("Gap fill pass failed, retrying in %ss err=%s", self.rescan_interval, e)
+            await asyncio.sleep(self.rescan_interval)
+
+    async def fill(self, end: int) -> None:
+        """One pass: rescan every block in [start, end] without a successful scan."""
+        gaps = await self.store.find_gaps(self.start, end)
+        missing = sum(hi - lo + 1 for lo, hi in gaps)
+        if missing:
+            log.info(
+                "Gap fill pass range=%s..%s gaps=%s blocks=%s",
+                self.start,
+                end,
+                len(gaps),
+                missing,
+            )
+        for lo, hi in gaps:
+            for bn in range(lo, hi + 1):
+                while self.busy():
+                    await asyncio.sleep(self.idle_sleep)
+                try:
+                    await self.runner.process_block(bn)
+                    self.filled += 1
+                except Exception as e:
+                    # Left as a gap; the next pass retries it.
+                    log.warning("Gap fill failed block=%s err=%s", bn, e)
@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+
+from scanner.db.session import configure_db, dispose_async_engine
+from scanner.pipeline.runner import PipelineRunner
+from scanner.pipeline.store import Store
+from scanner.rpc.errors import RpcError
+from scanner.rpc.factory import build_client, build_rpc
+from scanner.rpc.recording import RecordingRpc, ReplayRpc
+from scanner.settings import FileConfig
+from scanner.tracing import TRACER, configure_tracing
+
+log = logging.getLogger("scanner.pipeline.replay")
+
+
+async def record_range(cfg: FileConfig, start: int, end: int, path: str) -> int:
+    """
+    Fetches [start, end] exactly as the scanner's fetch stage does and appends every RPC call
+    and answer to `path`. No analysis and no database.
+    """
+    configure_tracing(cfg.tracing, cfg.chain.id)
+    rpc = RecordingRpc(build_rpc(cfg.rpc), path)
+    client = build_client(cfg, rpc=rpc)
+    runner = PipelineRunner.from_config(cfg, client=client, store=None)
+    todo = iter(range(start, end + 1))
+    failed = 0
+
+    async def worker() -> None:
+        # The workers share one iterator, so only `fetch_concurrency` fetches exist at a time.
+        nonlocal failed
+        for bn in todo:
+            try:
+                fetched = await runner.fetch(bn)
+            except Exception as e:
+                log.warning("Record fetch failed block=%s err=%s", bn, e)
+                failed += 1
+                continue
+            if fetched.error is not None:
+                failed += 1
+
+    t0 = time.monotonic()
+    try:
+        await client.get_latest_block_number()
+        await client.probe_capabilities()
+        await asyncio.gather(*(worker() for _ in range(max(1, cfg.scanner.fetch_concurrency))))
+    finally:
+        runner.close()
+        await client.aclose()
+        TRACER.shutdown()
+    elapsed = max(1e-9, time.monotonic() - t0)
+    print(
+        f"Recorded blocks={start}..{end} failed={failed} calls={rpc.writer.records} "
+        f"elapsed={elapsed:.1f}s path={path}"
+    )
+    return end - start + 1 - failed
+
+
+async def replay_range(
+    cfg: FileConfig,
+    path: str,
+    start: int | None = None,
+    end: int | None = None,
+    persist: bool = True,
+) -> dict[str, float]:
+    """
+    Runs the recorded blocks through PipelineRunner with no network, one stage at a time, and
+    reports each stage's throughput so analyzers and the store can be profiled on their own.
+    """
+    configure_tracing(cfg.tracing, cfg.chain.id)
+    rpc = ReplayRpc(path)
+    blocks = [
+        b
+        for b in rpc.reader.blocks()
+        if (start is None or b >= start) and (end is None or b <= end)
+    ]
+    client = build_client(cfg, rpc=rpc)
+    store = None
+    if persist:
+        configure_db(cfg.db)
+        store = Store(chain_id=cfg.chain.id)
+    runner = PipelineRunner.from_config(cfg, client=client, store=store)
+
+    stages = {"fetch": 0.0, "analyze": 0.0, "persist": 0.0}
+    scanned = txs = failed = 0
+    try:
+        try:
+            await client.get_latest_block_number()
+        except RpcError:
+            client.head = blocks[-1] if blocks else None
+        await client.probe_capabilities()
+        for bn in blocks:
+            if not rpc.has_block(bn):
+                continue  # only named by another call, e.g. the capability probe
+            t0 = time.perf_counter()
+            try:
+                fetched = await runner.fetch(bn)
+            except RpcError as e:
+                log.warning("Replay fetch failed block=%s err=%s", bn, e)
+                failed += 1
+                continue
+            t1 = time.perf_counter()
+            result = await runner.analyze(fetched)
+            t2 = time.perf_counter()
+            if store is not None:
+                await runner.persist(result)
+            t3 = time.perf_counter()
+            stages["fetch"] += t1 - t0
+            stages["analyze"] += t2 - t1
+            stages["persist"] += t3 - t2
+            scanned += 1
+            txs += len(fetched.block.tx_hashes)
+            failed += result.status != "success"
+    finally:
+        runner.close()
+        await client.aclose()
+        if store is not None:
+            await dispose_async_engine()
+        TRACER.shutdown()
+
+    total = sum(stages.values())
+    print(f"Replayed blocks={scanned} txs={txs} failed={failed} misses={rpc.misses}")
+    for name, seconds in stages.items():
+        if name == "persist" and store is None:
+            continue
+        rate = scanned / seconds if seconds > 0 else float("inf")
+        print(f"  {name:<8} {seconds:8.3f}s  {rate:10.1f} blocks/s")
+    if total > 0:
+        print(f"  {'total':<8} {total:8.3f}s  {scanned / total:10.1f} blocks/s")
+    return {**stages, "blocks": scanned, "txs": txs, "failed": failed}
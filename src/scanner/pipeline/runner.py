@@ -1,84 +1,244 @@
 from __future__ import annotations
 
+import asyncio
 import logging
+import time
+import tracemalloc
+from contextlib import nullcontext
+from dataclasses import dataclass, field
 from typing import Any
 
-from scanner.analyzers import (
-    ConflictPatternsAnalyzer,
-    HiddenDependenciesAnalyzer,
-    HotStateAnalyzer,
-    OrderingSensitivityAnalyzer,
-)
 from scanner.analyzers.base import AnalyzerContext
+from scanner.analyzers.executor import AnalyzerExecutor
+from scanner.analyzers.features import BlockFeatures, BlockFeaturesBuilder
+from scanner.analyzers.registry import BUILTINS, AnalyzerRegistry
 from scanner.db.models import Signal
+from scanner.metrics import REGISTRY
 from scanner.pipeline.store import Store
+from scanner.profiling import block_done
 from scanner.rpc.monad_client import MonadClient
+from scanner.rpc.types import BlockRef
+from scanner.settings import FileConfig
 from scanner.signals.scorer import to_draft
 from scanner.signals import explain
+from scanner.tracing import TRACER
 from scanner.utils.hashing import stable_hash
 from scanner.utils.time import utcnow
 
 log = logging.getLogger("scanner.pipeline.runner")
 
+STAGE_SECONDS = REGISTRY.histogram(
+    "scanner_pipeline_stage_seconds",
+    "Per-block time in each pipeline stage (fetch_block, fetch_receipts, analyze, "
+    "to_signals, persist).",
+)
+
+
+@dataclass
+class FetchedBlock:
+    block: BlockRef
+    features: BlockFeatures | None
+    strategy: str
+    error: str | None = None
+    # Memory stats from the receipt stream, copied into the scan meta.
+    stats: dict[str, int] = field(default_factory=dict)
+
+
+@dataclass
+class BlockResult:
+    block: BlockRef
+    status: str  # success/fail
+    signals: list[Signal]
+    meta: dict[str, Any] = field(default_factory=dict)
+
 
 class PipelineRunner:
-    def __init__(self, chain_id: str, client: MonadClient, store: Store, cfg: dict[str, Any]) -> None:
+    def __init__(
+        self,
+        chain_id: str,
+        client: MonadClient,
+        store: Store,
+        cfg: dict[str, Any],
+        executor: AnalyzerExecutor | None = None,
+        registry: AnalyzerRegistry | None = None,
+    ) -> None:
         self.chain_id = chain_id
         self.client = client
         self.store = store
         self.cfg = cfg
+        self.executor = executor or AnalyzerExecutor()
+        self.registry = registry or AnalyzerRegistry.from_toggles(
+            {k: bool(v) for k, v in cfg.items() if k in BUILTINS}
+        )
+        self.trace_memory = bool(cfg.get("trace_memory", False))
+        self.mark_running = bool(cfg.get("mark_running", False))
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        # Receipt fetches take turns while memory is traced (e.g. the gap lane's next to the live
+        # pipeline's), so one block's peak never includes another block's receipts.
+        self._traced_fetch = asyncio.Lock() if self.trace_memory else nullcontext()
 
-        self.ordering = OrderingSensitivityAnalyzer()
-        self.conflict = ConflictPatternsAnalyzer()
-        self.hot = HotStateAnalyzer()
-        self.dep = HiddenDependenciesAnalyzer()
+    @classmethod
+    def from_config(cls, cfg: FileConfig, client: MonadClient, store: Store) -> PipelineRunner:
+        a = cfg.analysis
+        toggles = {
+            "ordering_sensitivity": a.ordering_sensitivity,
+            "conflict_patterns": a.conflict_patterns,
+            "hot_state": a.hot_state,
+            "hidden_dependencies": a.hidden_dependencies,
+            **a.enabled,
+        }
+        return cls(
+            chain_id=cfg.chain.id,
+            client=client,
+            store=store,
+            cfg={
+                "min_severity_to_store": cfg.signals.min_severity_to_store,
+                "trace_memory": cfg.scanner.trace_memory,
+                "mark_running": cfg.scanner.mark_running,
+            },
+            executor=AnalyzerExecutor(
+                mode=a.executor, workers=a.workers, timeout=a.timeout_seconds
+            ),
+            registry=AnalyzerRegistry.from_toggles(
+                toggles, budget_ms=a.budget_ms_per_block, budget_lag_blocks=a.budget_lag_blocks
+            ),
+        )
+
+    def close(self) -> None:
+        self.executor.close()
 
     async def process_block(self, block_number: int) -> None:
-        b = await self.client.get_block_by_number(block_number)
-        self.store.upsert_block(
-            number=b.number,
-            block_hash=b.hash,
-            parent_hash=b.parent_hash,
-            timestamp=b.timestamp,
-            raw=b.raw,
-            tx_count=len(b.tx_hashes),
-        )
+        with TRACER.span("process_block", block=block_number):
+            fetched = await self.fetch(block_number)
+            result = await self.analyze(fetched)
+            await self.persist(result)
 
-        scan_id = self.store.start_scan(block_number=b.number, block_hash=b.hash)
+    async def fetch(self, block_number: int) -> FetchedBlock:
+        """
+        I/O stage. Errors fetching the block itself propagate (the block must be retried);
+        receipt errors are carried along so the scan is recorded as failed.
+
+        Receipts are streamed in chunks and reduced to BlockFeatures as they arrive, so only a
+        bounded window of receipts is alive at once however large the block is.
+        """
+        with TRACER.span("fetch", block=block_number) as span:
+            fetched = await self._fetch(block_number)
+            span.set("tx_count", len(fetched.block.tx_hashes))
+            span.set("receipts.strategy", fetched.strategy)
+            return fetched
+
+    async def _fetch(self, block_number: int) -> FetchedBlock:
+        t0 = time.perf_counter()
+        with TRACER.span("fetch_block"):
+            b = await self.client.get_block_by_number(block_number)
+        t1 = time.perf_counter()
+        STAGE_SECONDS.observe(t1 - t0, stage="fetch_block")
+        if self.mark_running and self.store is not None:
+            await self.store.start_scan(block_number=b.number, block_hash=b.hash)
+        builder = BlockFeaturesBuilder()
+        async with self._traced_fetch:
+            if self.trace_memory:
+                tracemalloc.reset_peak()
+                base = tracemalloc.get_traced_memory()[0]
+            try:
+                with TRACER.span("fetch_receipts"):
+                    strategy, peak_held = await self.client.stream_block_receipts(
+                        b.number, b.tx_hashes, builder.add
+                    )
+            except Exception as e:
+                log.exception("Receipt fetch failed block=%s err=%s", block_number, e)
+                return FetchedBlock(block=b, features=None, strategy="", error=str(e))
+            finally:
+                STAGE_SECONDS.observe(time.perf_counter() - t1, stage="fetch_receipts")
+            stats = {"receipts_peak_held": peak_held}
+            if self.trace_memory:
+                stats["mem_peak_bytes"] = max(0, tracemalloc.get_traced_memory()[1] - base)
+        return FetchedBlock(block=b, features=builder.build(), strategy=strategy, stats=stats)
+
+    async def analyze(self, fetched: FetchedBlock) -> BlockResult:
+        """CPU stage: analyzers + signal building. Never raises; failures become a failed scan."""
+        with TRACER.span("analyze", block=fetched.block.number) as span:
+            result = await self._analyze(fetched)
+            span.set("status", result.status)
+            span.set("signals", len(result.signals))
+            return result
+
+    async def _analyze(self, fetched: FetchedBlock) -> BlockResult:
+        b = fetched.block
+        if fetched.error is not None:
+            return BlockResult(block=b, status="fail", signals=[], meta={"error": fetched.error})
         try:
-            receipts = await self._fetch_receipts(b.tx_hashes)
             ctx = AnalyzerContext(
                 chain_id=self.chain_id,
                 block_number=b.number,
                 block_hash=b.hash,
                 tx_hashes=b.tx_hashes,
-                receipts=receipts,
-                raw_block=b.raw,
+                receipts={},
+                raw_block=b.raw or {},
+                features=fetched.features,
             )
 
-            findings = []
-            if self.cfg.get("ordering_sensitivity", True):
-                findings += [("ordering", x) for x in await self.ordering.analyze(ctx)]
-            if self.cfg.get("conflict_patterns", True):
-                findings += [("conflict", x) for x in await self.conflict.analyze(ctx)]
-            if self.cfg.get("hot_state", True):
-                findings += [("hot_state", x) for x in await self.hot.analyze(ctx)]
-            if self.cfg.get("hidden_dependencies", True):
-                findings += [("dependency", x) for x in await self.dep.analyze(ctx)]
-
-            signals = self._to_signals(ctx, findings)
-            inserted = self.store.insert_signals(signals)
-            self.store.finish_scan(scan_id, "success", meta={"signals_inserted": inserted})
+            # Distance from head decides whether the cost budget applies.
+            head = self.client.head
+            lag = head - b.number if head is not None else 0
+            plan = self.registry.plan(ctx, lag)
+            t0 = time.perf_counter()
+            with TRACER.span("analyzers", executor=self.executor.mode):
+                findings, report = await self.executor.run(plan.run, ctx)
+            t1 = time.perf_counter()
+            self.registry.record(report, len(b.tx_hashes))
+
+            with TRACER.span("to_signals", findings=len(findings)):
+                signals = self._to_signals(ctx, findings)
+            STAGE_SECONDS.observe(t1 - t0, stage="analyze")
+            STAGE_SECONDS.observe(time.perf_counter() - t1, stage="to_signals")
         except Exception as e:
-            log.exception("Scan failed block=%s err=%s", block_number, e)
-            self.store.finish_scan(scan_id, "fail", meta={"error": str(e)})
-
-    async def _fetch_receipts(self, tx_hashes: list[str]) -> dict[str, dict | None]:
-        receipts: dict[str, dict | None] = {}
-        # Keep it safe: don't explode RPC if blocks are heavy.
-        for h in tx_hashes[:5000]:
-            receipts[h] = await self.client.get_receipt(h)
-        return receipts
+            log.exception("Scan failed block=%s err=%s", b.number, e)
+            return BlockResult(block=b, status="fail", signals=[], meta={"error": str(e)})
+        meta: dict[str, Any] = {
+            "receipts_strategy": fetched.strategy,
+            **fetched.stats,
+            "analyzers": report,
+        }
+        # A timed-out or failed analyzer does not fail the scan; its absence is recorded.
+        incomplete = sorted(name for name, r in report.items() if r["status"] != "ok")
+        if incomplete:
+            meta["partial"] = incomplete
+        if plan.skipped:
+            meta["skipped"] = plan.skipped
+        return BlockResult(block=b, status="success", signals=signals, meta=meta)
+
+    async def persist(self, result: BlockResult) -> None:
+        """Store stage: block row, scan row, signals in one transaction, in block-number order."""
+        with STAGE_SECONDS.time(stage="persist"), TRACER.span("persist", block=result.block.number):
+            await self._persist(result)
+        block_done()
+
+    async def _persist(self, result: BlockResult) -> None:
+        b = result.block
+        row = {
+            "number": b.number,
+            "block_hash": b.hash,
+            "parent_hash": b.parent_hash,
+            "timestamp": b.timestamp,
+            "raw": b.raw,
+            "tx_count": len(b.tx_hashes),
+        }
+        try:
+            await self.store.commit_block(
+                **row, status=result.status, meta=result.meta, signals=result.signals
+            )
+        except Exception as e:
+            # The transaction was rolled back as a whole; record the block as a failed scan.
+            # If the block row itself cannot be written (e.g. a reorg) this raises again.
+            log.exception("Persist failed block=%s err=%s", b.number, e)
+            await self.store.commit_block(**row, status="fail", meta={"error": str(e)})
+
+    async def record_failure(self, block_number: int, block_hash: str, error: str) -> None:
+        """A "fail" scan row alone, for a block whose result could not be produced or stored."""
+        scan_id = await self.store.start_scan(block_number, block_hash)
+        await self.store.finish_scan(scan_id, "fail", meta={"error": error})
 
     def _to_signals(self, ctx: AnalyzerContext, findings: list[tuple[str, dict]]) -> list[Signal]:
         out: list[Signal] = []
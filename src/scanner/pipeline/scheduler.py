@@ -15,10 +15,30 @@ class Scheduler:
     def stop(self) -> None:
         self._stop.set()
 
-    async def loop(self, tick_fn):
+    async def loop(self, tick_fn, heads: asyncio.Queue[int] | None = None):
+        """
+        Polling mode (heads=None): tick every poll interval.
+        Push mode: tick as soon as a new head lands in `heads`; if nothing arrives within
+        a poll interval (socket down, subscription unsupported) run a polling tick instead.
+        """
         while not self._stop.is_set():
+            head = await self._next_head(heads) if heads is not None else None
             try:
-                await tick_fn(self.max_blocks_per_tick)
+                if head is None:
+                    await tick_fn(self.max_blocks_per_tick)
+                else:
+                    await tick_fn(self.max_blocks_per_tick, head=head)
             except Exception as e:
                 log.exception("scheduler tick failed err=%s", e)
-            await asyncio.sleep(self.poll_interval_seconds)
+            if heads is None:
+                await asyncio.sleep(self.poll_interval_seconds)
+
+    async def _next_head(self, heads: asyncio.Queue[int]) -> int | None:
+        try:
+            head = await asyncio.wait_for(heads.get(), timeout=self.poll_interval_seconds)
+        except TimeoutError:
+            return None
+        # Coalesce heads that piled up while the previous tick ran.
+        while not heads.empty():
+            head = max(head, heads.get_nowait())
+        return head
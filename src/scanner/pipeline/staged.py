@@ -0,0 +1,174 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+
+from sqlalchemy.exc import DataError, IntegrityError
+
+from scanner.metrics import REGISTRY
+from scanner.pipeline.runner import BlockResult, FetchedBlock, PipelineRunner
+from scanner.utils.backoff import jitter_sleep
+
+log = logging.getLogger("scanner.pipeline.staged")
+
+# Retrying these cannot succeed, e.g. a reorged block whose height is already stored.
+PERMANENT_ERRORS = (IntegrityError, DataError)
+
+QUEUE_DEPTH = REGISTRY.gauge(
+    "scanner_pipeline_queue_depth", "Blocks waiting per pipeline queue (fetch, analyze, inflight)."
+)
+
+
+class StagedPipeline:
+    """
+    Bounded fetch -> analyze -> persist pipeline over PipelineRunner's stages.
+
+    - up to `fetch_concurrency` blocks are fetched at once, running ahead of analysis;
+    - up to `analyze_concurrency` blocks are analyzed while later blocks are still fetching;
+    - a single persister commits results strictly in submission (block-number) order.
+
+    At most `max_inflight` blocks are between submit() and commit; submit() waits when the
+    window is full, so a slow store or node pushes back all the way to the block source.
+
+    A block that still fails after `max_attempts` (or hits a permanent store error) is
+    recorded as a failed scan and skipped, so it cannot stall the blocks behind it; the gap
+    lane picks it up later.
+    """
+
+    def __init__(
+        self,
+        runner: PipelineRunner,
+        fetch_concurrency: int = 4,
+        analyze_concurrency: int = 2,
+        max_inflight: int = 32,
+        max_attempts: int = 5,
+    ) -> None:
+        self.runner = runner
+        self.fetch_concurrency = max(1, fetch_concurrency)
+        self.analyze_concurrency = max(1, analyze_concurrency)
+        self.max_inflight = max(1, max_inflight)
+        self.max_attempts = max(1, max_attempts)
+        self.committed: int | None = None  # last block persisted
+
+        self._fetch_q: asyncio.Queue[tuple[int, asyncio.Future[BlockResult]]] = asyncio.Queue()
+        self._analyze_q: asyncio.Queue[tuple[FetchedBlock, asyncio.Future[BlockResult]]] = (
+            asyncio.Queue(maxsize=self.analyze_concurrency * 2)
+        )
+        self._order_q: asyncio.Queue[tuple[int, asyncio.Future[BlockResult]]] = asyncio.Queue(
+            maxsize=self.max_inflight
+        )
+        self._tasks: list[asyncio.Task] = []
+
+    def queue_depths(self) -> dict[str, int]:
+        return {
+            "fetch": self._fetch_q.qsize(),
+            "analyze": self._analyze_q.qsize(),
+            "inflight": self._order_q.qsize(),
+        }
+
+    def _export_depths(self) -> None:
+        for queue, depth in self.queue_depths().items():
+            QUEUE_DEPTH.set(depth, queue=queue)
+
+    def start(self) -> None:
+        if self._tasks:
+            return
+        # Read at scrape time rather than tracked on every put/get.
+        REGISTRY.add_collector(self._export_depths)
+        self._tasks += [asyncio.create_task(self._fetcher()) for _ in range(self.fetch_concurrency)]
+        self._tasks += [
+            asyncio.create_task(self._analyzer()) for _ in range(self.analyze_concurrency)
+        ]
+        self._tasks.append(asyncio.create_task(self._persister()))
+
+    async def stop(self) -> None:
+        REGISTRY.remove_collector(self._export_depths)
+        for t in self._tasks:
+            t.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def submit(self, block_number: int) -> None:
+        fut: asyncio.Future[BlockResult] = asyncio.get_running_loop().create_future()
+        await self._order_q.put((block_number, fut))  # backpressure point
+        self._fetch_q.put_nowait((block_number, fut))
+
+    async def drain(self) -> None:
+        await self._order_q.join()
+
+    async def _fetcher(self) -> None:
+        while True:
+            bn, fut = await self._fetch_q.get()
+            try:
+                fetched = await self.runner.fetch(bn)
+            except Exception as e:
+                if not fut.done():
+                    fut.set_exception(e)
+                continue
+            await self._analyze_q.put((fetched, fut))
+
+    async def _analyzer(self) -> None:
+        while True:
+            fetched, fut = await self._analyze_q.get()
+            result = await self.runner.analyze(fetched)
+            if not fut.done():
+                fut.set_result(result)
+
+    async def _persister(self) -> None:
+        while True:
+            bn, fut = await self._order_q.get()
+            try:
+                result = await self._result(bn, fut)
+                if result is not None:
+                    await self._persist(result)
+                self.committed = bn
+            finally:
+                self._order_q.task_done()
+
+    async def _result(self, bn: int, fut: asyncio.Future[BlockResult]) -> BlockResult | None:
+        # A block we could not fetch is retried in place: later blocks wait behind it so
+        # commits never skip ahead of a hole it has not been recorded for.
+        first: asyncio.Future[BlockResult] | None = fut
+        for attempt in range(self.max_attempts):
+            try:
+                if first is not None:
+                    return await first
+                return await self.runner.analyze(await self.runner.fetch(bn))
+            except Exception as e:
+                log.warning(
+                    "Block fetch failed, retrying block=%s attempt=%s err=%s", bn, attempt, e
+                )
+                first = None
+                error = e
+                if attempt + 1 < self.max_attempts:
+                    await jitter_sleep(0.5, 2.0, attempt, max_sleep=30.0)
+        await self._give_up(bn, "", error)
+        return None
+
+    async def _persist(self, result: BlockResult) -> None:
+        for attempt in range(self.max_attempts):
+            try:
+                await self.runner.persist(result)
+                return
+            except PERMANENT_ERRORS as e:
+                error = e
+                break
+            except Exception as e:
+                log.exception(
+                    "Persist failed, retrying block=%s attempt=%s err=%s",
+                    result.block.number,
+                    attempt,
+                    e,
+                )
+                error = e
+                if attempt + 1 < self.max_attempts:
+                    await jitter_sleep(0.5, 2.0, attempt, max_sleep=30.0)
+        await self._give_up(result.block.number, result.block.hash, error)
+
+    async def _give_up(self, bn: int, block_hash: str, error: Exception) -> None:
+        log.error("Giving up on block=%s, recording it as failed err=%s", bn, error)
+        try:
+            await self.runner.record_failure(bn, block_hash, str(error))
+        except Exception as e:
+            # Without a successful scan the block is still a gap, so it is not lost.
+            log.exception("Could not record failed scan block=%s err=%s", bn, e)
@@ -1,85 +1,294 @@
 from __future__ import annotations
 
+import functools
 import logging
+import time
 from typing import Iterable
 
-from sqlalchemy import select
+from sqlalchemy import func, or_, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from scanner.db.models import Block, Scan, Signal
-from scanner.db.session import SessionLocal
+from scanner.db import session as db_session
+from scanner.db.models import Block, Scan, ScanCursor, Signal
+from scanner.metrics import REGISTRY
+from scanner.tracing import TRACER
 from scanner.utils.time import utcnow
 
 log = logging.getLogger("scanner.pipeline.store")
 
+STORE_SECONDS = REGISTRY.histogram("scanner_store_seconds", "Store method latency.")
+
+_INSERTS = {"postgresql": pg_insert, "sqlite": sqlite_insert}
+_SIGNAL_COLUMNS = [c.key for c in Signal.__table__.columns if c.key != "id"]
+
+
+def _timed(fn):
+    method = fn.__name__
+    span_name = f"store.{method}"
+
+    @functools.wraps(fn)
+    async def wrapper(*args, **kwargs):
+        t0 = time.perf_counter()
+        try:
+            with TRACER.span(span_name):
+                return await fn(*args, **kwargs)
+        finally:
+            STORE_SECONDS.observe(time.perf_counter() - t0, method=method)
+
+    return wrapper
+
+
+def _insert(db: AsyncSession, model):
+    # INSERT ... ON CONFLICT needs the dialect's own insert construct.
+    dialect = db.get_bind().dialect.name
+    insert = _INSERTS.get(dialect)
+    if insert is None:
+        raise NotImplementedError(f"Store supports postgresql and sqlite, not {dialect}")
+    return insert(model)
+
 
 class Store:
+    """
+    Async persistence for the pipeline. Every method awaits the database on the async engine,
+    so commits never stall the event loop shared with the API.
+    """
+
     def __init__(self, chain_id: str) -> None:
         self.chain_id = chain_id
 
-    def upsert_block(self, number: int, block_hash: str, parent_hash: str | None, timestamp, raw, tx_count: int) -> None:
-        db = SessionLocal()
-        try:
-            existing = db.execute(select(Block).where(Block.hash == block_hash)).scalar_one_or_none()
-            if existing:
-                return
-            b = Block(
-                chain_id=self.chain_id,
-                number=number,
-                hash=block_hash,
-                parent_hash=parent_hash,
-                timestamp=timestamp,
-                tx_count=tx_count,
-                raw=raw,
-                created_at=utcnow(),
-            )
-            db.add(b)
-            db.commit()
-        finally:
-            db.close()
+    @_timed
+    async def upsert_block(
+        self,
+        number: int,
+        block_hash: str,
+        parent_hash: str | None,
+        timestamp,
+        raw,
+        tx_count: int,
+    ) -> None:
+        async with db_session.AsyncSessionLocal() as db:
+            await self._upsert_block(db, number, block_hash, parent_hash, timestamp, raw, tx_count)
+            await db.commit()
 
-    def start_scan(self, block_number: int, block_hash: str) -> int:
-        db = SessionLocal()
-        try:
-            s = Scan(
-                chain_id=self.chain_id,
-                block_number=block_number,
-                block_hash=block_hash,
-                status="running",
-                started_at=utcnow(),
-                finished_at=None,
-                meta=None,
-            )
-            db.add(s)
-            db.commit()
-            db.refresh(s)
+    @_timed
+    async def start_scan(self, block_number: int, block_hash: str) -> int:
+        """A "running" scan row, committed on its own so a long scan is visible while it runs."""
+        async with db_session.AsyncSessionLocal() as db:
+            s = await self._scan(db, block_number)
+            if s is None:
+                s = Scan(chain_id=self.chain_id, block_number=block_number)
+                db.add(s)
+            s.block_hash = block_hash
+            s.status = "running"
+            s.started_at = utcnow()
+            s.finished_at = None
+            s.meta = None
+            await db.commit()
             return int(s.id)
-        finally:
-            db.close()
 
-    def finish_scan(self, scan_id: int, status: str, meta: dict | None = None) -> None:
-        db = SessionLocal()
-        try:
-            s = db.get(Scan, scan_id)
+    @_timed
+    async def finish_scan(self, scan_id: int, status: str, meta: dict | None = None) -> None:
+        async with db_session.AsyncSessionLocal() as db:
+            s = await db.get(Scan, scan_id)
             if not s:
                 return
             s.status = status
             s.finished_at = utcnow()
             s.meta = meta
-            db.commit()
-        finally:
-            db.close()
+            await db.commit()
 
-    def insert_signals(self, signals: Iterable[Signal]) -> int:
-        db = SessionLocal()
-        inserted = 0
-        try:
-            for sig in signals:
-                exists = db.execute(select(Signal).where(Signal.signal_id == sig.signal_id)).scalar_one_or_none()
-                if exists:
-                    continue
-                db.add(sig)
-                inserted += 1
-            db.commit()
+    @_timed
+    async def insert_signals(self, signals: Iterable[Signal]) -> int:
+        async with db_session.AsyncSessionLocal() as db:
+            inserted = await self._insert_signals(db, signals)
+            await db.commit()
             return inserted
-        finally:
-            db.close()
+
+    @_timed
+    async def commit_block(
+        self,
+        number: int,
+        block_hash: str,
+        parent_hash: str | None,
+        timestamp,
+        raw,
+        tx_count: int,
+        status: str,
+        meta: dict | None = None,
+        signals: Iterable[Signal] = (),
+    ) -> int:
+        """
+        Block row, signals and the finished scan row in one transaction: one commit per block,
+        and a crash leaves either all of them or none. Returns the signals inserted, which a
+        successful scan also records as meta["signals_inserted"].
+        """
+        async with db_session.AsyncSessionLocal() as db:
+            await self._upsert_block(db, number, block_hash, parent_hash, timestamp, raw, tx_count)
+            inserted = await self._insert_signals(db, signals)
+            meta = dict(meta or {})
+            if status == "success":
+                meta["signals_inserted"] = inserted
+            now = utcnow()
+            s = await self._scan(db, number)
+            if s is None:
+                s = Scan(chain_id=self.chain_id, block_number=number, started_at=now)
+                db.add(s)
+            elif s.status != "running" or s.block_hash != block_hash:
+                s.started_at = now  # else keep the start_scan marker's time
+            s.block_hash = block_hash
+            s.status = status
+            s.finished_at = now
+            s.meta = meta
+            await db.commit()
+            return inserted
+
+    async def _upsert_block(
+        self,
+        db: AsyncSession,
+        number: int,
+        block_hash: str,
+        parent_hash: str | None,
+        timestamp,
+        raw,
+        tx_count: int,
+    ) -> None:
+        # A block already stored under this hash is left alone. A different hash at the same
+        # height still violates ix_blocks_chain_number and raises, as before.
+        stmt = _insert(db, Block).values(
+            chain_id=self.chain_id,
+            number=number,
+            hash=block_hash,
+            parent_hash=parent_hash,
+            timestamp=timestamp,
+            tx_count=tx_count,
+            raw=raw,
+            created_at=utcnow(),
+        )
+        await db.execute(stmt.on_conflict_do_nothing(index_elements=["hash"]))
+
+    async def _scan(self, db: AsyncSession, block_number: int) -> Scan | None:
+        # One scan row per (chain, block): a rescan or retried persist reuses it.
+        return (
+            await db.execute(
+                select(Scan).where(
+                    Scan.chain_id == self.chain_id, Scan.block_number == block_number
+                )
+            )
+        ).scalar_one_or_none()
+
+    async def _insert_signals(self, db: AsyncSession, signals: Iterable[Signal]) -> int:
+        """
+        One INSERT ... ON CONFLICT (signal_id) DO NOTHING RETURNING for the whole batch, so
+        concurrent writers cannot race on the unique index. Returns the rows actually inserted.
+        """
+        rows: dict[str, dict] = {}
+        for sig in signals:
+            rows.setdefault(sig.signal_id, {c: getattr(sig, c) for c in _SIGNAL_COLUMNS})
+        if not rows:
+            return 0
+        stmt = (
+            _insert(db, Signal)
+            .on_conflict_do_nothing(index_elements=["signal_id"])
+            .returning(Signal.signal_id)
+        )
+        return len((await db.execute(stmt, list(rows.values()))).all())
+
+    @_timed
+    async def successful_blocks(self, start: int, end: int) -> set[int]:
+        # One range query instead of a lookup per block.
+        async with db_session.AsyncSessionLocal() as db:
+            rows = await db.scalars(
+                select(Scan.block_number).where(
+                    Scan.chain_id == self.chain_id,
+                    Scan.block_number >= start,
+                    Scan.block_number <= end,
+                    Scan.status == "success",
+                )
+            )
+            return set(rows)
+
+    @_timed
+    async def find_gaps(self, start: int, end: int) -> list[tuple[int, int]]:
+        """
+        Inclusive ranges in [start, end] without a successful scan: never scanned, failed, or
+        left "running" by a crash. Computed from the boundaries between consecutive successful
+        scans (LAG over the block index), so the result is one row per gap, not per block.
+        """
+        if end < start:
+            return []
+        ok = (
+            Scan.chain_id == self.chain_id,
+            Scan.block_number >= start,
+            Scan.block_number <= end,
+            Scan.status == "success",
+        )
+        async with db_session.AsyncSessionLocal() as db:
+            seq = (
+                select(
+                    Scan.block_number.label("n"),
+                    func.lag(Scan.block_number).over(order_by=Scan.block_number).label("prev"),
+                )
+                .where(*ok)
+                .subquery()
+            )
+            edges = (
+                await db.execute(
+                    select(seq.c.prev, seq.c.n)
+                    .where(or_(seq.c.prev.is_(None), seq.c.n - seq.c.prev > 1))
+                    .order_by(seq.c.n)
+                )
+            ).all()
+            last = await db.scalar(select(func.max(Scan.block_number)).where(*ok))
+
+        if last is None:
+            return [(start, end)]
+        gaps: list[tuple[int, int]] = []
+        for prev, n in edges:
+            lo = start if prev is None else prev + 1
+            if lo <= n - 1:
+                gaps.append((lo, n - 1))
+        if last < end:
+            gaps.append((last + 1, end))
+        return gaps
+
+    @_timed
+    async def get_cursor(self, name: str) -> ScanCursor | None:
+        async with db_session.AsyncSessionLocal() as db:
+            return (
+                await db.execute(
+                    select(ScanCursor).where(
+                        ScanCursor.chain_id == self.chain_id, ScanCursor.name == name
+                    )
+                )
+            ).scalar_one_or_none()
+
+    @_timed
+    async def save_cursor(
+        self,
+        name: str,
+        position: int,
+        range_start: int | None = None,
+        range_end: int | None = None,
+        status: str = "active",
+    ) -> None:
+        async with db_session.AsyncSessionLocal() as db:
+            c = (
+                await db.execute(
+                    select(ScanCursor).where(
+                        ScanCursor.chain_id == self.chain_id, ScanCursor.name == name
+                    )
+                )
+            ).scalar_one_or_none()
+            if c is None:
+                c = ScanCursor(chain_id=self.chain_id, name=name)
+                db.add(c)
+            c.position = position
+            if range_start is not None:
+                c.range_start = range_start
+            if range_end is not None:
+                c.range_end = range_end
+            c.status = status
+            c.updated_at = utcnow()
+            await db.commit()
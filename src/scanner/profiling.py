@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import sys
+import threading
+import time
+from collections import Counter
+from types import FrameType
+
+# Sampling profiler for live diagnosis: a daemon thread snapshots Python stacks every
+# `interval` seconds via sys._current_frames() and counts them in collapsed form
+# ("outer;inner;leaf count" lines), which flamegraph.pl, inferno and speedscope read directly.
+# The profiled code runs untouched; the cost is the sampler thread's share of the GIL.
+
+_blocks_done = 0
+
+
+def block_done() -> None:
+    """Called once per persisted block so a profile can run for the next N blocks."""
+    global _blocks_done
+    _blocks_done += 1
+
+
+def blocks_done() -> int:
+    return _blocks_done
+
+
+def _label(frame: FrameType) -> str:
+    code = frame.f_code
+    path = code.co_filename
+    for marker in ("/site-packages/", "/src/", "/lib/python"):
+        i = path.rfind(marker)
+        if i >= 0:
+            path = path[i + len(marker) :]
+            break
+    return f"{code.co_qualname} ({path}:{code.co_firstlineno})"
+
+
+def _idle(frame: FrameType) -> bool:
+    # The event loop waiting in select/epoll: nothing to run.
+    return frame.f_code.co_name in ("select", "poll") and frame.f_code.co_filename.endswith(
+        "selectors.py"
+    )
+
+
+class SamplingProfiler:
+    def __init__(
+        self,
+        interval: float = 0.005,
+        thread_ids: set[int] | None = None,
+        include_idle: bool = False,
+        max_depth: int = 128,
+    ) -> None:
+        """`thread_ids`: threads to sample; None samples every thread except the sampler."""
+        self.interval = interval
+        self.thread_ids = thread_ids
+        self.include_idle = include_idle
+        self.max_depth = max_depth
+        self.stacks: Counter[str] = Counter()
+        self.samples = 0
+        self.started = 0.0
+        self.elapsed = 0.0
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        self.started = time.monotonic()
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.elapsed = time.monotonic() - self.started
+
+    def _run(self) -> None:
+        me = threading.get_ident()
+        names = {t.ident: t.name for t in threading.enumerate()}
+        while not self._stop.wait(self.interval):
+            for tid, frame in sys._current_frames().items():
+                if tid == me or (self.thread_ids is not None and tid not in self.thread_ids):
+                    continue
+                if not self.include_idle and _idle(frame):
+                    continue
+                stack = []
+                f: FrameType | None = frame
+                while f is not None and len(stack) < self.max_depth:
+                    stack.append(_label(f))
+                    f = f.f_back
+                if tid not in names:
+                    names = {t.ident: t.name for t in threading.enumerate()}
+                stack.append(names.get(tid, f"thread-{tid}"))
+                self.stacks[";".join(reversed(stack))] += 1
+            self.samples += 1
+
+    def collapsed(self) -> str:
+        return "".join(f"{stack} {n}\n" for stack, n in self.stacks.most_common())
@@ -1,4 +1,24 @@
 from .monad_client import MonadClient
 from .jsonrpc import JsonRpcClient
+from .pool import Endpoint, RpcPool
+from .errors import CircuitOpenError, RpcError, RpcTransportError
+from .retry import CircuitBreaker, RetryPolicy
+from .limiter import AdaptiveLimiter
+from .cache import RpcCache
+from .recording import RecordingRpc, ReplayRpc
 
-__all__ = ["MonadClient", "JsonRpcClient"]
+__all__ = [
+    "MonadClient",
+    "JsonRpcClient",
+    "RpcPool",
+    "Endpoint",
+    "RpcError",
+    "RpcTransportError",
+    "CircuitOpenError",
+    "RetryPolicy",
+    "CircuitBreaker",
+    "AdaptiveLimiter",
+    "RpcCache",
+    "RecordingRpc",
+    "ReplayRpc",
+]
@@ -0,0 +1,187 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import sqlite3
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any
+
+import orjson
+
+from scanner.metrics import REGISTRY
+
+log = logging.getLogger("scanner.rpc.cache")
+
+CACHE_HITS = REGISTRY.counter("scanner_rpc_cache_hits_total", "RPC cache hits per tier.")
+CACHE_MISSES = REGISTRY.counter("scanner_rpc_cache_misses_total", "RPC cache misses.")
+CACHE_BYTES = REGISTRY.gauge("scanner_rpc_cache_bytes", "Bytes held by the in-memory RPC cache.")
+
+
+class LruCache:
+    """In-memory LRU bounded by the total size of the stored (serialized) values."""
+
+    def __init__(self, max_bytes: int) -> None:
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self._data: OrderedDict[str, tuple[bytes, int]] = OrderedDict()  # key -> (value, block)
+
+    def get(self, key: str) -> bytes | None:
+        item = self._data.get(key)
+        if item is None:
+            return None
+        self._data.move_to_end(key)
+        return item[0]
+
+    def put(self, key: str, value: bytes, block_number: int) -> None:
+        if len(value) > self.max_bytes:
+            return
+        old = self._data.pop(key, None)
+        if old is not None:
+            self.bytes -= len(old[0])
+        self._data[key] = (value, block_number)
+        self.bytes += len(value)
+        while self.bytes > self.max_bytes:
+            _, (v, _) = self._data.popitem(last=False)
+            self.bytes -= len(v)
+
+    def drop_from(self, block_number: int) -> int:
+        doomed = [k for k, (_, n) in self._data.items() if n >= block_number]
+        for k in doomed:
+            self.bytes -= len(self._data.pop(k)[0])
+        return len(doomed)
+
+
+class DiskCache:
+    """Optional on-disk tier: a single SQLite file, survives restarts."""
+
+    def __init__(self, path: str) -> None:
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS rpc_cache ("
+            "key TEXT PRIMARY KEY, block_number INTEGER NOT NULL, value BLOB NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS ix_rpc_cache_block ON rpc_cache(block_number)")
+
+    # Blocking; RpcCache calls these through asyncio.to_thread, one query per batch of keys.
+
+    def get_many(self, keys: list[str]) -> dict[str, tuple[bytes, int]]:
+        found: dict[str, tuple[bytes, int]] = {}
+        with self._lock:
+            for i in range(0, len(keys), 500):  # stay under SQLite's bound-parameter limit
+                part = keys[i : i + 500]
+                rows = self._db.execute(
+                    "SELECT key, value, block_number FROM rpc_cache WHERE key IN "
+                    f"({','.join('?' * len(part))})",
+                    part,
+                )
+                for key, value, block_number in rows:
+                    found[key] = (value, block_number)
+        return found
+
+    def put_many(self, rows: list[tuple[str, bytes]], block_number: int) -> None:
+        with self._lock:
+            self._db.execute("BEGIN")
+            try:
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO rpc_cache (key, block_number, value) VALUES (?, ?, ?)",
+                    [(key, block_number, value) for key, value in rows],
+                )
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+            self._db.execute("COMMIT")
+
+    def drop_from(self, block_number: int) -> int:
+        with self._lock:
+            cur = self._db.execute("DELETE FROM rpc_cache WHERE block_number >= ?", (block_number,))
+        return cur.rowcount
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+
+class RpcCache:
+    """
+    Two-tier cache for immutable-once-final RPC data.
+    Keys: "block:<hash>", "receipt:<tx_hash>" and the "num:<number>" -> block hash index.
+    Every entry remembers its block number so a reorg can drop everything from the fork point.
+    """
+
+    def __init__(self, max_bytes: int = 256 * 1024 * 1024, disk_path: str | None = None) -> None:
+        self.mem = LruCache(max_bytes)
+        self.disk = DiskCache(disk_path) if disk_path else None
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    async def get(self, key: str, record: bool = True) -> Any | None:
+        # record=False for internal lookups (reorg checks) that should not skew hit rates.
+        return (await self.get_many([key], record)).get(key)
+
+    async def get_many(self, keys: list[str], record: bool = True) -> dict[str, Any]:
+        """The keys found. Memory misses are read from disk in one query, off the event loop."""
+        found: dict[str, Any] = {}
+        missed: list[str] = []
+        for key in keys:
+            raw = self.mem.get(key)
+            if raw is None:
+                missed.append(key)
+            else:
+                found[key] = orjson.loads(raw)
+        on_disk: dict[str, tuple[bytes, int]] = {}
+        if missed and self.disk is not None:
+            on_disk = await asyncio.to_thread(self.disk.get_many, missed)
+            for key, (raw, block_number) in on_disk.items():
+                self.mem.put(key, raw, block_number)
+                found[key] = orjson.loads(raw)
+        if record:
+            mem_hits, misses = len(keys) - len(missed), len(missed) - len(on_disk)
+            self.hits += mem_hits
+            self.disk_hits += len(on_disk)
+            self.misses += misses
+            if mem_hits:
+                CACHE_HITS.inc(mem_hits, tier="memory")
+            if on_disk:
+                CACHE_HITS.inc(len(on_disk), tier="disk")
+            if misses:
+                CACHE_MISSES.inc(misses)
+        return found
+
+    async def put(self, key: str, value: Any, block_number: int) -> None:
+        await self.put_many([(key, value)], block_number)
+
+    async def put_many(self, items: list[tuple[str, Any]], block_number: int) -> None:
+        """Stores `items` (key, value) of one block; the disk tier in one transaction."""
+        rows = [(key, orjson.dumps(value)) for key, value in items]
+        for key, raw in rows:
+            self.mem.put(key, raw, block_number)
+        CACHE_BYTES.set(self.mem.bytes)
+        if rows and self.disk is not None:
+            await asyncio.to_thread(self.disk.put_many, rows, block_number)
+
+    async def invalidate_from(self, block_number: int) -> None:
+        dropped = self.mem.drop_from(block_number)
+        if self.disk is not None:
+            dropped += await asyncio.to_thread(self.disk.drop_from, block_number)
+        CACHE_BYTES.set(self.mem.bytes)
+        log.warning("RPC cache invalidated from block=%s entries=%s", block_number, dropped)
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "bytes": self.mem.bytes,
+        }
+
+    def close(self) -> None:
+        if self.disk is not None:
+            self.disk.close()
+
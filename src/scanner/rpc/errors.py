@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+from typing import Any
+
+# JSON-RPC error codes that signal node-side pressure rather than a bad request.
+RETRYABLE_RPC_CODES = frozenset({-32005, -32603})  # limit exceeded, internal error
+# Codes (and HTTP statuses, for gateways that reject before JSON-RPC) meaning the node does not
+# offer the method at all.
+UNSUPPORTED_RPC_CODES = frozenset({-32601, -32600})  # method not found, invalid request
+UNSUPPORTED_HTTP_STATUSES = frozenset({404, 405, 501})
+
+
+class RpcError(RuntimeError):
+    """The node answered, but with a JSON-RPC (or HTTP 4xx) error. Usually not worth retrying."""
+
+    def __init__(
+        self, code: int | None, message: str, data: Any = None, status_code: int | None = None
+    ) -> None:
+        super().__init__(f"RPC error code={code} message={message}")
+        self.code = code
+        self.message = message
+        self.data = data
+        self.status_code = status_code
+
+    @property
+    def retryable(self) -> bool:
+        return self.code in RETRYABLE_RPC_CODES
+
+    @property
+    def unsupported(self) -> bool:
+        if self.code is None:
+            return self.status_code in UNSUPPORTED_HTTP_STATUSES
+        return self.code in UNSUPPORTED_RPC_CODES
+
+    @classmethod
+    def from_payload(cls, err: Any) -> RpcError:
+        if isinstance(err, dict):
+            return cls(err.get("code"), str(err.get("message", "")), err.get("data"))
+        return cls(None, str(err))
+
+
+class RpcTransportError(RuntimeError):
+    """Network failure, timeout, HTTP 429/5xx or an undecodable body. Worth retrying."""
+
+    def __init__(
+        self, message: str, status_code: int | None = None, retry_after: float | None = None
+    ) -> None:
+        super().__init__(message)
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+
+class CircuitOpenError(RpcTransportError):
+    """Raised without touching the network while the endpoint's circuit breaker is open."""
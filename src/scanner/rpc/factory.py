@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+from typing import Any
+
+from scanner.rpc.cache import RpcCache
+from scanner.rpc.jsonrpc import JsonRpcClient
+from scanner.rpc.limiter import AdaptiveLimiter
+from scanner.rpc.monad_client import MonadClient
+from scanner.rpc.pool import RpcPool
+from scanner.rpc.recording import ReplayRpc
+from scanner.rpc.retry import CircuitBreaker, RetryPolicy
+from scanner.settings import FileConfig, RpcCfg
+
+# Config -> RPC object wiring, shared by the live scanner and backfill workers.
+
+
+def build_rpc(rpc_cfg: RpcCfg) -> JsonRpcClient | RpcPool | ReplayRpc:
+    if rpc_cfg.replay_path:
+        return ReplayRpc(rpc_cfg.replay_path)
+
+    def endpoint(url: str) -> JsonRpcClient:
+        return JsonRpcClient(
+            url,
+            timeout=rpc_cfg.timeout_seconds,
+            max_connections=rpc_cfg.max_connections,
+            max_keepalive_connections=rpc_cfg.max_keepalive_connections,
+            keepalive_expiry=rpc_cfg.keepalive_expiry_seconds,
+            http2=rpc_cfg.http2,
+            retry=RetryPolicy(
+                max_retries=rpc_cfg.max_retries,
+                max_retry_after=rpc_cfg.max_retry_after_seconds,
+                method_retries=dict(rpc_cfg.method_retries),
+            ),
+            breaker=CircuitBreaker(
+                failure_threshold=rpc_cfg.breaker_failure_threshold,
+                reset_timeout=rpc_cfg.breaker_reset_seconds,
+                name=url,
+            ),
+            limiter=AdaptiveLimiter(
+                initial=rpc_cfg.concurrency_initial,
+                min_limit=rpc_cfg.concurrency_min,
+                max_limit=rpc_cfg.concurrency_max,
+                name=url,
+            )
+            if rpc_cfg.adaptive_concurrency
+            else None,
+        )
+
+    urls = list(dict.fromkeys([rpc_cfg.url, *rpc_cfg.urls]))
+    if len(urls) == 1:
+        return endpoint(urls[0])
+    return RpcPool(
+        [endpoint(u) for u in urls],
+        hedge=rpc_cfg.hedge,
+        hedge_min_delay=rpc_cfg.hedge_min_delay_seconds,
+        hedge_max_delay=rpc_cfg.hedge_max_delay_seconds,
+    )
+
+
+def build_cache(rpc_cfg: RpcCfg) -> RpcCache | None:
+    if rpc_cfg.cache_max_bytes <= 0 and not rpc_cfg.cache_disk_path:
+        return None
+    return RpcCache(max_bytes=max(0, rpc_cfg.cache_max_bytes), disk_path=rpc_cfg.cache_disk_path)
+
+
+def build_client(cfg: FileConfig, rpc: Any | None = None) -> MonadClient:
+    # An explicit `rpc` (e.g. a recording wrapper) and replay run uncached, so every call
+    # reaches the RPC layer.
+    uncached = rpc is not None or bool(cfg.rpc.replay_path)
+    return MonadClient(
+        rpc or build_rpc(cfg.rpc),
+        receipt_batch_size=cfg.rpc.batch_size,
+        receipt_window=cfg.rpc.receipt_window,
+        block_receipts_max_txs=cfg.rpc.block_receipts_max_txs,
+        cache=None if uncached else build_cache(cfg.rpc),
+        confirmations=int(cfg.chain.confirmations or 0),
+        keep_raw=cfg.db.store_raw_blocks,
+    )
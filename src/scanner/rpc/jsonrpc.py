@@ -1,44 +1,294 @@
 from __future__ import annotations
 
+import asyncio
 import logging
+import time
+from collections import Counter
 from typing import Any
 
 import httpx
 import orjson
 
-from scanner.utils.backoff import jitter_sleep
+from scanner.metrics import REGISTRY
+from scanner.rpc.errors import CircuitOpenError, RpcError, RpcTransportError
+from scanner.rpc.limiter import AdaptiveLimiter
+from scanner.rpc.retry import CircuitBreaker, RetryPolicy, parse_retry_after
 
 log = logging.getLogger("scanner.rpc.jsonrpc")
 
+_HEADERS = {"content-type": "application/json"}
+
+RPC_CALLS = REGISTRY.counter("scanner_rpc_calls_total", "JSON-RPC calls per method.")
+RPC_RETRIES = REGISTRY.counter("scanner_rpc_retries_total", "JSON-RPC call retries per method.")
+RPC_ERRORS = REGISTRY.counter(
+    "scanner_rpc_errors_total", "JSON-RPC calls that failed after retries, per method and kind."
+)
+
+
+def _error_kind(e: Exception) -> str:
+    if isinstance(e, CircuitOpenError):
+        return "circuit_open"
+    if isinstance(e, RpcTransportError):
+        return "transport"
+    return "rpc"
+
+
+def _count(counter, calls: list[tuple[str, Any]], idx: Any) -> None:
+    for method, n in Counter(calls[i][0] for i in idx).items():
+        counter.inc(n, method=method)
+
 
 class JsonRpcClient:
-    def __init__(self, url: str, timeout: float = 10.0, max_retries: int = 5) -> None:
+    def __init__(
+        self,
+        url: str,
+        timeout: float = 10.0,
+        max_retries: int = 5,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        keepalive_expiry: float = 30.0,
+        http2: bool = False,
+        retry: RetryPolicy | None = None,
+        breaker: CircuitBreaker | None = None,
+        limiter: AdaptiveLimiter | None = None,
+    ) -> None:
         self.url = url
         self.timeout = timeout
-        self.max_retries = max_retries
+        self.retry = retry or RetryPolicy(max_retries=max_retries)
+        self.max_retries = self.retry.max_retries
+        self.breaker = breaker or CircuitBreaker(name=url)
+        # Optional AIMD cap on in-flight requests; None leaves only the HTTP pool limit.
+        self.limiter = limiter
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.http2 = http2
+        # Flipped off the first time the node rejects a batch payload.
+        self.batch_supported = True
+        # Long-lived pooled client; created lazily so it binds to the running event loop.
+        self._client: httpx.AsyncClient | None = None
+
+    def _http(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout, limits=self.limits, http2=self.http2
+            )
+        return self._client
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def _post(self, payload: Any, kind: str) -> httpx.Response:
+        body = orjson.dumps(payload)
+        if self.limiter is None:
+            return await self._http().post(self.url, content=body, headers=_HEADERS)
+
+        await self.limiter.acquire()
+        t0 = time.perf_counter()
+        congested = False
+        try:
+            r = await self._http().post(self.url, content=body, headers=_HEADERS)
+            congested = r.status_code in (429, 503)
+            return r
+        except httpx.TimeoutException:
+            congested = True
+            raise
+        finally:
+            await self.limiter.release(time.perf_counter() - t0, congested, kind)
+
+    async def _send(self, payload: Any, kind: str = "call") -> Any:
+        """
+        One HTTP round trip, gated by the circuit breaker and the concurrency limiter.
+        Returns the decoded body. Transport trouble (network, timeout, 429, 5xx, garbage body)
+        raises RpcTransportError and counts against the breaker; HTTP 4xx raises RpcError.
+        """
+        self.breaker.check()
+        try:
+            r = await self._post(payload, kind)
+        except httpx.HTTPError as e:
+            self.breaker.record_failure()
+            raise RpcTransportError(f"{type(e).__name__}: {e}") from e
+        except BaseException:
+            # Cancelled (a losing hedge, a stopped pipeline) or a bug: says nothing about the
+            # endpoint, but a half-open trial must not stay claimed forever.
+            self.breaker.release_trial()
+            raise
+
+        status = r.status_code
+        if status == 429 or (status >= 500 and status != 501):
+            self.breaker.record_failure()
+            raise RpcTransportError(
+                f"HTTP {status}",
+                status_code=status,
+                retry_after=parse_retry_after(r.headers.get("retry-after")),
+            )
+        if status >= 400:
+            # The endpoint is alive; the request itself is unacceptable.
+            self.breaker.record_success()
+            raise RpcError(None, f"HTTP {status}", status_code=status)
 
-    async def call(self, method: str, params: list[Any] | None = None) -> Any:
+        try:
+            data = orjson.loads(r.content)
+        except orjson.JSONDecodeError as e:
+            self.breaker.record_failure()
+            raise RpcTransportError(f"undecodable response: {e}", status_code=status) from e
+        self.breaker.record_success()
+        return data
+
+    async def call(
+        self, method: str, params: list[Any] | None = None, max_retries: int | None = None
+    ) -> Any:
         payload = {"jsonrpc": "2.0", "id": 1, "method": method, "params": params or []}
+        retries = self.retry.retries_for(method) if max_retries is None else max_retries
+        attempt = 0
+        RPC_CALLS.inc(method=method)
+
+        while True:
+            retry_after = None
+            try:
+                data = await self._send(payload, kind=method)
+                if not isinstance(data, dict):
+                    raise RpcTransportError(f"unexpected response type: {type(data).__name__}")
+                if "error" in data:
+                    raise RpcError.from_payload(data["error"])
+                return data.get("result")
+            except CircuitOpenError:
+                # Shed load: no point queueing retries against a dead endpoint.
+                RPC_ERRORS.inc(method=method, kind="circuit_open")
+                raise
+            except RpcError as e:
+                if not e.retryable or attempt >= retries:
+                    RPC_ERRORS.inc(method=method, kind="rpc")
+                    raise
+                err: Exception = e
+            except RpcTransportError as e:
+                if attempt >= retries:
+                    RPC_ERRORS.inc(method=method, kind="transport")
+                    raise
+                err = e
+                retry_after = e.retry_after
+            RPC_RETRIES.inc(method=method)
+            log.warning("RPC call failed method=%s attempt=%s err=%s", method, attempt, err)
+            await asyncio.sleep(self.retry.delay(attempt, retry_after))
+            attempt += 1
+
+    async def call_batch(
+        self,
+        calls: list[tuple[str, list[Any] | None]],
+        return_exceptions: bool = False,
+    ) -> list[Any]:
+        """
+        Sends `calls` as one JSON-RPC 2.0 batch and returns results in input order.
+        Responses are matched by id; only entries that failed retryably are re-sent.
+        Falls back to single calls if the node does not accept batch payloads.
+        With return_exceptions=True, entries that still fail are returned as exceptions.
+        """
+        if not calls:
+            return []
+        if not self.batch_supported:
+            return await self._call_each(calls, return_exceptions)
+
+        results: list[Any] = [None] * len(calls)
+        errors: dict[int, Exception] = {}
+        pending = list(range(len(calls)))
+        delegated: list[int] = []  # handed to call(), which counts them itself
+        retries = max(self.retry.retries_for(m) for m in {c[0] for c in calls})
         attempt = 0
-        last_err: Exception | None = None
-
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            while attempt <= self.max_retries:
-                try:
-                    r = await client.post(
-                        self.url,
-                        content=orjson.dumps(payload),
-                        headers={"content-type": "application/json"},
-                    )
-                    r.raise_for_status()
-                    data = r.json()
-                    if "error" in data:
-                        raise RuntimeError(f"RPC error: {data['error']}")
-                    return data["result"]
-                except Exception as e:  # small surface, logged; backoff occurs
-                    last_err = e
-                    log.warning("RPC call failed method=%s attempt=%s err=%s", method, attempt, e)
-                    jitter_sleep(base=0.2, factor=1.8, attempt=attempt, max_sleep=5.0)
-                    attempt += 1
-
-        raise RuntimeError(f"RPC call failed after retries: {method}") from last_err
+
+        while pending:
+            payload = [
+                {"jsonrpc": "2.0", "id": i, "method": calls[i][0], "params": calls[i][1] or []}
+                for i in pending
+            ]
+            try:
+                data = await self._send(payload, kind="batch")
+            except RpcError:
+                # 4xx on a batch body: the node does not speak batches.
+                data = None
+            except CircuitOpenError as e:
+                for i in pending:
+                    errors[i] = e
+                break
+            except RpcTransportError as e:
+                log.warning("RPC batch failed size=%s attempt=%s err=%s", len(pending), attempt, e)
+                for i in pending:
+                    errors[i] = e
+                if attempt >= retries:
+                    break
+                _count(RPC_RETRIES, calls, pending)
+                await asyncio.sleep(self.retry.delay(attempt, e.retry_after))
+                attempt += 1
+                continue
+
+            if not isinstance(data, list):
+                # Nodes without batch support answer with a single error object (or a 4xx).
+                log.info(
+                    "RPC batch rejected by node, falling back to single calls url=%s", self.url
+                )
+                self.batch_supported = False
+                delegated = pending
+                rest = await self._call_each([calls[i] for i in pending], return_exceptions=True)
+                for i, res in zip(pending, rest, strict=True):
+                    if isinstance(res, Exception):
+                        errors[i] = res
+                    else:
+                        errors.pop(i, None)
+                        results[i] = res
+                break
+
+            by_id = {item.get("id"): item for item in data if isinstance(item, dict)}
+            failed: list[int] = []
+            for i in pending:
+                item = by_id.get(i)
+                if item is None:
+                    errors[i] = RpcTransportError(f"RPC batch response missing id={i}")
+                    failed.append(i)
+                elif "error" in item:
+                    err = RpcError.from_payload(item["error"])
+                    errors[i] = err
+                    if err.retryable:
+                        failed.append(i)
+                else:
+                    errors.pop(i, None)
+                    results[i] = item.get("result")
+
+            pending = failed
+            if not pending or attempt >= retries:
+                break
+            log.warning("RPC batch partial failure failed=%s attempt=%s", len(pending), attempt)
+            _count(RPC_RETRIES, calls, pending)
+            await asyncio.sleep(self.retry.delay(attempt))
+            attempt += 1
+
+        own = set(range(len(calls))).difference(delegated)
+        _count(RPC_CALLS, calls, own)
+        for i, e in errors.items():
+            if i in own:
+                RPC_ERRORS.inc(method=calls[i][0], kind=_error_kind(e))
+        for i, e in errors.items():
+            if not return_exceptions:
+                raise e
+            results[i] = e
+        return results
+
+    async def _call_each(
+        self, calls: list[tuple[str, list[Any] | None]], return_exceptions: bool
+    ) -> list[Any]:
+        if self.limiter is not None:
+            # The limiter bounds in-flight requests, so fan out and let it pace us.
+            return await asyncio.gather(
+                *(self.call(m, p) for m, p in calls), return_exceptions=return_exceptions
+            )
+        out: list[Any] = []
+        for method, params in calls:
+            try:
+                out.append(await self.call(method, params))
+            except Exception as e:
+                if not return_exceptions:
+                    raise
+                out.append(e)
+        return out
@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+
+from scanner.metrics import REGISTRY
+
+log = logging.getLogger("scanner.rpc.limiter")
+
+CONCURRENCY_LIMIT = REGISTRY.gauge(
+    "scanner_rpc_concurrency_limit", "Adaptive in-flight request limit per RPC endpoint."
+)
+INFLIGHT = REGISTRY.gauge("scanner_rpc_inflight", "In-flight RPC requests per endpoint.")
+
+
+class AdaptiveLimiter:
+    """
+    AIMD concurrency limit, in the spirit of TCP congestion control.
+    Each healthy response while the window is in use grows the limit by `increase / limit`
+    (about +increase per round trip); a timeout, 429/503 or a latency above
+    `latency_tolerance` x the uncongested baseline multiplies it by `decrease`.
+    """
+
+    def __init__(
+        self,
+        initial: int = 8,
+        min_limit: int = 1,
+        max_limit: int = 64,
+        increase: float = 1.0,
+        decrease: float = 0.5,
+        latency_tolerance: float = 2.0,
+        name: str = "",
+    ) -> None:
+        self.min_limit = max(1, min_limit)
+        self.max_limit = max(self.min_limit, max_limit)
+        self.limit = float(min(self.max_limit, max(self.min_limit, initial)))
+        self.increase = increase
+        self.decrease = decrease
+        self.latency_tolerance = latency_tolerance
+        self.name = name
+        self.inflight = 0
+        # Uncongested latency per request kind ("single call" vs "batch" differ a lot).
+        self._baseline: dict[str, float] = {}
+        self._last_decrease = 0.0
+        self._cond = asyncio.Condition()
+        CONCURRENCY_LIMIT.set(self.limit, endpoint=name)
+
+    async def acquire(self) -> None:
+        async with self._cond:
+            await self._cond.wait_for(lambda: self.inflight < int(self.limit))
+            self.inflight += 1
+        INFLIGHT.set(self.inflight, endpoint=self.name)
+
+    async def release(self, latency: float, congested: bool = False, kind: str = "call") -> None:
+        async with self._cond:
+            saturated = self.inflight >= int(self.limit)
+            self.inflight -= 1
+            if congested or self._inflated(kind, latency):
+                self._on_congestion(latency)
+            elif saturated:
+                self.limit = min(self.max_limit, self.limit + self.increase / self.limit)
+            CONCURRENCY_LIMIT.set(self.limit, endpoint=self.name)
+            self._cond.notify_all()
+        INFLIGHT.set(self.inflight, endpoint=self.name)
+
+    def _inflated(self, kind: str, latency: float) -> bool:
+        base = self._baseline.get(kind)
+        if base is None or latency < base:
+            self._baseline[kind] = latency
+            return False
+        # Let the baseline drift up slowly so a permanently slower node is re-learned.
+        self._baseline[kind] = 0.99 * base + 0.01 * latency
+        # Absolute floor keeps sub-millisecond jitter on local nodes from reading as congestion.
+        return latency > base * self.latency_tolerance and latency - base > 0.05
+
+    def _on_congestion(self, latency: float) -> None:
+        now = time.monotonic()
+        # One cut per round trip: a burst of failures from the same window is one signal.
+        if now - self._last_decrease < latency:
+            return
+        self._last_decrease = now
+        prev = self.limit
+        self.limit = max(float(self.min_limit), self.limit * self.decrease)
+        log.debug("RPC concurrency cut endpoint=%s limit=%.1f->%.1f", self.name, prev, self.limit)
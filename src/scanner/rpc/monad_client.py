@@ -1,11 +1,17 @@
 from __future__ import annotations
 
+import asyncio
 import logging
+from collections import deque
+from collections.abc import Callable, Sequence
 from datetime import datetime, timezone
 from typing import Any
 
+from scanner.rpc.cache import RpcCache
+from scanner.rpc.errors import RpcError, RpcTransportError
 from scanner.rpc.jsonrpc import JsonRpcClient
-from scanner.rpc.types import BlockRef
+from scanner.rpc.pool import RpcPool
+from scanner.rpc.types import BlockRef, Receipt, TxHashes
 
 log = logging.getLogger("scanner.rpc.monad")
 
@@ -16,20 +22,106 @@ class MonadClient:
     you can adapt them to a Monad-compatible RPC surface without touching analyzers.
     """
 
-    def __init__(self, rpc: JsonRpcClient) -> None:
+    def __init__(
+        self,
+        rpc: JsonRpcClient | RpcPool,
+        receipt_batch_size: int = 100,
+        cache: RpcCache | None = None,
+        confirmations: int = 0,
+        receipt_window: int = 8,
+        block_receipts_max_txs: int = 2000,
+        keep_raw: bool = False,
+    ) -> None:
         self.rpc = rpc
+        self.receipt_batch_size = max(1, receipt_batch_size)
+        # Streaming: at most receipt_window chunks of receipts are held at once. Blocks larger
+        # than block_receipts_max_txs skip eth_getBlockReceipts (one unbounded response).
+        self.receipt_window = max(1, receipt_window)
+        self.block_receipts_max_txs = block_receipts_max_txs
+        self.cache = cache
+        # Lossless mode: BlockRef.raw carries the full block dict (for raw block storage).
+        self.keep_raw = keep_raw
+        self.confirmations = max(0, confirmations)
+        # Last observed chain head; decides which cached blocks are final enough to trust.
+        self.head: int | None = None
+        # method name -> supported; filled by probe_capabilities()
+        self.capabilities: dict[str, bool] | None = None
+
+    async def aclose(self) -> None:
+        await self.rpc.aclose()
+        if self.cache is not None:
+            log.info("RPC cache stats %s", self.cache.stats())
+            self.cache.close()
+
+    async def probe_capabilities(self) -> dict[str, bool] | None:
+        # One cheap call against genesis. Only a node answering "no such method" lacks it; any
+        # other answer means it knows the method. A transport failure (timeout, 429/5xx, open
+        # breaker) decides nothing: capabilities stay unknown and the next block probes again.
+        try:
+            await self.rpc.call("eth_getBlockReceipts", [hex(0)], max_retries=0)
+            supported = True
+        except RpcError as e:
+            supported = not e.unsupported
+            if not supported:
+                log.info("eth_getBlockReceipts unavailable, using per-tx receipts err=%s", e)
+        except RpcTransportError as e:
+            log.warning("Capability probe failed, probing again later err=%s", e)
+            return None
+        self.capabilities = {"eth_getBlockReceipts": supported}
+        return self.capabilities
+
+    async def receipts_strategy(self) -> str:
+        if self.capabilities is None:
+            await self.probe_capabilities()
+        if self.capabilities and self.capabilities.get("eth_getBlockReceipts"):
+            return "block_receipts"
+        return "batch" if self.rpc.batch_supported else "single"
 
     async def get_latest_block_number(self) -> int:
         # Common EVM-style: eth_blockNumber
         n_hex = await self.rpc.call("eth_blockNumber")
-        return int(n_hex, 16)
+        self.head = int(n_hex, 16)
+        return self.head
+
+    def _is_final(self, number: int) -> bool:
+        return self.head is not None and number <= self.head - self.confirmations
 
     async def get_block_by_number(self, number: int) -> BlockRef:
+        if self.cache is not None and self._is_final(number):
+            block_hash = await self.cache.get(f"num:{number}")
+            cached = await self.cache.get(f"block:{block_hash}") if block_hash else None
+            if cached:
+                return self._block_ref(cached)
+
         # Common EVM-style: eth_getBlockByNumber
         block: dict[str, Any] = await self.rpc.call("eth_getBlockByNumber", [hex(number), False])
         if not block:
             raise RuntimeError(f"Block not found: {number}")
 
+        ref = self._block_ref(block)
+        if self.cache is not None:
+            await self._check_reorg(ref)
+            await self.cache.put_many(
+                [(f"block:{ref.hash}", block), (f"num:{ref.number}", ref.hash)], ref.number
+            )
+        return ref
+
+    async def _check_reorg(self, ref: BlockRef) -> None:
+        assert self.cache is not None
+        parent = await self.cache.get(f"num:{ref.number - 1}", record=False)
+        if parent is None or not ref.parent_hash or parent == ref.parent_hash:
+            return
+        # The cached parent is on a dead fork; everything not yet final may be too.
+        fork_from = max(0, ref.number - 1 - self.confirmations)
+        log.warning(
+            "Reorg detected block=%s parent=%s cached_parent=%s",
+            ref.number,
+            ref.parent_hash,
+            parent,
+        )
+        await self.cache.invalidate_from(fork_from)
+
+    def _block_ref(self, block: dict[str, Any]) -> BlockRef:
         ts = None
         if "timestamp" in block and block["timestamp"] is not None:
             try:
@@ -46,8 +138,8 @@ class MonadClient:
             hash=block.get("hash", ""),
             parent_hash=block.get("parentHash"),
             timestamp=ts,
-            tx_hashes=tx_hashes,
-            raw=block,
+            tx_hashes=TxHashes.pack(tx_hashes),
+            raw=block if self.keep_raw else None,
         )
 
     async def get_receipt(self, tx_hash: str) -> dict[str, Any] | None:
@@ -59,3 +151,147 @@ class MonadClient:
             # Receipts may be temporarily unavailable depending on node configuration.
             log.debug("Receipt unavailable tx=%s err=%s", tx_hash, e)
             return None
+
+    async def get_receipts(self, tx_hashes: list[str]) -> dict[str, dict[str, Any] | None]:
+        # Batched eth_getTransactionReceipt, batches in flight concurrently; the RPC
+        # client's concurrency limiter decides how many actually hit the node at once.
+        step = self.receipt_batch_size
+        chunks = [tx_hashes[i : i + step] for i in range(0, len(tx_hashes), step)]
+        batches = await asyncio.gather(
+            *(
+                self.rpc.call_batch(
+                    [("eth_getTransactionReceipt", [h]) for h in chunk], return_exceptions=True
+                )
+                for chunk in chunks
+            )
+        )
+
+        out: dict[str, dict[str, Any] | None] = {}
+        for chunk, results in zip(chunks, batches, strict=True):
+            for h, r in zip(chunk, results, strict=True):
+                if isinstance(r, Exception):
+                    log.debug("Receipt unavailable tx=%s err=%s", h, r)
+                    r = None
+                out[h] = r
+        return out
+
+    async def get_block_receipts(self, number: int) -> list[dict[str, Any]] | None:
+        # eth_getBlockReceipts: every receipt of the block in a single call.
+        try:
+            return await self.rpc.call("eth_getBlockReceipts", [hex(number)])
+        except Exception as e:
+            log.warning("Block receipts unavailable block=%s err=%s", number, e)
+            return None
+
+    async def fetch_block_receipts(
+        self, number: int, tx_hashes: list[str]
+    ) -> tuple[dict[str, dict[str, Any] | None], str]:
+        """
+        Fetches receipts for `tx_hashes` using the best strategy the node supports.
+        Returns (tx_hash -> receipt, strategy) where strategy is one of
+        "cache", "block_receipts", "batch" or "single".
+        """
+        cached: dict[str, dict[str, Any]] = {}
+        if self.cache is not None:
+            cached = await self._cached_receipts(tx_hashes)
+            if len(cached) == len(tx_hashes):
+                return {h: cached[h] for h in tx_hashes}, "cache"
+        missing = [h for h in tx_hashes if h not in cached]
+
+        strategy = await self.receipts_strategy()
+        fetched: dict[str, dict[str, Any] | None] | None = None
+        if strategy == "block_receipts":
+            rows = await self.get_block_receipts(number)
+            if rows is not None:
+                by_hash = {r.get("transactionHash"): r for r in rows if isinstance(r, dict)}
+                fetched = {h: by_hash.get(h) for h in missing}
+            else:
+                strategy = "batch" if self.rpc.batch_supported else "single"
+
+        if fetched is None:
+            fetched = await self.get_receipts(missing)
+            # The batch path may discover mid-flight that the node rejects batches.
+            if strategy == "batch" and not self.rpc.batch_supported:
+                strategy = "single"
+
+        if self.cache is not None:
+            await self._cache_receipts(number, fetched)
+        return {h: cached[h] if h in cached else fetched.get(h) for h in tx_hashes}, strategy
+
+    async def stream_block_receipts(
+        self,
+        number: int,
+        tx_hashes: Sequence[str],
+        on_chunk: Callable[[list[Receipt | None]], None],
+    ) -> tuple[str, int]:
+        """
+        Fetches receipts for every tx in `tx_hashes` and hands them to `on_chunk` in tx order,
+        one chunk at a time, decoded to compact `Receipt`s as each batch arrives.
+        Returns (strategy, peak number of receipts held at once).
+        """
+        step = self.receipt_batch_size
+        chunks = [tx_hashes[i : i + step] for i in range(0, len(tx_hashes), step)]
+        strategy = await self.receipts_strategy()
+        seen: dict[str, str] = {}
+
+        if strategy == "block_receipts" and len(tx_hashes) <= self.block_receipts_max_txs:
+            receipts, strategy = await self.fetch_block_receipts(number, list(tx_hashes))
+            for chunk in chunks:
+                on_chunk([_decode(receipts.get(h), seen) for h in chunk])
+            return strategy, len(receipts)
+
+        # Chunked batches, a bounded window in flight, consumed strictly in order.
+        pending: deque[asyncio.Task] = deque()
+        held = peak = 0
+        from_cache = True
+        try:
+            for chunk in chunks:
+                pending.append(asyncio.create_task(self._chunk_receipts(number, chunk, seen)))
+                held += len(chunk)
+                peak = max(peak, held)
+                if len(pending) >= self.receipt_window:
+                    receipts, cached = await pending.popleft()
+                    from_cache = from_cache and cached
+                    held -= len(receipts)
+                    on_chunk(receipts)
+            while pending:
+                receipts, cached = await pending.popleft()
+                from_cache = from_cache and cached
+                held -= len(receipts)
+                on_chunk(receipts)
+        finally:
+            for t in pending:
+                t.cancel()
+
+        if from_cache:
+            return "cache", peak
+        return ("batch" if self.rpc.batch_supported else "single"), peak
+
+    async def _cached_receipts(self, tx_hashes: Sequence[str]) -> dict[str, dict[str, Any]]:
+        assert self.cache is not None
+        found = await self.cache.get_many([f"receipt:{h}" for h in tx_hashes])
+        return {k[len("receipt:") :]: r for k, r in found.items()}
+
+    async def _cache_receipts(self, number: int, fetched: dict[str, dict[str, Any] | None]) -> None:
+        assert self.cache is not None
+        rows = [(f"receipt:{h}", r) for h, r in fetched.items() if r is not None]
+        await self.cache.put_many(rows, number)
+
+    async def _chunk_receipts(
+        self, number: int, chunk: list[str], seen: dict[str, str]
+    ) -> tuple[list[Receipt | None], bool]:
+        cached: dict[str, dict[str, Any]] = {}
+        if self.cache is not None:
+            cached = await self._cached_receipts(chunk)
+        missing = [h for h in chunk if h not in cached]
+        if not missing:
+            return [_decode(cached[h], seen) for h in chunk], True
+
+        fetched = await self.get_receipts(missing)
+        if self.cache is not None:
+            await self._cache_receipts(number, fetched)
+        return [_decode(cached.get(h) or fetched.get(h), seen) for h in chunk], False
+
+
+def _decode(r: dict[str, Any] | None, seen: dict[str, str]) -> Receipt | None:
+    return Receipt.from_rpc(r, seen) if r else None
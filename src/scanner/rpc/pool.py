@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import math
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable
+from typing import Any, TypeVar
+
+from scanner.rpc.errors import RpcError, RpcTransportError
+from scanner.rpc.jsonrpc import JsonRpcClient
+
+log = logging.getLogger("scanner.rpc.pool")
+
+T = TypeVar("T")
+
+
+class Endpoint:
+    """One pooled node with a rolling health score (lower is better)."""
+
+    def __init__(self, client: JsonRpcClient, window: int = 256, alpha: float = 0.2) -> None:
+        self.client = client
+        self.url = client.url
+        self.alpha = alpha
+        self.latency_ewma: float | None = None
+        self.error_rate = 0.0
+        self._latencies: deque[float] = deque(maxlen=window)
+
+    def observe(self, latency: float, ok: bool) -> None:
+        a = self.alpha
+        if ok:
+            self._latencies.append(latency)
+            prev = self.latency_ewma
+            self.latency_ewma = latency if prev is None else (1 - a) * prev + a * latency
+        self.error_rate = (1 - a) * self.error_rate + a * (0.0 if ok else 1.0)
+
+    def p95(self) -> float | None:
+        if len(self._latencies) < 20:
+            return None
+        xs = sorted(self._latencies)
+        return xs[min(len(xs) - 1, int(0.95 * len(xs)))]
+
+    def score(self) -> float:
+        if self.client.breaker.state == "open":
+            return math.inf
+        # Unmeasured endpoints score 0 so they get explored.
+        lat = self.latency_ewma or 0.0
+        return lat * (1.0 + 10.0 * self.error_rate) + self.error_rate
+
+
+class RpcPool:
+    """
+    Drop-in replacement for JsonRpcClient over several endpoints.
+    Calls go to the best-scoring endpoint and fail over on transport errors; with hedging on,
+    a call still pending after the primary's p95 latency is duplicated to the runner-up and
+    whichever answers first wins.
+    """
+
+    def __init__(
+        self,
+        clients: list[JsonRpcClient],
+        hedge: bool = False,
+        hedge_min_delay: float = 0.05,
+        hedge_max_delay: float = 2.0,
+    ) -> None:
+        if not clients:
+            raise ValueError("RpcPool needs at least one endpoint")
+        self.endpoints = [Endpoint(c) for c in clients]
+        self.hedge = hedge and len(clients) > 1
+        self.hedge_min_delay = hedge_min_delay
+        self.hedge_max_delay = hedge_max_delay
+        self.url = clients[0].url
+        self.hedges_sent = 0
+
+    @property
+    def batch_supported(self) -> bool:
+        return any(ep.client.batch_supported for ep in self.endpoints)
+
+    @property
+    def max_retries(self) -> int:
+        return self.endpoints[0].client.max_retries
+
+    def ranked(self) -> list[Endpoint]:
+        return sorted(self.endpoints, key=lambda ep: ep.score())
+
+    async def aclose(self) -> None:
+        for ep in self.endpoints:
+            await ep.client.aclose()
+
+    async def call(
+        self, method: str, params: list[Any] | None = None, max_retries: int | None = None
+    ) -> Any:
+        return await self._route(lambda c: c.call(method, params, max_retries=max_retries))
+
+    async def call_batch(
+        self,
+        calls: list[tuple[str, list[Any] | None]],
+        return_exceptions: bool = False,
+    ) -> list[Any]:
+        async def run(c: JsonRpcClient) -> list[Any]:
+            out = await c.call_batch(calls, return_exceptions=True)
+            # A batch where every entry died in transport counts as an endpoint failure.
+            if out and all(isinstance(x, RpcTransportError) for x in out):
+                raise out[0]
+            return out
+
+        results = await self._route(run)
+        if not return_exceptions:
+            for r in results:
+                if isinstance(r, Exception):
+                    raise r
+        return results
+
+    async def _route(self, fn: Callable[[JsonRpcClient], Awaitable[T]]) -> T:
+        last_err: Exception | None = None
+        ranked = self.ranked()
+        for i, ep in enumerate(ranked):
+            backup = ranked[i + 1] if self.hedge and i + 1 < len(ranked) else None
+            try:
+                if backup is not None:
+                    return await self._hedged(fn, ep, backup)
+                return await self._attempt(ep, fn)
+            except RpcError:
+                raise  # the node answered; another node would say the same
+            except RpcTransportError as e:
+                last_err = e
+                log.warning("RPC endpoint failed, failing over url=%s err=%s", ep.url, e)
+        assert last_err is not None
+        raise last_err
+
+    async def _attempt(self, ep: Endpoint, fn: Callable[[JsonRpcClient], Awaitable[T]]) -> T:
+        t0 = time.perf_counter()
+        try:
+            out = await fn(ep.client)
+        except (RpcError, asyncio.CancelledError):
+            # A hedge loser still tells us the endpoint was at least this slow.
+            ep.observe(time.perf_counter() - t0, ok=True)
+            raise
+        except Exception:
+            ep.observe(time.perf_counter() - t0, ok=False)
+            raise
+        ep.observe(time.perf_counter() - t0, ok=True)
+        return out
+
+    async def _hedged(
+        self, fn: Callable[[JsonRpcClient], Awaitable[T]], primary: Endpoint, backup: Endpoint
+    ) -> T:
+        p95 = primary.p95()
+        delay = self.hedge_max_delay if p95 is None else p95
+        delay = max(self.hedge_min_delay, min(self.hedge_max_delay, delay))
+
+        first = asyncio.ensure_future(self._attempt(primary, fn))
+        second: asyncio.Future[T] | None = None
+        try:
+            done, _ = await asyncio.wait({first}, timeout=delay)
+            if done:
+                return first.result()
+
+            self.hedges_sent += 1
+            second = asyncio.ensure_future(self._attempt(backup, fn))
+            pending: set[asyncio.Future[T]] = {first, second}
+            err: BaseException | None = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for t in done:
+                    if t.exception() is None:
+                        return t.result()
+                    # Prefer surfacing an RpcError: it is the node's real answer.
+                    if err is None or isinstance(t.exception(), RpcError):
+                        err = t.exception()
+            assert err is not None
+            raise err
+        finally:
+            for t in (first, second):
+                if t is not None and not t.done():
+                    t.cancel()
@@ -0,0 +1,280 @@
+from __future__ import annotations
+
+import logging
+import os
+import struct
+import zlib
+from collections import OrderedDict, deque
+from typing import Any
+
+import orjson
+
+from scanner.rpc.errors import RpcError
+
+log = logging.getLogger("scanner.rpc.recording")
+
+# Recording file layout (append-only):
+#   MAGIC, then frames of  >qI header (block, payload length) + zlib(orjson(records))
+#   where records = [[key, result, error], ...] and error = [code, message, data] | null.
+# Frames are grouped by block (-1 for calls not tied to one block) so replay can load a block's
+# calls on demand. `<path>.idx` lists "block offset length" per frame and is rebuilt from the
+# frame headers if missing or behind.
+MAGIC = b"SCANREC1"
+_FRAME = struct.Struct(">qI")
+GLOBAL = -1
+
+
+def call_key(method: str, params: list[Any] | None) -> str:
+    return orjson.dumps([method, params or []], option=orjson.OPT_SORT_KEYS).decode()
+
+
+def _hex_block(v: Any) -> int:
+    if isinstance(v, str) and v.startswith("0x"):
+        try:
+            return int(v, 16)
+        except ValueError:
+            pass
+    return GLOBAL
+
+
+def block_of(method: str, params: list[Any] | None, result: Any = None) -> int:
+    """Which block a call belongs to, from its params or (receipts) its result."""
+    if method in ("eth_getBlockByNumber", "eth_getBlockReceipts") and params:
+        return _hex_block(params[0])
+    if method == "eth_getTransactionReceipt" and isinstance(result, dict):
+        return _hex_block(result.get("blockNumber"))
+    return GLOBAL
+
+
+class RecordWriter:
+    def __init__(self, path: str, flush_records: int = 2000, level: int = 6) -> None:
+        self.path = path
+        self.index_path = path + ".idx"
+        self.flush_records = max(1, flush_records)
+        self.level = level
+        self.records = 0
+        self._buffered = 0
+        self._pending: dict[int, list[list[Any]]] = {}
+        new = not os.path.exists(path) or os.path.getsize(path) == 0
+        self._f = open(path, "ab")
+        self._idx = open(self.index_path, "a")
+        if new:
+            self._f.write(MAGIC)
+
+    def add(self, block: int, key: str, result: Any, error: RpcError | None = None) -> None:
+        err = [error.code, error.message, error.data] if error is not None else None
+        self._pending.setdefault(block, []).append([key, result, err])
+        self.records += 1
+        self._buffered += 1
+        if self._buffered >= self.flush_records:
+            self.flush()
+
+    def flush(self) -> None:
+        for block, recs in sorted(self._pending.items()):
+            payload = zlib.compress(orjson.dumps(recs), self.level)
+            offset = self._f.tell()
+            self._f.write(_FRAME.pack(block, len(payload)))
+            self._f.write(payload)
+            self._idx.write(f"{block} {offset} {len(payload)}\n")
+        self._pending.clear()
+        self._buffered = 0
+        # Data before index, so an index entry never points past the end of the file.
+        self._f.flush()
+        self._idx.flush()
+
+    def close(self) -> None:
+        if self._f.closed:
+            return
+        self.flush()
+        self._f.close()
+        self._idx.close()
+
+
+class RecordReader:
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._f = open(path, "rb")
+        if self._f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"Not an RPC recording: {path}")
+        self.frames: dict[int, list[tuple[int, int]]] = {}
+        self._load_index()
+
+    def _load_index(self) -> None:
+        end = os.fstat(self._f.fileno()).st_size
+        pos = len(MAGIC)
+        try:
+            with open(self.path + ".idx") as idx:
+                for line in idx:
+                    block, offset, length = (int(x) for x in line.split())
+                    if offset + _FRAME.size + length > end:
+                        break  # torn tail from an interrupted recording
+                    self.frames.setdefault(block, []).append((offset, length))
+                    pos = max(pos, offset + _FRAME.size + length)
+        except FileNotFoundError:
+            pass
+        # Frames written after the last index line (or without any index): scan headers.
+        while pos + _FRAME.size <= end:
+            self._f.seek(pos)
+            block, length = _FRAME.unpack(self._f.read(_FRAME.size))
+            if pos + _FRAME.size + length > end:
+                break
+            self.frames.setdefault(block, []).append((pos, length))
+            pos += _FRAME.size + length
+
+    def blocks(self) -> list[int]:
+        return sorted(b for b in self.frames if b != GLOBAL)
+
+    def load(self, block: int) -> dict[str, tuple[Any, list[Any] | None]]:
+        out: dict[str, tuple[Any, list[Any] | None]] = {}
+        for offset, length in self.frames.get(block, ()):
+            self._f.seek(offset + _FRAME.size)
+            for key, result, err in orjson.loads(zlib.decompress(self._f.read(length))):
+                out[key] = (result, err)  # a later recording of the same call wins
+        return out
+
+    def close(self) -> None:
+        self._f.close()
+
+
+class RecordingRpc:
+    """
+    Drop-in wrapper around JsonRpcClient/RpcPool that appends every call and its answer
+    (result or JSON-RPC error) to a recording. Transport failures are not recorded: they are
+    retried or surface before the node has answered anything.
+    """
+
+    def __init__(
+        self, inner: Any, path: str, flush_records: int = 2000, track_blocks: int = 256
+    ) -> None:
+        self.inner = inner
+        self.url = getattr(inner, "url", path)
+        self.writer = RecordWriter(path, flush_records=flush_records)
+        # tx hash -> block for recently recorded blocks, to file receipts that lack
+        # blockNumber (or came back null) under their block.
+        self._tx_block: dict[str, int] = {}
+        self._recent: deque[tuple[int, list[str]]] = deque()
+        self._track_blocks = max(1, track_blocks)
+
+    @property
+    def batch_supported(self) -> bool:
+        return self.inner.batch_supported
+
+    def _record(self, method: str, params: list[Any] | None, result: Any) -> None:
+        if isinstance(result, Exception) and not isinstance(result, RpcError):
+            return
+        block = block_of(method, params, None if isinstance(result, RpcError) else result)
+        if block == GLOBAL and method == "eth_getTransactionReceipt" and params:
+            block = self._tx_block.get(params[0], GLOBAL)
+        elif method == "eth_getBlockByNumber" and isinstance(result, dict):
+            self._track(block, result.get("transactions") or [])
+        key = call_key(method, params)
+        if isinstance(result, RpcError):
+            self.writer.add(block, key, None, result)
+        else:
+            self.writer.add(block, key, result)
+
+    def _track(self, block: int, txs: list[Any]) -> None:
+        hashes = [t if isinstance(t, str) else t.get("hash") for t in txs]
+        self._recent.append((block, hashes))
+        for h in hashes:
+            self._tx_block[h] = block
+        while len(self._recent) > self._track_blocks:
+            old, gone = self._recent.popleft()
+            for h in gone:
+                if self._tx_block.get(h) == old:
+                    del self._tx_block[h]
+
+    async def call(
+        self, method: str, params: list[Any] | None = None, max_retries: int | None = None
+    ) -> Any:
+        try:
+            result = await self.inner.call(method, params, max_retries=max_retries)
+        except RpcError as e:
+            self._record(method, params, e)
+            raise
+        self._record(method, params, result)
+        return result
+
+    async def call_batch(
+        self, calls: list[tuple[str, list[Any] | None]], return_exceptions: bool = False
+    ) -> list[Any]:
+        results = await self.inner.call_batch(calls, return_exceptions=True)
+        for (method, params), res in zip(calls, results, strict=True):
+            self._record(method, params, res)
+        if not return_exceptions:
+            for res in results:
+                if isinstance(res, Exception):
+                    raise res
+        return results
+
+    async def aclose(self) -> None:
+        self.writer.close()
+        log.info("RPC recording closed path=%s records=%s", self.writer.path, self.writer.records)
+        await self.inner.aclose()
+
+
+class ReplayRpc:
+    """
+    Serves calls from a recording with no network, answering exactly what the node answered.
+    A block's calls are loaded when the block is first requested and the oldest loaded
+    blocks are dropped past `max_blocks`. Calls that were never recorded raise RpcError.
+    """
+
+    def __init__(self, path: str, max_blocks: int = 256) -> None:
+        self.url = f"replay:{path}"
+        self.reader = RecordReader(path)
+        self.max_blocks = max(1, max_blocks)
+        self.batch_supported = True
+        self.misses = 0
+        self._records = self.reader.load(GLOBAL)
+        self._global = set(self._records)
+        self._loaded: OrderedDict[int, list[str]] = OrderedDict()
+
+    def _ensure(self, block: int) -> None:
+        if block == GLOBAL or block in self._loaded:
+            return
+        recs = self.reader.load(block)
+        self._records.update(recs)
+        self._loaded[block] = list(recs)
+        while len(self._loaded) > self.max_blocks:
+            _, keys = self._loaded.popitem(last=False)
+            for k in keys:
+                if k not in self._global:
+                    self._records.pop(k, None)
+
+    def has_block(self, number: int) -> bool:
+        """True if the recording holds the block itself (not just calls naming it)."""
+        self._ensure(number)
+        return call_key("eth_getBlockByNumber", [hex(number), False]) in self._records
+
+    def _answer(self, method: str, params: list[Any] | None) -> Any:
+        self._ensure(block_of(method, params))
+        entry = self._records.get(call_key(method, params))
+        if entry is None:
+            self.misses += 1
+            raise RpcError(None, f"not in recording: {method} {params}")
+        result, err = entry
+        if err is not None:
+            raise RpcError(err[0], err[1], err[2])
+        return result
+
+    async def call(
+        self, method: str, params: list[Any] | None = None, max_retries: int | None = None
+    ) -> Any:
+        return self._answer(method, params)
+
+    async def call_batch(
+        self, calls: list[tuple[str, list[Any] | None]], return_exceptions: bool = False
+    ) -> list[Any]:
+        out: list[Any] = []
+        for method, params in calls:
+            try:
+                out.append(self._answer(method, params))
+            except RpcError as e:
+                if not return_exceptions:
+                    raise
+                out.append(e)
+        return out
+
+    async def aclose(self) -> None:
+        self.reader.close()
@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import logging
+import time
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from email.utils import parsedate_to_datetime
+
+from scanner.rpc.errors import CircuitOpenError
+from scanner.utils.backoff import backoff_delay
+
+log = logging.getLogger("scanner.rpc.retry")
+
+
+@dataclass
+class RetryPolicy:
+    max_retries: int = 5
+    base: float = 0.2
+    factor: float = 1.8
+    max_sleep: float = 5.0
+    # Upper bound on how long we honor a server-supplied Retry-After.
+    max_retry_after: float = 60.0
+    # Per-method overrides, e.g. {"eth_blockNumber": 1, "eth_getBlockReceipts": 3}.
+    method_retries: dict[str, int] = field(default_factory=dict)
+
+    def retries_for(self, method: str) -> int:
+        return self.method_retries.get(method, self.max_retries)
+
+    def delay(self, attempt: int, retry_after: float | None = None) -> float:
+        if retry_after is not None:
+            return max(0.0, min(self.max_retry_after, retry_after))
+        return backoff_delay(self.base, self.factor, attempt, self.max_sleep)
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    # Retry-After is either delta-seconds or an HTTP-date.
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=UTC)
+    return max(0.0, (when - datetime.now(UTC)).total_seconds())
+
+
+class CircuitBreaker:
+    """
+    Classic closed -> open -> half-open breaker. After `failure_threshold` consecutive
+    transport failures the circuit opens and calls fail fast for `reset_timeout` seconds;
+    then a single trial call is let through and its outcome closes or re-opens the circuit.
+    """
+
+    def __init__(
+        self, failure_threshold: int = 5, reset_timeout: float = 30.0, name: str = ""
+    ) -> None:
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_timeout = reset_timeout
+        self.name = name
+        self.state = "closed"
+        self.failures = 0
+        self._opened_at = 0.0
+        self._trial_inflight = False
+
+    def check(self) -> None:
+        if self.state == "closed":
+            return
+        if self.state == "open":
+            if time.monotonic() - self._opened_at < self.reset_timeout:
+                raise CircuitOpenError(f"circuit open endpoint={self.name}")
+            self.state = "half_open"
+            self._trial_inflight = False
+        # half-open: exactly one trial request at a time
+        if self._trial_inflight:
+            raise CircuitOpenError(f"circuit half-open, trial in flight endpoint={self.name}")
+        self._trial_inflight = True
+
+    def record_success(self) -> None:
+        if self.state != "closed":
+            log.info("circuit closed endpoint=%s", self.name)
+        self.state = "closed"
+        self.failures = 0
+        self._trial_inflight = False
+
+    def release_trial(self) -> None:
+        """The trial ended without a verdict (e.g. cancelled); let the next call try instead."""
+        self._trial_inflight = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        self._trial_inflight = False
+        if self.state == "half_open" or self.failures >= self.failure_threshold:
+            if self.state != "open":
+                log.warning("circuit opened endpoint=%s failures=%s", self.name, self.failures)
+            self.state = "open"
+            self._opened_at = time.monotonic()
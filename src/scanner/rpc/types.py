@@ -1,15 +1,165 @@
 from __future__ import annotations
 
+import sys
+from collections.abc import Iterator, Sequence
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Any
+from typing import Any, overload
 
+_intern = sys.intern
 
-@dataclass(frozen=True)
+
+class TxHashes(Sequence[str]):
+    """
+    A block's tx hashes packed into one bytes object (32 bytes per hash) instead of a list
+    of 66-char strings; items are decoded back to "0x..." lowercase hex on access.
+    """
+
+    __slots__ = ("_packed",)
+
+    def __init__(self, packed: bytes) -> None:
+        self._packed = packed
+
+    @classmethod
+    def pack(cls, hashes: list[str]) -> TxHashes | list[str]:
+        # Anything that would not round-trip exactly (odd lengths, uppercase) stays a list.
+        hexed = "".join(h[2:] for h in hashes)
+        if len(hexed) != 64 * len(hashes) or not all(h[:2] == "0x" for h in hashes):
+            return hashes
+        try:
+            packed = bytes.fromhex(hexed)
+        except ValueError:
+            return hashes
+        if packed.hex() != hexed:
+            return hashes
+        return cls(packed)
+
+    def __len__(self) -> int:
+        return len(self._packed) // 32
+
+    @overload
+    def __getitem__(self, i: int) -> str: ...
+    @overload
+    def __getitem__(self, i: slice) -> list[str]: ...
+    def __getitem__(self, i: int | slice) -> str | list[str]:
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError("tx index out of range")
+        return "0x" + self._packed[32 * i : 32 * i + 32].hex()
+
+    def __iter__(self) -> Iterator[str]:
+        hexed = self._packed.hex()
+        return ("0x" + hexed[i : i + 64] for i in range(0, len(hexed), 64))
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, TxHashes):
+            return self._packed == other._packed
+        if isinstance(other, Sequence) and not isinstance(other, str):
+            if len(self) != len(other):
+                return False
+            return all(a == b for a, b in zip(self, other, strict=True))
+        return NotImplemented
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return f"TxHashes(<{len(self)} txs>)"
+
+
+@dataclass(frozen=True, slots=True)
 class BlockRef:
+    """
+    What the pipeline keeps of a block: the `blocks` table columns plus tx hashes.
+    `raw` is the full RPC block dict only when raw storage is enabled (lossless mode).
+    """
+
     number: int
     hash: str
     parent_hash: str | None
     timestamp: datetime | None
-    tx_hashes: list[str]
-    raw: dict[str, Any]
+    tx_hashes: Sequence[str]
+    raw: dict[str, Any] | None = None
+
+
+def quantity(raw: Any) -> int:
+    if isinstance(raw, str):
+        try:
+            return int(raw, 16)
+        except ValueError:
+            return 0
+    return raw if isinstance(raw, int) else 0
+
+
+def receipt_status(raw: Any) -> bool | None:
+    # EVM convention: "0x1" success, "0x0" fail (some nodes return ints).
+    if isinstance(raw, str):
+        try:
+            return int(raw, 16) != 0
+        except ValueError:
+            return None
+    if isinstance(raw, int):
+        return raw != 0
+    return None
+
+
+class Receipt:
+    """
+    The receipt fields the analyzers read, decoded once: lowercased `to`, boolean status,
+    gasUsed as int and topics[0] of each log (None for a log without topics). Logs data,
+    blooms and the rest of the RPC dict are dropped.
+    """
+
+    __slots__ = ("to", "status", "gas_used", "first_topics")
+
+    def __init__(
+        self,
+        to: str | None,
+        status: bool | None,
+        gas_used: int,
+        first_topics: tuple[str | None, ...],
+    ) -> None:
+        self.to = to
+        self.status = status
+        self.gas_used = gas_used
+        self.first_topics = first_topics
+
+    @classmethod
+    def from_rpc(cls, r: dict[str, Any], seen: dict[str, str] | None = None) -> Receipt:
+        """
+        `seen` maps raw strings to their interned lowercase form; share one per block so
+        repeated targets and topics are lowercased once and stored once.
+        """
+        if seen is None:
+            seen = {}
+        to = r.get("to")
+        if to:
+            norm = seen.get(to)
+            if norm is None:
+                norm = seen[to] = _intern(to.lower())
+            to = norm
+
+        firsts: list[str | None] = []
+        logs = r.get("logs")
+        if isinstance(logs, list):
+            for lg in logs:
+                topics = lg.get("topics") if isinstance(lg, dict) else None
+                if topics:
+                    t0 = topics[0]
+                    norm = seen.get(t0)
+                    if norm is None:
+                        norm = seen[t0] = _intern(t0.lower())
+                    firsts.append(norm)
+                else:
+                    firsts.append(None)
+        return cls(
+            to or None,
+            receipt_status(r.get("status")),
+            quantity(r.get("gasUsed")),
+            tuple(firsts),
+        )
+
+    def __repr__(self) -> str:
+        return f"Receipt(to={self.to!r}, status={self.status!r}, logs={len(self.first_topics)})"
@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import logging
+from collections.abc import Callable
+
+import orjson
+from websockets.asyncio.client import connect
+from websockets.exceptions import WebSocketException
+
+from scanner.utils.backoff import jitter_sleep
+
+log = logging.getLogger("scanner.rpc.ws")
+
+
+class SubscriptionUnavailable(RuntimeError):
+    """The node answered eth_subscribe with an error: push mode is not possible."""
+
+
+class NewHeadsSubscriber:
+    """
+    Streams block numbers from an `eth_subscribe("newHeads")` WebSocket subscription.
+    Reconnects with backoff and re-subscribes after a drop. Blocks produced while
+    disconnected are not replayed here: the scanner cursor catches up from its last
+    processed block on the next head, which fills the gap.
+    """
+
+    def __init__(self, url: str, reconnect_base: float = 0.5, reconnect_max: float = 30.0) -> None:
+        self.url = url
+        self.reconnect_base = reconnect_base
+        self.reconnect_max = reconnect_max
+        self.last_number: int | None = None
+
+    async def run(self, on_head: Callable[[int], None]) -> None:
+        attempt = 0
+        while True:
+            try:
+                async with connect(self.url, max_size=None) as ws:
+                    sub_id = await self._subscribe(ws)
+                    log.info(
+                        "newHeads subscribed url=%s sub=%s resume_after=%s",
+                        self.url,
+                        sub_id,
+                        self.last_number,
+                    )
+                    attempt = 0
+                    async for msg in ws:
+                        n = self._head_number(msg, sub_id)
+                        if n is None:
+                            continue
+                        self.last_number = n
+                        on_head(n)
+            except SubscriptionUnavailable:
+                raise
+            except (OSError, WebSocketException, orjson.JSONDecodeError, TimeoutError) as e:
+                log.warning(
+                    "newHeads stream dropped url=%s attempt=%s err=%s", self.url, attempt, e
+                )
+            await jitter_sleep(self.reconnect_base, 2.0, attempt, max_sleep=self.reconnect_max)
+            attempt += 1
+
+    async def _subscribe(self, ws) -> str:
+        req = {"jsonrpc": "2.0", "id": 1, "method": "eth_subscribe", "params": ["newHeads"]}
+        await ws.send(orjson.dumps(req).decode())
+        ack = orjson.loads(await ws.recv())
+        if "error" in ack:
+            raise SubscriptionUnavailable(f"eth_subscribe rejected: {ack['error']}")
+        return str(ack.get("result"))
+
+    @staticmethod
+    def _head_number(msg: str | bytes, sub_id: str) -> int | None:
+        data = orjson.loads(msg)
+        if not isinstance(data, dict) or data.get("method") != "eth_subscription":
+            return None
+        params = data.get("params")
+        if not isinstance(params, dict) or str(params.get("subscription")) != sub_id:
+            return None
+        head = params.get("result")
+        number = head.get("number") if isinstance(head, dict) else None
+        return int(number, 16) if isinstance(number, str) else None
@@ -1,10 +1,10 @@
 from __future__ import annotations
 
 from pathlib import Path
-from typing import Optional
+from typing import Literal, Optional
 
 import yaml
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -13,6 +13,7 @@ class AppCfg(BaseModel):
     host: str = "0.0.0.0"
     port: int = 8080
     log_level: str = "INFO"
+    admin_token: str | None = None  # enables /v1/admin/* with header X-Admin-Token
 
 
 class ChainCfg(BaseModel):
@@ -22,18 +23,62 @@ class ChainCfg(BaseModel):
 
 class RpcCfg(BaseModel):
     url: str
+    urls: list[str] = Field(default_factory=list)  # extra endpoints pooled with `url`
+    ws_url: str | None = None  # enables push mode via eth_subscribe("newHeads")
+    hedge: bool = False
+    hedge_min_delay_seconds: float = 0.05
+    hedge_max_delay_seconds: float = 2.0
     timeout_seconds: float = 10.0
     max_retries: int = 5
+    batch_size: int = 100
+    receipt_window: int = 8  # receipt batches in flight (and held) per block
+    block_receipts_max_txs: int = 2000  # larger blocks stream batches, not eth_getBlockReceipts
+    max_connections: int = 100
+    max_keepalive_connections: int = 20
+    keepalive_expiry_seconds: float = 30.0
+    http2: bool = False  # requires the `http2` extra (h2)
+    method_retries: dict[str, int] = Field(default_factory=dict)  # per-method retry budgets
+    max_retry_after_seconds: float = 60.0
+    breaker_failure_threshold: int = 5
+    breaker_reset_seconds: float = 30.0
+    adaptive_concurrency: bool = True  # AIMD in-flight limit per endpoint
+    concurrency_initial: int = 8
+    concurrency_min: int = 1
+    concurrency_max: int = 64
+    cache_max_bytes: int = 256 * 1024 * 1024  # in-memory block/receipt cache; 0 disables
+    cache_disk_path: str | None = None  # optional SQLite tier that survives restarts
+    replay_path: str | None = None  # serve RPC from a recording (`monad-scanner record`)
 
 
 class DbCfg(BaseModel):
     url: str
+    store_raw_blocks: bool = False  # keep full RPC block JSON in blocks.raw (lossless mode)
+    pool_size: int = 5  # connections kept open per process (ignored for SQLite)
+    max_overflow: int = 10  # extra connections allowed under load
+    pool_timeout_seconds: float = 30.0  # wait for a free connection before failing
 
 
 class ScannerCfg(BaseModel):
     poll_interval_seconds: float = 3.0
     max_blocks_per_tick: int = 5
     backfill_start_block: Optional[int] = None
+    pipelined: bool = True  # staged fetch/analyze/persist; false = one block at a time
+    fetch_concurrency: int = 4
+    analyze_concurrency: int = 2
+    max_inflight_blocks: int = 32
+    block_max_attempts: int = 5  # then the block is recorded as failed and left to the gap lane
+    gap_fill: bool = True  # rescan missing/failed blocks in the live range on a low-priority lane
+    gap_rescan_interval_seconds: float = 300.0
+    trace_memory: bool = False  # tracemalloc peak per block fetch in scan meta (slow)
+    mark_running: bool = False  # commit a "running" scan row when a block's fetch starts
+
+    @model_validator(mode="after")
+    def _one_fetch_when_tracing_memory(self) -> ScannerCfg:
+        # tracemalloc's peak is process-wide, so it only belongs to one block if that block's
+        # fetch is the only one running.
+        if self.trace_memory:
+            self.fetch_concurrency = 1
+        return self
 
 
 class AnalysisCfg(BaseModel):
@@ -41,12 +86,28 @@ class AnalysisCfg(BaseModel):
     conflict_patterns: bool = True
     hot_state: bool = True
     hidden_dependencies: bool = True
+    executor: Literal["inline", "thread", "process"] = "inline"
+    workers: int = 4
+    timeout_seconds: float = 10.0  # per analyzer, wall clock; thread/process executors only
+    enabled: dict[str, bool] = Field(default_factory=dict)  # by analyzer name, incl. plugins
+    budget_ms_per_block: float | None = None  # None: never skip optional analyzers
+    budget_lag_blocks: int = 20  # the budget applies only this far behind head
 
 
 class SignalsCfg(BaseModel):
     min_severity_to_store: int = 20
 
 
+class TracingCfg(BaseModel):
+    enabled: bool = False
+    sample_ratio: float = 1.0  # fraction of blocks traced
+    file_path: str | None = None  # OTLP/JSON lines
+    otlp_endpoint: str | None = None  # OTLP/HTTP collector, e.g. http://localhost:4318
+    service_name: str = "monad-scanner"
+    flush_interval_seconds: float = 2.0
+    max_queue_spans: int = 10000  # spans waiting for export; extra spans are dropped
+
+
 class FileConfig(BaseModel):
     app: AppCfg = AppCfg()
     chain: ChainCfg = ChainCfg()
@@ -55,6 +116,7 @@ class FileConfig(BaseModel):
     scanner: ScannerCfg = ScannerCfg()
     analysis: AnalysisCfg = AnalysisCfg()
     signals: SignalsCfg = SignalsCfg()
+    tracing: TracingCfg = TracingCfg()
 
 
 class Settings(BaseSettings):
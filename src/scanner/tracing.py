@@ -0,0 +1,264 @@
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import deque
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import TYPE_CHECKING, Any
+
+import httpx
+import orjson
+
+if TYPE_CHECKING:
+    from scanner.settings import TracingCfg
+
+log = logging.getLogger("scanner.tracing")
+
+# Opt-in per-block trace spans exported as OTLP/JSON, either appended to a file (one
+# ExportTraceServiceRequest per line, the format of the collector's otlpjsonfile receiver) or
+# POSTed to a collector's OTLP/HTTP endpoint. No OpenTelemetry SDK is needed.
+#
+# Every span of a block shares one trace id derived from (chain, block), so the stages of the
+# staged pipeline, which run in different tasks, still land in one trace. Only spans given a
+# block can start a trace; anything else nests under the current span or is dropped.
+
+
+class Span:
+    __slots__ = ("name", "trace_id", "span_id", "parent_id", "start_ns", "end_ns", "attrs", "error")
+
+    def __init__(self, name: str, trace_id: str, parent_id: str | None, attrs: dict) -> None:
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent_id
+        self.attrs = attrs
+        self.error: str | None = None
+        self.start_ns = time.time_ns()
+        self.end_ns = 0
+
+    def set(self, key: str, value: Any) -> None:
+        self.attrs[key] = value
+
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def set(self, key: str, value: Any) -> None:
+        pass
+
+    def __enter__(self) -> _NoopSpan:
+        return self
+
+    def __exit__(self, *exc: Any) -> bool:
+        return False
+
+
+NOOP = _NoopSpan()
+_current: ContextVar[Span | None] = ContextVar("scanner_span", default=None)
+
+
+class Tracer:
+    def __init__(self) -> None:
+        self.exporters: list[SpanExporter] = []
+        self.sample_ratio = 1.0
+        self.chain_id = ""
+        self._salt = os.urandom(8)  # trace ids differ between runs
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.exporters)
+
+    def configure(
+        self, exporters: list[SpanExporter], sample_ratio: float = 1.0, chain_id: str = ""
+    ) -> None:
+        self.exporters = exporters
+        self.sample_ratio = sample_ratio
+        self.chain_id = chain_id
+
+    def shutdown(self) -> None:
+        exporters, self.exporters = self.exporters, []
+        for e in exporters:
+            e.shutdown()
+
+    def trace_id(self, block: int) -> str:
+        key = f"{self.chain_id}:{block}".encode()
+        return hashlib.blake2b(key, digest_size=16, salt=self._salt).hexdigest()
+
+    def span(self, name: str, block: int | None = None, **attrs: Any):
+        """Context manager yielding the span (or a no-op stand-in with the same `set`)."""
+        if not self.exporters:
+            return NOOP
+        return self._span(name, block, attrs)
+
+    @contextmanager
+    def _span(self, name: str, block: int | None, attrs: dict) -> Iterator[Span | _NoopSpan]:
+        parent = _current.get()
+        if parent is not None:
+            trace_id, parent_id = parent.trace_id, parent.span_id
+        elif block is None:
+            yield NOOP
+            return
+        else:
+            trace_id, parent_id = self.trace_id(block), None
+            # Sampled per block, so a block's stages are kept or dropped together.
+            if int(trace_id[:8], 16) >= self.sample_ratio * 0x1_0000_0000:
+                yield NOOP
+                return
+        if block is not None:
+            attrs["block.number"] = block
+        span = Span(name, trace_id, parent_id, attrs)
+        token = _current.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            span.end_ns = time.time_ns()
+            _current.reset(token)
+            for exporter in self.exporters:
+                exporter.export(span)
+
+
+TRACER = Tracer()
+
+
+def _value(v: Any) -> dict[str, Any]:
+    if isinstance(v, bool):
+        return {"boolValue": v}
+    if isinstance(v, int):
+        return {"intValue": str(v)}
+    if isinstance(v, float):
+        return {"doubleValue": v}
+    return {"stringValue": str(v)}
+
+
+def encode(spans: list[Span], service_name: str) -> bytes:
+    """An OTLP/JSON ExportTraceServiceRequest."""
+    out = []
+    for s in spans:
+        d: dict[str, Any] = {
+            "traceId": s.trace_id,
+            "spanId": s.span_id,
+            "name": s.name,
+            "kind": 1,  # INTERNAL
+            "startTimeUnixNano": str(s.start_ns),
+            "endTimeUnixNano": str(s.end_ns),
+            "attributes": [{"key": k, "value": _value(v)} for k, v in s.attrs.items()],
+        }
+        if s.parent_id is not None:
+            d["parentSpanId"] = s.parent_id
+        if s.error is not None:
+            d["status"] = {"code": 2, "message": s.error}  # ERROR
+        out.append(d)
+    resource = {"attributes": [{"key": "service.name", "value": _value(service_name)}]}
+    return orjson.dumps(
+        {
+            "resourceSpans": [
+                {"resource": resource, "scopeSpans": [{"scope": {"name": "scanner"}, "spans": out}]}
+            ]
+        }
+    )
+
+
+class SpanExporter(ABC):
+    """
+    Buffers finished spans and writes them in batches from a daemon thread, so the event
+    loop only pays for a deque append. Spans beyond `max_queue` are dropped and counted.
+    """
+
+    def __init__(
+        self, service_name: str, flush_interval: float = 2.0, max_queue: int = 10_000
+    ) -> None:
+        self.service_name = service_name
+        self.flush_interval = flush_interval
+        self.max_queue = max(1, max_queue)
+        self.dropped = 0
+        self._buf: deque[Span] = deque()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._loop, name="span-exporter", daemon=True)
+        self._thread.start()
+
+    def export(self, span: Span) -> None:
+        if len(self._buf) >= self.max_queue:
+            self.dropped += 1
+            return
+        self._buf.append(span)
+
+    def _loop(self) -> None:
+        while not self._stop.wait(self.flush_interval):
+            self.flush()
+
+    def flush(self) -> None:
+        spans = []
+        while self._buf:
+            spans.append(self._buf.popleft())
+        if not spans:
+            return
+        try:
+            self.write(encode(spans, self.service_name))
+        except Exception as e:
+            log.warning("Span export failed spans=%s err=%s", len(spans), e)
+
+    @abstractmethod
+    def write(self, payload: bytes) -> None:
+        """Delivers one encoded batch; runs on the exporter thread."""
+
+    def shutdown(self) -> None:
+        self._stop.set()
+        self._thread.join(timeout=self.flush_interval + 5)
+        self.flush()
+        if self.dropped:
+            log.warning("Span exporter dropped spans=%s (queue full)", self.dropped)
+
+
+class FileSpanExporter(SpanExporter):
+    def __init__(self, path: str, service_name: str, **kwargs: Any) -> None:
+        self.path = path
+        super().__init__(service_name, **kwargs)
+
+    def write(self, payload: bytes) -> None:
+        with open(self.path, "ab") as f:
+            f.write(payload + b"\n")
+
+
+class OtlpHttpSpanExporter(SpanExporter):
+    def __init__(self, endpoint: str, service_name: str, **kwargs: Any) -> None:
+        self.url = endpoint.rstrip("/") + "/v1/traces"
+        self._client = httpx.Client(timeout=10.0)
+        super().__init__(service_name, **kwargs)
+
+    def write(self, payload: bytes) -> None:
+        r = self._client.post(
+            self.url, content=payload, headers={"content-type": "application/json"}
+        )
+        r.raise_for_status()
+
+    def shutdown(self) -> None:
+        super().shutdown()
+        self._client.close()
+
+
+def configure_tracing(cfg: TracingCfg, chain_id: str) -> None:
+    exporters: list[SpanExporter] = []
+    if cfg.enabled:
+        opts = {"flush_interval": cfg.flush_interval_seconds, "max_queue": cfg.max_queue_spans}
+        if cfg.file_path:
+            exporters.append(FileSpanExporter(cfg.file_path, cfg.service_name, **opts))
+        if cfg.otlp_endpoint:
+            exporters.append(OtlpHttpSpanExporter(cfg.otlp_endpoint, cfg.service_name, **opts))
+        if not exporters:
+            log.warning("Tracing enabled without file_path or otlp_endpoint; spans are dropped")
+    TRACER.configure(exporters, sample_ratio=cfg.sample_ratio, chain_id=chain_id)
+    if exporters:
+        log.info(
+            "Tracing enabled exporters=%s sample_ratio=%s",
+            [type(e).__name__ for e in exporters],
+            cfg.sample_ratio,
+        )
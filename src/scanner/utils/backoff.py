@@ -1,11 +1,15 @@
 from __future__ import annotations
 
+import asyncio
 import random
-import time
 
 
-def jitter_sleep(base: float, factor: float, attempt: int, max_sleep: float = 10.0) -> None:
+def backoff_delay(base: float, factor: float, attempt: int, max_sleep: float = 10.0) -> float:
     # Small and predictable backoff with jitter to avoid thundering herds.
     sleep = min(max_sleep, base * (factor**attempt))
-    sleep = sleep * (0.7 + 0.6 * random.random())
-    time.sleep(sleep)
+    return sleep * (0.7 + 0.6 * random.random())
+
+
+async def jitter_sleep(base: float, factor: float, attempt: int, max_sleep: float = 10.0) -> None:
+    # asyncio-native: never block the event loop shared with the API server.
+    await asyncio.sleep(backoff_delay(base, factor, attempt, max_sleep))
@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+import scanner.db.models  # noqa: F401  (registers the tables on Base.metadata)
+from scanner.db.base import Base
+from scanner.db.session import dispose_async_engine, get_engine, set_db_url
+from scanner.pipeline.store import Store
+
+
+@pytest.fixture
+def store(tmp_path) -> Store:
+    """A Store on a fresh SQLite file."""
+    set_db_url(f"sqlite:///{tmp_path / 'scanner.db'}")
+    Base.metadata.create_all(get_engine())
+    return Store(chain_id="test")
+
+
+@pytest.fixture
+def run():
+    """asyncio.run that closes the async engine's pooled connections before its loop ends."""
+
+    def _run(coro):
+        async def go():
+            try:
+                return await coro
+            finally:
+                await dispose_async_engine()
+
+        return asyncio.run(go())
+
+    return _run
@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from scanner.rpc.errors import CircuitOpenError, RpcError, RpcTransportError
+from scanner.rpc.monad_client import MonadClient
+
+
+class _Rpc:
+    """Answers the eth_getBlockReceipts probe from a script of outcomes."""
+
+    def __init__(self, *outcomes) -> None:
+        self.outcomes = list(outcomes)
+        self.batch_supported = True
+        self.probes = 0
+
+    async def call(self, method, params=None, max_retries=None):
+        assert method == "eth_getBlockReceipts"
+        self.probes += 1
+        out = self.outcomes.pop(0)
+        if isinstance(out, Exception):
+            raise out
+        return out
+
+
+@pytest.mark.parametrize(
+    "error",
+    [
+        RpcError(-32601, "the method eth_getBlockReceipts does not exist/is not available"),
+        RpcError(-32600, "invalid request"),
+        RpcError(None, "HTTP 405", status_code=405),
+    ],
+)
+def test_method_not_found_disables_block_receipts(error):
+    client = MonadClient(_Rpc(error))
+    assert asyncio.run(client.probe_capabilities()) == {"eth_getBlockReceipts": False}
+    assert asyncio.run(client.receipts_strategy()) == "batch"
+
+
+def test_other_rpc_errors_mean_the_method_exists():
+    client = MonadClient(_Rpc(RpcError(-32000, "header not found")))
+    assert asyncio.run(client.probe_capabilities()) == {"eth_getBlockReceipts": True}
+
+
+@pytest.mark.parametrize(
+    "error",
+    [
+        RpcTransportError("ReadTimeout"),
+        RpcTransportError("HTTP 503", status_code=503),
+        RpcTransportError("HTTP 429", status_code=429, retry_after=1.0),
+        CircuitOpenError("circuit open endpoint=x"),
+    ],
+)
+def test_transport_failure_leaves_capabilities_unknown(error):
+    rpc = _Rpc(error, [])
+
+    async def go():
+        client = MonadClient(rpc)
+        assert await client.probe_capabilities() is None
+        assert client.capabilities is None
+        # The next block probes again and this time the node answers.
+        return await client.receipts_strategy()
+
+    assert asyncio.run(go()) == "block_receipts"
+    assert rpc.probes == 2
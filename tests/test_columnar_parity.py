@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+import random
+
+import pytest
+from check_columnar_parity import check
+from synth import synth_edge_block
+
+from scanner.analyzers.base import AnalyzerContext
+from scanner.analyzers.columnar import COLUMNAR_MIN_TXS, HAS_NUMPY, ReceiptTable
+from scanner.analyzers.hot_state import HotStateAnalyzer
+
+pytestmark = pytest.mark.skipif(not HAS_NUMPY, reason="needs the fast extra (numpy)")
+
+
+def test_vectorized_paths_match_dict_path():
+    assert check(blocks=100, max_txs=1000) == []
+
+
+@pytest.mark.parametrize("seed", range(40))
+def test_hot_state_top_matches_between_paths(seed):
+    # Compared directly: analyze() hides the ranking on blocks whose top count is below 5.
+    rnd = random.Random(seed)
+    txs, receipts = synth_edge_block(rnd, rnd.choice((0, 1, 3, 20, 400)))
+    ctx = AnalyzerContext("parity", seed, "0x0", txs, receipts, {})
+    table = ReceiptTable.from_features(ctx.features)
+    assert HotStateAnalyzer._top_vectorized(table) == HotStateAnalyzer._top(ctx)
+
+
+def test_table_is_built_on_first_access():
+    txs, receipts = synth_edge_block(random.Random(1), COLUMNAR_MIN_TXS)
+    ctx = AnalyzerContext("parity", 1, "0x0", txs, receipts, {})
+    assert "table" not in vars(ctx)
+    assert ctx.table is not None
+    assert ctx.table is ctx.table
@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.exc import IntegrityError
+
+from scanner.db import session as db_session
+from scanner.db.models import Block, Scan, Signal
+from scanner.utils.time import utcnow
+
+
+def _signal(signal_id: str, block: int = 5, title: str | None = "t") -> Signal:
+    return Signal(
+        signal_id=signal_id,
+        chain_id="test",
+        block_number=block,
+        category="conflict",
+        severity=50,
+        confidence=0.5,
+        title=title,
+        explanation="e",
+        evidence=None,
+        recommended_actions=None,
+        created_at=utcnow(),
+    )
+
+
+def _block(number: int = 5, block_hash: str = "0xaa") -> dict:
+    return {
+        "number": number,
+        "block_hash": block_hash,
+        "parent_hash": "0x99",
+        "timestamp": utcnow(),
+        "raw": None,
+        "tx_count": 2,
+    }
+
+
+async def _state() -> tuple[int, int, list[tuple[int, str, str]]]:
+    async with db_session.AsyncSessionLocal() as db:
+        blocks = await db.scalar(select(func.count()).select_from(Block))
+        signals = await db.scalar(select(func.count()).select_from(Signal))
+        scans = (await db.execute(select(Scan.block_number, Scan.block_hash, Scan.status))).all()
+        return blocks, signals, [tuple(s) for s in scans]
+
+
+def test_commit_block_writes_block_signals_and_scan_together(store, run):
+    async def go():
+        inserted = await store.commit_block(
+            **_block(), status="success", meta={"k": 1}, signals=[_signal("a"), _signal("b")]
+        )
+        async with db_session.AsyncSessionLocal() as db:
+            meta = await db.scalar(select(Scan.meta))
+        return inserted, meta, await _state()
+
+    inserted, meta, state = run(go())
+    assert inserted == 2
+    assert meta == {"k": 1, "signals_inserted": 2}
+    assert state == (1, 2, [(5, "0xaa", "success")])
+
+
+def test_bad_signal_rolls_back_the_block_and_scan(store, run):
+    async def go():
+        with pytest.raises(IntegrityError):
+            await store.commit_block(
+                **_block(), status="success", signals=[_signal("a"), _signal("b", title=None)]
+            )
+        return await _state()
+
+    assert run(go()) == (0, 0, [])
+
+
+def test_reorged_block_at_a_stored_height_leaves_the_stored_scan(store, run):
+    async def go():
+        await store.commit_block(**_block(), status="success", signals=[_signal("a")])
+        with pytest.raises(IntegrityError):
+            await store.commit_block(
+                **_block(block_hash="0xbb"), status="success", signals=[_signal("b")]
+            )
+        return await _state()
+
+    assert run(go()) == (1, 1, [(5, "0xaa", "success")])
+
+
+def test_commit_reuses_the_scan_row_and_keeps_a_running_marker_start(store, run):
+    async def scans():
+        async with db_session.AsyncSessionLocal() as db:
+            return (await db.execute(select(Scan.id, Scan.started_at, Scan.status))).all()
+
+    async def go():
+        scan_id = await store.start_scan(5, "0xaa")
+        marker = await scans()
+        await store.commit_block(**_block(), status="success")
+        committed = await scans()
+        await store.commit_block(**_block(), status="success")  # a rescan starts anew
+        return scan_id, marker, committed, await scans()
+
+    scan_id, marker, committed, rescanned = run(go())
+    assert [r.id for r in marker + committed + rescanned] == [scan_id] * 3
+    assert committed[0].started_at == marker[0].started_at
+    assert rescanned[0].started_at != marker[0].started_at
+
+
+def test_fail_scan_keeps_its_meta(store, run):
+    async def go():
+        await store.commit_block(**_block(), status="fail", meta={"error": "receipts"})
+        async with db_session.AsyncSessionLocal() as db:
+            return await db.scalar(select(Scan.meta))
+
+    assert run(go()) == {"error": "receipts"}
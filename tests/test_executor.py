@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import asyncio
+import time
+
+import pytest
+
+from scanner.analyzers.base import AnalyzerContext
+from scanner.analyzers.executor import AnalyzerExecutor
+
+
+class _Found:
+    name = "found"
+    category = "conflict"
+
+    async def analyze(self, ctx):
+        return [{"kind": "k", "txs": len(ctx.tx_hashes)}]
+
+
+class _Hang:
+    name = "hang"
+    category = "ordering"
+
+    def __init__(self, seconds: float) -> None:
+        self.seconds = seconds
+
+    async def analyze(self, ctx):
+        time.sleep(self.seconds)  # CPU-bound stand-in: nothing to await
+        return [{"kind": "late"}]
+
+
+class _Boom:
+    name = "boom"
+    category = "ordering"
+
+    async def analyze(self, ctx):
+        raise ValueError("boom")
+
+
+def _ctx() -> AnalyzerContext:
+    return AnalyzerContext("test", 1, "0x1", ["0xa", "0xb"], {}, {})
+
+
+def _run(executor: AnalyzerExecutor, analyzers):
+    async def go():
+        try:
+            return await executor.run([(a.category, a) for a in analyzers], _ctx())
+        finally:
+            executor.close()
+
+    return asyncio.run(go())
+
+
+# A thread cannot be killed, so the thread-mode hang is kept short enough to wait out at exit.
+@pytest.mark.parametrize(("mode", "hang"), [("thread", 1.5), ("process", 30.0)])
+def test_timed_out_analyzer_is_skipped_and_others_are_kept(mode, hang):
+    executor = AnalyzerExecutor(mode, workers=2, timeout=0.3)
+    t0 = time.perf_counter()
+    findings, report = _run(executor, [_Hang(hang), _Found()])
+    assert time.perf_counter() - t0 < hang
+    assert findings == [("conflict", {"kind": "k", "txs": 2})]
+    assert report["hang"]["status"] == "timeout"
+    assert report["found"]["status"] == "ok" and report["found"]["findings"] == 1
+
+
+def test_process_pool_is_replaced_after_a_timeout():
+    async def go():
+        executor = AnalyzerExecutor("process", workers=1, timeout=0.5)
+        try:
+            await executor.run([("ordering", _Hang(30.0))], _ctx())
+            replaced = executor._pool is None
+            # The next block gets a fresh worker instead of queueing behind the hung one.
+            findings, report = await executor.run([("conflict", _Found())], _ctx())
+            return replaced, report["found"]["status"]
+        finally:
+            executor.close()
+
+    assert asyncio.run(go()) == (True, "ok")
+
+
+@pytest.mark.parametrize("mode", ["inline", "thread"])
+def test_failing_analyzer_is_recorded_as_an_error(mode):
+    findings, report = _run(AnalyzerExecutor(mode, timeout=5.0), [_Boom(), _Found()])
+    assert report["boom"]["status"] == "error" and "boom" in report["boom"]["error"]
+    assert findings == [("conflict", {"kind": "k", "txs": 2})]
+
+
+def test_unknown_mode_is_rejected():
+    with pytest.raises(ValueError):
+        AnalyzerExecutor("fork")
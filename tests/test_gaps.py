@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+import asyncio
+
+from scanner.pipeline.gaps import GapFiller
+
+
+class _FlakyStore:
+    """find_gaps raises on the first call, then reports one gap until it is filled."""
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.done: set[int] = set()
+
+    async def find_gaps(self, start: int, end: int) -> list[tuple[int, int]]:
+        self.calls += 1
+        if self.calls == 1:
+            raise ConnectionError("database unavailable")
+        return [(bn, bn) for bn in (5, 6) if bn not in self.done]
+
+
+class _Runner:
+    def __init__(self, store: _FlakyStore) -> None:
+        self.store = store
+
+    async def process_block(self, bn: int) -> None:
+        self.store.done.add(bn)
+
+
+def test_gap_lane_survives_a_failed_pass():
+    async def go():
+        store = _FlakyStore()
+        lane = GapFiller(_Runner(store), store, start=0, busy=lambda: False, rescan_interval=0)
+        task = asyncio.create_task(lane.run(lambda: 10))
+        while lane.filled < 2 and not task.done():
+            await asyncio.sleep(0.01)
+        assert not task.done()
+        task.cancel()
+        return store, lane
+
+    store, lane = asyncio.run(go())
+    assert store.calls >= 2
+    assert store.done == {5, 6}
+    assert lane.filled == 2
@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import asyncio
+
+from scanner.rpc.limiter import AdaptiveLimiter
+
+
+async def _round_trip(lim: AdaptiveLimiter, n: int, latency: float = 0.01, **kw) -> None:
+    for _ in range(n):
+        await lim.acquire()
+    for _ in range(n):
+        await lim.release(latency, **kw)
+
+
+def test_limit_grows_only_while_the_window_is_full():
+    async def go():
+        lim = AdaptiveLimiter(initial=4, max_limit=16)
+        await _round_trip(lim, 2)
+        idle = lim.limit
+        await _round_trip(lim, 4)
+        return idle, lim.limit
+
+    idle, full = asyncio.run(go())
+    assert idle == 4.0
+    assert 4.2 < full < 4.3  # the first release saw a full window: +1/limit
+
+
+def test_additive_increase_is_about_one_per_round_trip_and_capped():
+    async def go():
+        lim = AdaptiveLimiter(initial=4, max_limit=6)
+        grown = []
+        for _ in range(4):
+            for _ in range(int(lim.limit)):
+                await lim.acquire()
+            while lim.inflight:
+                await lim.release(0.01)
+            grown.append(lim.limit)
+        return grown
+
+    grown = asyncio.run(go())
+    assert grown[0] > 4.2 and grown == sorted(grown)
+    assert grown[-1] <= 6.0
+
+
+def test_congestion_halves_once_per_round_trip():
+    async def go():
+        lim = AdaptiveLimiter(initial=16, min_limit=2)
+        await _round_trip(lim, 8, latency=1.0, congested=True)
+        after_burst = lim.limit
+        lim._last_decrease -= 1.0  # a round trip later
+        await _round_trip(lim, 1, latency=1.0, congested=True)
+        return after_burst, lim.limit
+
+    assert asyncio.run(go()) == (8.0, 4.0)
+
+
+def test_inflated_latency_counts_as_congestion():
+    async def go():
+        lim = AdaptiveLimiter(initial=8)
+        await _round_trip(lim, 1, latency=0.01)
+        await _round_trip(lim, 1, latency=0.02)  # jitter below the absolute floor
+        steady = lim.limit
+        await _round_trip(lim, 1, latency=0.5)
+        return steady, lim.limit
+
+    assert asyncio.run(go()) == (8.0, 4.0)
+
+
+def test_cut_never_goes_below_min_limit():
+    async def go():
+        lim = AdaptiveLimiter(initial=3, min_limit=2)
+        for _ in range(3):
+            lim._last_decrease = 0.0
+            await _round_trip(lim, 1, congested=True)
+        return lim.limit
+
+    assert asyncio.run(go()) == 2.0
+
+
+def test_acquire_waits_for_a_free_slot():
+    async def go():
+        lim = AdaptiveLimiter(initial=1)
+        await lim.acquire()
+        waiter = asyncio.create_task(lim.acquire())
+        await asyncio.sleep(0.01)
+        blocked = not waiter.done()
+        await lim.release(0.01)
+        await asyncio.wait_for(waiter, 1)
+        return blocked, lim.inflight
+
+    assert asyncio.run(go()) == (True, 1)
@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import pytest
+
+from scanner.analyzers.base import AnalyzerContext
+from scanner.analyzers.registry import BUILTINS, AnalyzerRegistry
+
+
+class _Stub:
+    def __init__(self, name: str, optional: bool) -> None:
+        self.name = name
+        self.category = name
+        self.optional = optional
+
+    async def analyze(self, ctx):
+        return []
+
+
+def _ctx(n_txs: int) -> AnalyzerContext:
+    return AnalyzerContext("test", 1, "0x1", [f"0x{i:x}" for i in range(n_txs)], {}, {})
+
+
+def _registry(**kw) -> AnalyzerRegistry:
+    analyzers = [
+        _Stub("required", False),
+        _Stub("dear", True),
+        _Stub("cheap", True),
+        _Stub("mid", True),
+    ]
+    reg = AnalyzerRegistry(analyzers, alpha=1.0, **kw)
+    # 100 txs: required 2 ms, dear 6 ms, cheap 1 ms, mid 3 ms.
+    report = {
+        name: {"status": "ok", "seconds": ms / 1000.0, "findings": 0}
+        for name, ms in (("required", 2), ("dear", 6), ("cheap", 1), ("mid", 3))
+    }
+    reg.record(report, 100)
+    return reg
+
+
+def _names(plan) -> list[str]:
+    return [a.name for _, a in plan.run]
+
+
+def test_budget_admits_optional_analyzers_cheapest_first():
+    plan = _registry(budget_ms=7.0, budget_lag_blocks=20).plan(_ctx(100), lag=50)
+    # 7 ms - 2 (required) leaves 5: cheap (1) and mid (3) fit, dear (6) does not.
+    assert _names(plan) == ["required", "cheap", "mid"]
+    assert plan.skipped == ["dear"]
+
+
+def test_required_analyzers_run_even_over_budget():
+    plan = _registry(budget_ms=0.5).plan(_ctx(100), lag=50)
+    assert _names(plan) == ["required"]
+    assert sorted(plan.skipped) == ["cheap", "dear", "mid"]
+
+
+def test_budget_only_applies_behind_head():
+    reg = _registry(budget_ms=0.5, budget_lag_blocks=20)
+    assert _names(reg.plan(_ctx(100), lag=5)) == ["required", "dear", "cheap", "mid"]
+
+
+def test_no_budget_runs_everything():
+    plan = _registry().plan(_ctx(10_000), lag=1000)
+    assert plan.skipped == []
+    assert len(plan.run) == 4
+
+
+def test_cost_scales_with_block_size_and_unmeasured_analyzers_run():
+    reg = _registry(budget_ms=25.0)
+    reg.analyzers.append(_Stub("new", True))
+    # Ten times the txs: required now predicts 20 ms, leaving 5 ms, which no measured optional
+    # analyzer fits (cheap predicts 10 ms); the unmeasured one predicts 0.
+    plan = reg.plan(_ctx(1000), lag=50)
+    assert _names(plan) == ["required", "new"]
+    assert reg.predicted_seconds("mid", 1000) == pytest.approx(0.03)
+
+
+def test_failed_runs_do_not_update_the_cost_model():
+    reg = _registry()
+    reg.record({"mid": {"status": "timeout", "seconds": 10.0}}, 100)
+    assert reg.costs()["mid"] == pytest.approx(0.003 / 100)
+
+
+def test_toggles_switch_builtins_off_by_name():
+    reg = AnalyzerRegistry.from_toggles({"hot_state": False})
+    names = {a.name for a in reg.analyzers}
+    assert "hot_state" not in names
+    assert names >= set(BUILTINS) - {"hot_state"}
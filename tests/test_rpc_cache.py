@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+from synth import synth_rpc_block
+
+from scanner.rpc.cache import RpcCache
+from scanner.rpc.errors import RpcError
+from scanner.rpc.monad_client import MonadClient
+
+HEAD = 2000
+
+
+class _Node:
+    """In-process JSON-RPC stand-in serving synthetic blocks; records every call it answers."""
+
+    def __init__(self, block_receipts: bool = True) -> None:
+        self.block_receipts = block_receipts
+        self.batch_supported = True
+        self.calls: list[str] = []
+        self.fork_from: int | None = None
+        self._blocks = {}
+
+    def _hash(self, number: int) -> str:
+        if self.fork_from is not None and number >= self.fork_from:
+            return f"0x{number:063x}f"
+        return f"0x{number:064x}"
+
+    def _block(self, number: int):
+        if number not in self._blocks:
+            block, receipts = synth_rpc_block(120, seed=3, number=number)
+            block["hash"], block["parentHash"] = self._hash(number), self._hash(number - 1)
+            self._blocks[number] = block, receipts
+        return self._blocks[number]
+
+    def reorg(self, number: int) -> None:
+        """Replaces the chain from `number` on with a fork."""
+        self.fork_from = number
+        self._blocks = {n: b for n, b in self._blocks.items() if n < number}
+
+    async def call(self, method: str, params: list | None = None, max_retries: int | None = None):
+        self.calls.append(method)
+        if method == "eth_blockNumber":
+            return hex(HEAD)
+        if method == "eth_getBlockByNumber":
+            return self._block(int(params[0], 16))[0]
+        if method == "eth_getBlockReceipts" and self.block_receipts:
+            return self._block(int(params[0], 16))[1]
+        raise RpcError(-32601, "the method does not exist/is not available")
+
+    async def call_batch(self, calls, return_exceptions: bool = False):
+        self.calls.append("batch")
+        receipts = {r["transactionHash"]: r for n in self._blocks for r in self._block(n)[1]}
+        return [receipts.get(params[0]) for _, params in calls]
+
+    async def aclose(self) -> None:
+        pass
+
+
+async def _scan(node: _Node, cache: RpcCache, numbers: range) -> list:
+    """Fetches `numbers` like the fetch stage does; returns the strategies used."""
+    client = MonadClient(node, cache=cache)
+    await client.get_latest_block_number()
+    await client.probe_capabilities()
+    node.calls.clear()  # startup calls are per process, not per block
+    strategies = []
+    for n in numbers:
+        ref = await client.get_block_by_number(n)
+        held: list = []
+        strategy, _ = await client.stream_block_receipts(n, ref.tx_hashes, held.extend)
+        assert len(held) == len(ref.tx_hashes) and all(held)
+        strategies.append(strategy)
+    return strategies
+
+
+@pytest.mark.parametrize("block_receipts", [True, False])
+def test_warm_disk_cache_serves_a_rescan_without_rpc(tmp_path, block_receipts):
+    path = str(tmp_path / "rpc_cache.sqlite")
+
+    async def go():
+        cold = _Node(block_receipts)
+        cache = RpcCache(max_bytes=64 * 1024 * 1024, disk_path=path)
+        await _scan(cold, cache, range(100, 104))
+        cache.close()
+        # A new process: empty memory tier, same disk tier.
+        warm = _Node(block_receipts)
+        cache = RpcCache(max_bytes=64 * 1024 * 1024, disk_path=path)
+        strategies = await _scan(warm, cache, range(100, 104))
+        cache.close()
+        return cold, warm, strategies, cache
+
+    cold, warm, strategies, cache = asyncio.run(go())
+    assert cold.calls
+    assert warm.calls == []
+    assert strategies == ["cache"] * 4
+    assert cache.stats()["disk_hits"] > 0
+
+
+def test_cache_is_bypassed_until_the_head_is_known():
+    async def go():
+        node = _Node()
+        client = MonadClient(node, cache=RpcCache(max_bytes=64 * 1024 * 1024))
+        await client.get_block_by_number(100)
+        await client.get_block_by_number(100)
+        return node.calls
+
+    # Without a head nothing counts as final, so the cached block is not trusted.
+    assert asyncio.run(go()).count("eth_getBlockByNumber") == 2
+
+
+def test_invalidate_from_drops_both_tiers_at_and_above_the_block(tmp_path):
+    async def go():
+        cache = RpcCache(max_bytes=1024 * 1024, disk_path=str(tmp_path / "c.sqlite"))
+        for n in range(10, 15):
+            await cache.put_many([(f"num:{n}", f"0x{n}")], n)
+        await cache.invalidate_from(12)
+        mem = {n: cache.mem.get(f"num:{n}") is not None for n in range(10, 15)}
+        both = {n: await cache.get(f"num:{n}") for n in range(10, 15)}
+        cache.close()
+        return mem, both
+
+    mem, both = asyncio.run(go())
+    assert mem == {10: True, 11: True, 12: False, 13: False, 14: False}
+    assert both == {10: "0x10", 11: "0x11", 12: None, 13: None, 14: None}
+
+
+def test_reorg_invalidates_cached_blocks_that_may_be_on_the_dead_fork():
+    async def go():
+        node = _Node()
+        cache = RpcCache(max_bytes=64 * 1024 * 1024)
+        client = MonadClient(node, cache=cache, confirmations=3)
+        client.head = 104  # 102..104 are not final and always re-fetched
+        for n in range(96, 105):
+            await client.get_block_by_number(n)
+        node.reorg(103)
+        await client.get_block_by_number(104)  # its parent is not the cached 103
+        kept = {n: await cache.get(f"num:{n}") for n in (99, 100, 103)}
+        node.calls.clear()
+        refetched = await client.get_block_by_number(103)
+        return kept, refetched, node.calls
+
+    kept, refetched, calls = asyncio.run(go())
+    # Everything from 104 - 1 - confirmations up may be on the dead fork.
+    assert kept == {99: f"0x{99:064x}", 100: None, 103: None}
+    assert refetched.hash == f"0x{103:063x}f"
+    assert calls == ["eth_getBlockByNumber"]
@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from scanner.rpc.errors import RpcError, RpcTransportError
+from scanner.rpc.pool import RpcPool
+from scanner.rpc.retry import CircuitBreaker
+
+
+class _Node:
+    """JsonRpcClient stand-in: answers after `delay` seconds, or raises `error`."""
+
+    def __init__(self, url: str, delay: float = 0.0, error: Exception | None = None) -> None:
+        self.url = url
+        self.delay = delay
+        self.error = error
+        self.breaker = CircuitBreaker(name=url)
+        self.batch_supported = True
+        self.max_retries = 5
+        self.calls = 0
+        self.cancelled = 0
+
+    async def call(self, method, params=None, max_retries=None):
+        self.calls += 1
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        if self.error is not None:
+            raise self.error
+        return self.url
+
+    async def call_batch(self, calls, return_exceptions=False):
+        self.calls += 1
+        if self.error is not None:
+            return [self.error for _ in calls]
+        return [self.url for _ in calls]
+
+    async def aclose(self) -> None:
+        pass
+
+
+def test_transport_error_fails_over_and_demotes_the_endpoint():
+    bad, good = _Node("a", error=RpcTransportError("ConnectError")), _Node("b")
+    pool = RpcPool([bad, good])
+
+    async def go():
+        return [await pool.call("eth_blockNumber") for _ in range(3)]
+
+    assert asyncio.run(go()) == ["b", "b", "b"]
+    assert bad.calls == 1  # ranked below the healthy node after its first failure
+    assert [ep.url for ep in pool.ranked()] == ["b", "a"]
+
+
+def test_rpc_error_is_not_failed_over():
+    first, second = _Node("a", error=RpcError(-32602, "invalid params")), _Node("b")
+    with pytest.raises(RpcError):
+        asyncio.run(RpcPool([first, second]).call("eth_getBlockByNumber"))
+    assert second.calls == 0
+
+
+def test_all_endpoints_down_raises_the_last_transport_error():
+    nodes = [_Node(u, error=RpcTransportError(f"down {u}")) for u in "ab"]
+    with pytest.raises(RpcTransportError, match="down b"):
+        asyncio.run(RpcPool(nodes).call("eth_blockNumber"))
+
+
+def test_open_breaker_ranks_last():
+    a, b = _Node("a"), _Node("b")
+    for _ in range(5):
+        a.breaker.record_failure()
+    assert asyncio.run(RpcPool([a, b]).call("eth_blockNumber")) == "b"
+    assert a.calls == 0
+
+
+def test_batch_that_died_in_transport_fails_over():
+    bad, good = _Node("a", error=RpcTransportError("ReadTimeout")), _Node("b")
+    calls = [("eth_getTransactionReceipt", ["0x1"])] * 2
+    assert asyncio.run(RpcPool([bad, good]).call_batch(calls)) == ["b", "b"]
+
+
+def test_slow_primary_is_hedged_to_the_runner_up():
+    slow, fast = _Node("a", delay=5.0), _Node("b")
+    pool = RpcPool([slow, fast], hedge=True, hedge_min_delay=0.01, hedge_max_delay=0.01)
+    assert asyncio.run(pool.call("eth_blockNumber")) == "b"
+    assert pool.hedges_sent == 1
+    assert slow.cancelled == 1
+
+
+def test_fast_primary_is_not_hedged():
+    a, b = _Node("a"), _Node("b")
+    pool = RpcPool([a, b], hedge=True, hedge_min_delay=0.5, hedge_max_delay=0.5)
+    assert asyncio.run(pool.call("eth_blockNumber")) == "a"
+    assert pool.hedges_sent == 0
+    assert b.calls == 0
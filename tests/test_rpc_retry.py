@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass, field
+from types import SimpleNamespace
+
+import httpx
+import orjson
+import pytest
+
+from scanner.rpc import retry
+from scanner.rpc.errors import CircuitOpenError, RpcError, RpcTransportError
+from scanner.rpc.jsonrpc import JsonRpcClient
+from scanner.rpc.retry import CircuitBreaker, RetryPolicy, parse_retry_after
+
+
+@dataclass
+class _NoSleep(RetryPolicy):
+    """Records the delays the client asks for instead of waiting them out."""
+
+    delays: list[float] = field(default_factory=list)
+
+    def delay(self, attempt: int, retry_after: float | None = None) -> float:
+        self.delays.append(super().delay(attempt, retry_after))
+        return 0.0
+
+
+def _client(handler, **kw) -> JsonRpcClient:
+    client = JsonRpcClient("http://node.test/", **kw)
+    client._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return client
+
+
+def _ok(req_id, result) -> dict:
+    return {"jsonrpc": "2.0", "id": req_id, "result": result}
+
+
+def _err(req_id, code: int) -> dict:
+    return {"jsonrpc": "2.0", "id": req_id, "error": {"code": code, "message": "nope"}}
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(retry, "time", SimpleNamespace(monotonic=lambda: now[0]))
+    return now
+
+
+def test_breaker_opens_after_threshold_and_fails_fast(clock):
+    b = CircuitBreaker(failure_threshold=3, reset_timeout=30.0, name="n")
+    for _ in range(2):
+        b.check()
+        b.record_failure()
+    assert b.state == "closed"
+    b.check()
+    b.record_failure()
+    assert b.state == "open"
+    clock[0] += 29.0
+    with pytest.raises(CircuitOpenError):
+        b.check()
+
+
+def test_breaker_half_open_lets_one_trial_through(clock):
+    b = CircuitBreaker(failure_threshold=1, reset_timeout=30.0)
+    b.record_failure()
+    clock[0] += 30.0
+    b.check()
+    assert b.state == "half_open"
+    with pytest.raises(CircuitOpenError):
+        b.check()  # the trial is still in flight
+    b.record_success()
+    assert b.state == "closed" and b.failures == 0
+    b.check()
+
+
+def test_failed_trial_reopens_and_released_trial_frees_the_slot(clock):
+    b = CircuitBreaker(failure_threshold=5, reset_timeout=30.0)
+    for _ in range(5):
+        b.record_failure()
+    clock[0] += 30.0
+    b.check()
+    b.release_trial()  # e.g. the trial call was cancelled
+    b.check()
+    b.record_failure()
+    assert b.state == "open"
+    with pytest.raises(CircuitOpenError):
+        b.check()
+
+
+@pytest.mark.parametrize(
+    ("header", "expected"),
+    [("7", 7.0), ("0.5", 0.5), ("-3", 0.0), ("Thu, 01 Jan 1970 00:00:00 GMT", 0.0), ("soon", None)],
+)
+def test_parse_retry_after(header, expected):
+    assert parse_retry_after(header) == expected
+
+
+def test_retry_after_is_honored_up_to_the_cap():
+    p = RetryPolicy(max_retry_after=60.0)
+    assert p.delay(0, retry_after=12.0) == 12.0
+    assert p.delay(0, retry_after=3600.0) == 60.0
+    assert p.delay(0) <= p.max_sleep
+
+
+def test_call_waits_retry_after_on_429():
+    answers = [
+        httpx.Response(429, headers={"retry-after": "4"}),
+        httpx.Response(503),
+        httpx.Response(200, json=_ok(1, "0x10")),
+    ]
+    policy = _NoSleep()
+    client = _client(lambda request: answers.pop(0), retry=policy)
+    assert asyncio.run(client.call("eth_blockNumber")) == "0x10"
+    assert policy.delays[0] == 4.0
+    assert len(policy.delays) == 2
+
+
+def test_call_does_not_retry_a_non_retryable_rpc_error():
+    sent = []
+
+    def handler(request):
+        sent.append(request)
+        return httpx.Response(200, json=_err(1, -32602))
+
+    client = _client(handler, retry=_NoSleep())
+    with pytest.raises(RpcError):
+        asyncio.run(client.call("eth_getBlockByNumber", ["0x1", False]))
+    assert len(sent) == 1
+
+
+def test_call_gives_up_after_max_retries_and_opens_the_breaker():
+    client = _client(
+        lambda request: httpx.Response(502),
+        retry=_NoSleep(max_retries=2),
+        breaker=CircuitBreaker(failure_threshold=3),
+    )
+    with pytest.raises(RpcTransportError):
+        asyncio.run(client.call("eth_blockNumber"))
+    assert client.breaker.state == "open"
+    with pytest.raises(CircuitOpenError):
+        asyncio.run(client.call("eth_blockNumber"))
+
+
+def test_batch_matches_out_of_order_ids_and_resends_only_failed_entries():
+    bodies: list[list[dict]] = []
+
+    def handler(request):
+        body = orjson.loads(request.content)
+        bodies.append(body)
+        if len(bodies) == 1:
+            # Reversed order; id 1 hits a retryable error, id 2 is missing, id 3 is final.
+            return httpx.Response(
+                200, json=[_ok(4, "e"), _err(3, -32602), _err(1, -32005), _ok(0, "a")]
+            )
+        return httpx.Response(200, json=[_ok(r["id"], f"retry-{r['id']}") for r in body])
+
+    client = _client(handler, retry=_NoSleep())
+    calls = [("eth_getTransactionReceipt", [f"0x{i}"]) for i in range(5)]
+    results = asyncio.run(client.call_batch(calls, return_exceptions=True))
+    assert [r["id"] for r in bodies[1]] == [1, 2]
+    assert results[0] == "a" and results[4] == "e"
+    assert results[1] == "retry-1" and results[2] == "retry-2"
+    assert isinstance(results[3], RpcError) and results[3].code == -32602
+    assert len(bodies) == 2
@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+from sqlalchemy.exc import IntegrityError
+
+from scanner.pipeline import staged
+from scanner.pipeline.runner import BlockResult
+from scanner.pipeline.staged import StagedPipeline
+from scanner.rpc.types import BlockRef
+
+
+class _Runner:
+    """Stage stand-in: `broken` blocks never fetch, `reorged` blocks never persist."""
+
+    def __init__(self, broken=(), reorged=(), delays=None) -> None:
+        self.broken, self.reorged = set(broken), set(reorged)
+        self.delays = delays or {}
+        self.fetched: list[int] = []
+        self.fetches: dict[int, int] = {}
+        self.persists: list[int] = []
+        self.committed: list[int] = []
+        self.failed: list[tuple[int, str]] = []
+
+    async def fetch(self, bn: int) -> BlockRef:
+        self.fetches[bn] = self.fetches.get(bn, 0) + 1
+        if bn in self.broken:
+            raise ConnectionError("node unavailable")
+        await asyncio.sleep(self.delays.get(bn, 0))
+        self.fetched.append(bn)
+        return BlockRef(bn, f"0x{bn:x}", None, None, [])
+
+    async def analyze(self, block: BlockRef) -> BlockResult:
+        return BlockResult(block, "success", [])
+
+    async def persist(self, result: BlockResult) -> None:
+        self.persists.append(result.block.number)
+        if result.block.number in self.reorged:
+            raise IntegrityError("INSERT INTO blocks", {}, Exception("UNIQUE constraint failed"))
+        self.committed.append(result.block.number)
+
+    async def record_failure(self, bn: int, block_hash: str, error: str) -> None:
+        self.failed.append((bn, block_hash))
+
+
+async def _run(runner: _Runner, blocks: range, **kw) -> StagedPipeline:
+    pipeline = StagedPipeline(runner, **kw)
+    pipeline.start()
+    for bn in blocks:
+        await pipeline.submit(bn)
+    await asyncio.wait_for(pipeline.drain(), 5)
+    await pipeline.stop()
+    return pipeline
+
+
+@pytest.fixture(autouse=True)
+def _no_backoff(monkeypatch):
+    async def no_sleep(*args, **kwargs):
+        pass
+
+    monkeypatch.setattr(staged, "jitter_sleep", no_sleep)
+
+
+def test_commits_in_block_order_when_a_later_block_finishes_first():
+    runner = _Runner(delays={1: 0.05})
+    pipeline = asyncio.run(_run(runner, range(1, 5), fetch_concurrency=4))
+    assert runner.fetched[-1] == 1
+    assert runner.committed == [1, 2, 3, 4]
+    assert pipeline.committed == 4
+
+
+def test_submit_waits_when_the_window_is_full():
+    async def go():
+        runner = _Runner(delays={1: 0.05})
+        pipeline = StagedPipeline(runner, fetch_concurrency=4, max_inflight=2)
+        pipeline.start()
+        for bn in (1, 2, 3):  # block 1 is with the persister, waiting on its fetch
+            await pipeline.submit(bn)
+        fourth = asyncio.create_task(pipeline.submit(4))
+        await asyncio.sleep(0.01)
+        blocked = not fourth.done()
+        await fourth
+        await asyncio.wait_for(pipeline.drain(), 5)
+        await pipeline.stop()
+        return blocked, runner.committed
+
+    assert asyncio.run(go()) == (True, [1, 2, 3, 4])
+
+
+def test_unfetchable_block_is_recorded_as_failed_after_max_attempts():
+    runner = _Runner(broken={3})
+    pipeline = asyncio.run(_run(runner, range(1, 6), max_attempts=3))
+    assert runner.fetches[3] == 3
+    assert runner.failed == [(3, "")]
+    assert runner.committed == [1, 2, 4, 5]
+    assert pipeline.committed == 5
+
+
+def test_integrity_error_is_not_retried():
+    runner = _Runner(reorged={2})
+    pipeline = asyncio.run(_run(runner, range(1, 5), max_attempts=5))
+    assert runner.persists.count(2) == 1
+    assert runner.failed == [(2, "0x2")]
+    assert runner.committed == [1, 3, 4]
+    assert pipeline.committed == 4
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.exc import IntegrityError
+
+from scanner.db import session as db_session
+from scanner.db.models import Block, Signal
+from scanner.utils.time import utcnow
+
+
+def _signal(signal_id: str, block: int = 1) -> Signal:
+    return Signal(
+        signal_id=signal_id,
+        chain_id="test",
+        block_number=block,
+        category="hot_state",
+        severity=50,
+        confidence=0.5,
+        title="t",
+        explanation="e",
+        evidence={"top": [["to:0xa", 7]]},
+        recommended_actions=["x"],
+        created_at=utcnow(),
+    )
+
+
+async def _count(model) -> int:
+    async with db_session.AsyncSessionLocal() as db:
+        return await db.scalar(select(func.count()).select_from(model))
+
+
+def test_insert_signals_counts_only_new_rows(store, run):
+    ids = [f"s{i}" for i in range(10)]
+
+    async def go():
+        new = await store.insert_signals([_signal(i) for i in ids])
+        again = await store.insert_signals([_signal(i) for i in ids])
+        mixed = await store.insert_signals([_signal(i) for i in ids[:3]] + [_signal("m0")])
+        in_batch = await store.insert_signals([_signal("d"), _signal("d")])
+        empty = await store.insert_signals([])
+        return (new, again, mixed, in_batch, empty), await _count(Signal)
+
+    assert run(go()) == ((10, 0, 1, 1, 0), 12)
+
+
+def test_stored_signal_keeps_its_json_columns(store, run):
+    async def go():
+        await store.insert_signals([_signal("j")])
+        async with db_session.AsyncSessionLocal() as db:
+            return await db.scalar(select(Signal).where(Signal.signal_id == "j"))
+
+    row = run(go())
+    assert row.evidence == {"top": [["to:0xa", 7]]}
+    assert row.recommended_actions == ["x"]
+
+
+def test_upsert_block_is_idempotent_per_hash(store, run):
+    async def go():
+        for _ in range(2):
+            await store.upsert_block(5, "0xaa", "0x99", utcnow(), None, 3)
+        return await _count(Block)
+
+    assert run(go()) == 1
+
+
+def test_other_hash_at_a_stored_height_still_raises(store, run):
+    async def go():
+        await store.upsert_block(5, "0xaa", "0x99", utcnow(), None, 3)
+        await store.upsert_block(5, "0xbb", "0x99", utcnow(), None, 3)
+
+    with pytest.raises(IntegrityError):
+        run(go())
@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import asyncio
+
+import orjson
+import pytest
+from websockets.asyncio.server import serve
+
+from scanner.rpc.ws import NewHeadsSubscriber, SubscriptionUnavailable
+
+
+def _head(sub: str, number: int) -> str:
+    msg = {
+        "jsonrpc": "2.0",
+        "method": "eth_subscription",
+        "params": {"subscription": sub, "result": {"number": hex(number)}},
+    }
+    return orjson.dumps(msg).decode()
+
+
+async def _stub_node(sessions: list[list[str]], reject: bool = False):
+    """A newHeads endpoint; each connection acks eth_subscribe, sends its messages, closes."""
+    connections = iter(sessions)
+    subscribes = []
+
+    async def handler(ws):
+        req = orjson.loads(await ws.recv())
+        subscribes.append(req)
+        if reject:
+            await ws.send(orjson.dumps({"id": req["id"], "error": {"code": -32601}}).decode())
+            return
+        await ws.send(orjson.dumps({"id": req["id"], "result": "0xsub"}).decode())
+        for msg in next(connections, []):
+            await ws.send(msg)
+        await ws.close()
+
+    server = await serve(handler, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    return server, f"ws://127.0.0.1:{port}", subscribes
+
+
+async def _collect(url: str, count: int) -> list[int]:
+    heads: list[int] = []
+    done = asyncio.Event()
+
+    def on_head(n: int) -> None:
+        heads.append(n)
+        if len(heads) >= count:
+            done.set()
+
+    sub = NewHeadsSubscriber(url, reconnect_base=0.01, reconnect_max=0.05)
+    task = asyncio.create_task(sub.run(on_head))
+    try:
+        await asyncio.wait_for(done.wait(), 5)
+    finally:
+        task.cancel()
+    return heads
+
+
+def test_streams_heads_and_ignores_other_messages():
+    async def run():
+        other = orjson.dumps({"jsonrpc": "2.0", "id": 7, "result": "0x1"}).decode()
+        session = [_head("0xsub", 100), _head("0xother", 999), other, _head("0xsub", 101)]
+        server, url, subscribes = await _stub_node([session])
+        async with server:
+            heads = await _collect(url, 2)
+        assert heads == [100, 101]
+        assert subscribes[0]["method"] == "eth_subscribe"
+        assert subscribes[0]["params"] == ["newHeads"]
+
+    asyncio.run(run())
+
+
+@pytest.mark.parametrize(
+    "msg",
+    [
+        [1, 2],
+        "0x10",
+        None,
+        {"method": "eth_subscription", "params": ["0xsub"]},
+        {"method": "eth_subscription", "params": {"subscription": "0xsub", "result": [1]}},
+        {"method": "eth_subscription", "params": {"subscription": "0xsub", "result": "0x10"}},
+        {"method": "eth_subscription", "params": {"subscription": "0xsub", "result": None}},
+    ],
+)
+def test_malformed_messages_are_not_heads(msg):
+    assert NewHeadsSubscriber._head_number(orjson.dumps(msg), "0xsub") is None
+
+
+def test_resubscribes_after_drop():
+    async def run():
+        server, url, subscribes = await _stub_node([[_head("0xsub", 5)], [_head("0xsub", 8)]])
+        async with server:
+            heads = await _collect(url, 2)
+        assert heads == [5, 8]
+        assert len(subscribes) == 2
+
+    asyncio.run(run())
+
+
+def test_rejected_subscription_raises():
+    async def run():
+        server, url, _ = await _stub_node([], reject=True)
+        async with server:
+            sub = NewHeadsSubscriber(url)
+            with pytest.raises(SubscriptionUnavailable):
+                await asyncio.wait_for(sub.run(lambda n: None), 5)
+
+    asyncio.run(run())